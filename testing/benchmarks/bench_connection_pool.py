@@ -0,0 +1,110 @@
+"""
+Benchmark: APIClient.get with a connection per call vs one pooled client
+
+Starts a local keep-alive HTTP stand-in server and measures requests/sec of
+APIClient.get, so headers, retry, breaker, metrics and Allure capture are
+all on the measured path:
+  - per-call  -> a fresh APIClient (and connection) per request, as the old
+                 APIClient did through module-level httpx.get()
+  - pooled    -> one APIClient reused, keep-alive connections (new APIClient)
+
+The stand-in server is plain HTTP, so this only measures TCP setup and client
+construction overhead; against staging every new connection also pays TLS.
+Optional features (retries, rate limits, cache, ...) follow the usual
+HTTP_* / RATE_LIMIT_* / ... environment variables.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--requests 500] [--threads 1]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add testing directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# config.settings requires these; the values are irrelevant against the stand-in server
+os.environ.setdefault("REQUEST_TIMEOUT", "30")
+os.environ.setdefault("TOKEN_REFRESH_INTERVAL", "840")
+
+from config.settings import settings
+from utils.allure_capture import capture
+from utils.api_client import APIClient
+
+ENDPOINT = "/api/v1/auth/me"
+API_KEY = "bench-api-key"
+
+PAYLOAD = json.dumps({"output": [{"source": "नमस्ते", "target": "வணக்கம்"}]}).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive JSON endpoint"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    """Start the stand-in server on a free local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label, send, total, threads):
+    """Fire `total` requests through `send` and print requests/sec"""
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(total):
+            send()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: send(), range(total)))
+    elapsed = time.perf_counter() - start
+    rps = total / elapsed
+    print(f"{label:<28} {total:>6} req  {elapsed:>7.2f}s  {rps:>9.1f} req/s")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    server = start_server()
+    settings.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    def per_call():
+        with APIClient(None, api_key=API_KEY) as client:
+            client.get(ENDPOINT).raise_for_status()
+
+    print(f"Stand-in server: {settings.BASE_URL}{ENDPOINT} (threads={args.threads})")
+    before = run("per-call APIClient.get", per_call, args.requests, args.threads)
+    capture.finish_test()
+
+    with APIClient(None, api_key=API_KEY) as client:
+        after = run("pooled APIClient.get", lambda: client.get(ENDPOINT).raise_for_status(), args.requests, args.threads)
+    capture.finish_test()
+
+    print(f"Speed-up: {after / before:.1f}x")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: per-send JSON serialization vs pre-serialized PreparedBody
+
+Builds every *_from_sample payload from testing/samples/ and measures the
+cost of turning it into an httpx.Request body, repeated `--sends` times
+(one send per role / parametrized case / retry):
+
+  - json=dict        -> httpx serializes with the stdlib json module every send
+  - PreparedBody     -> encoded once, the same bytes reused for every send
+
+No network is involved; only request construction is timed.
+
+Usage:
+    python benchmarks/bench_payload_encoding.py [--sends 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add testing directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# config.settings requires these; the values are irrelevant for an offline benchmark
+os.environ.setdefault("REQUEST_TIMEOUT", "30")
+os.environ.setdefault("TOKEN_REFRESH_INTERVAL", "840")
+
+import httpx
+from utils.payload import PreparedBody
+from utils.services import ServiceWithPayloads
+
+SAMPLES = [
+    "nmt", "asr", "tts", "transliteration", "text_language_detection", "speaker_diarization",
+    "language_diarization", "audio_language_detection", "ner", "ocr", "pipeline",
+]
+URL = "http://127.0.0.1/api/v1/inference"
+
+
+def timed(build, sends):
+    """Seconds spent building `sends` requests"""
+    start = time.perf_counter()
+    for _ in range(sends):
+        build()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sends", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.sends} sends per payload")
+    print(f"{'sample':<26} {'body KB':>8} {'json= ms':>10} {'prepared ms':>12} {'saved':>7}")
+
+    totals = [0.0, 0.0]
+    for name in SAMPLES:
+        payload = getattr(ServiceWithPayloads, f"{name}_from_sample")()
+
+        baseline = timed(lambda: httpx.Request("POST", URL, json=payload), args.sends)
+
+        start = time.perf_counter()
+        body = PreparedBody(payload)
+        prepared = time.perf_counter() - start
+        prepared += timed(lambda: httpx.Request("POST", URL, content=body.content), args.sends)
+
+        totals[0] += baseline
+        totals[1] += prepared
+        print(
+            f"{name:<26} {len(body) / 1024:>8.1f} {baseline * 1000:>10.2f} "
+            f"{prepared * 1000:>12.2f} {1 - prepared / baseline:>6.0%}"
+        )
+
+    baseline, prepared = totals
+    print(f"{'total':<26} {'':>8} {baseline * 1000:>10.2f} "
+          f"{prepared * 1000:>12.2f} {1 - prepared / baseline:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
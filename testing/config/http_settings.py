@@ -0,0 +1,190 @@
+"""
+HTTP client settings shared by the v1 (API key) and v2 (JWT) suites
+
+utils/base_client.py and its helpers read these instead of either suite's
+settings module; both Settings classes inherit them.
+"""
+import os
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _timeout(name: str, default: str) -> httpx.Timeout:
+    """httpx.Timeout from an env var "<connect>,<read>,<write>,<pool>" (seconds)"""
+    connect, read, write, pool = (float(value) for value in os.getenv(name, default).split(","))
+    return httpx.Timeout(connect=connect, read=read, write=write, pool=pool)
+
+
+class HTTPSettings:
+    # ============================================
+    # HTTP Client (Connection Pool)
+    # ============================================
+    # Each APIClient owns one long-lived httpx.Client; these bound its pool.
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30.0"))
+    # HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+    # Opt-in: keep-alive connections each role client opens (in parallel)
+    # before the first test, so DNS/TCP/TLS setup stays out of test timings.
+    # 0 disables pre-warming; HTTP_PREWARM_PATH is the cheap path HEAD-requested.
+    HTTP_PREWARM_CONNECTIONS = int(os.getenv("HTTP_PREWARM_CONNECTIONS", "0"))
+    HTTP_PREWARM_PATH = os.getenv("HTTP_PREWARM_PATH", "/")
+
+    # ============================================
+    # HTTP Compression
+    # ============================================
+    # Sent on every request; httpx decodes gzip/deflate responses
+    HTTP_ACCEPT_ENCODING = os.getenv("HTTP_ACCEPT_ENCODING", "gzip, deflate")
+    # gzip request bodies (Content-Encoding: gzip) at least HTTP_GZIP_MIN_BYTES long;
+    # only useful once the gateway is known to accept compressed requests
+    HTTP_GZIP_REQUESTS = os.getenv("HTTP_GZIP_REQUESTS", "false").lower() == "true"
+    HTTP_GZIP_MIN_BYTES = int(os.getenv("HTTP_GZIP_MIN_BYTES", "16384"))
+    HTTP_GZIP_LEVEL = int(os.getenv("HTTP_GZIP_LEVEL", "6"))
+
+    # ============================================
+    # Timeout Profiles (per endpoint group)
+    # ============================================
+    # Full connect/read/write/pool timeouts per endpoint group, applied by
+    # APIClient unless a call passes timeout= itself. Opt-in: while off, every
+    # endpoint keeps REQUEST_TIMEOUT. Override a group with
+    # TIMEOUT_<GROUP>="<connect>,<read>,<write>,<pool>", e.g.
+    # TIMEOUT_INFERENCE_AUDIO="5,120,60,10". Endpoints matching no group keep
+    # REQUEST_TIMEOUT.
+    TIMEOUT_PROFILES_ENABLED = os.getenv("TIMEOUT_PROFILES_ENABLED", "false").lower() == "true"
+    TIMEOUT_PROFILES = {
+        "auth": _timeout("TIMEOUT_AUTH", "5,15,15,5"),
+        "catalog": _timeout("TIMEOUT_CATALOG", "5,20,20,5"),
+        "inference-text": _timeout("TIMEOUT_INFERENCE_TEXT", "5,60,15,10"),
+        "inference-audio": _timeout("TIMEOUT_INFERENCE_AUDIO", "5,90,60,10"),
+        "pipeline": _timeout("TIMEOUT_PIPELINE", "5,180,60,10"),
+        "observability": _timeout("TIMEOUT_OBSERVABILITY", "5,30,15,5"),
+    }
+    # Endpoint path prefix -> timeout group (whole segments, longest prefix wins)
+    TIMEOUT_GROUPS = {
+        "/api/v1/auth": "auth",
+        "/api/v1/auth/roles": "catalog",
+        "/api/v1/auth/permission": "catalog",
+        "/api/v1/auth/permissions": "catalog",
+        "/api/v1/auth/users": "catalog",
+        "/api/v1/model-management": "catalog",
+        "/api/v1/multi-tenant": "catalog",
+        "/api/v1/feature-flags": "catalog",
+        "/api/v1/nmt": "inference-text",
+        "/api/v1/transliteration": "inference-text",
+        "/api/v1/language-detection": "inference-text",
+        "/api/v1/ner": "inference-text",
+        "/api/v1/llm": "inference-text",
+        # audio in or out, and OCR images: large bodies, slow models
+        "/api/v1/asr": "inference-audio",
+        "/api/v1/tts": "inference-audio",
+        "/api/v1/speaker-diarization": "inference-audio",
+        "/api/v1/language-diarization": "inference-audio",
+        "/api/v1/audio-lang-detection": "inference-audio",
+        "/api/v1/ocr": "inference-audio",
+        "/api/v1/pipeline": "pipeline",
+        "/api/v1/observability": "observability",
+    }
+
+    # ============================================
+    # HTTP Retry Policy
+    # ============================================
+    # Opt-in: attempts include the first try (1 = no retries, so a flaky service
+    # still fails its test). Idempotent methods retry on these statuses and on
+    # transport errors; POST/PATCH only on 429 and on connection errors where the
+    # request never reached the server.
+    HTTP_RETRY_MAX_ATTEMPTS = int(os.getenv("HTTP_RETRY_MAX_ATTEMPTS", "1"))
+    HTTP_RETRY_STATUSES = [int(code) for code in os.getenv("HTTP_RETRY_STATUSES", "429,502,503,504").split(",") if code.strip()]
+    HTTP_RETRY_BACKOFF_BASE = float(os.getenv("HTTP_RETRY_BACKOFF_BASE", "0.5"))
+    HTTP_RETRY_BACKOFF_MAX = float(os.getenv("HTTP_RETRY_BACKOFF_MAX", "8.0"))
+    # Give up once retries would push a single call past this many seconds
+    HTTP_RETRY_TOTAL_BUDGET = float(os.getenv("HTTP_RETRY_TOTAL_BUDGET", "30.0"))
+
+    # ============================================
+    # Circuit Breaker (per endpoint template, shared by all clients)
+    # ============================================
+    # Opt-in: consecutive failed calls (transport error, timeout or one of these
+    # statuses once retries are exhausted) that open an endpoint's circuit for
+    # every role; while open, calls fail immediately. 0 disables breaking.
+    CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "0"))
+    CIRCUIT_BREAKER_COOLDOWN = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN", "60"))
+    CIRCUIT_BREAKER_STATUSES = [int(code) for code in os.getenv("CIRCUIT_BREAKER_STATUSES", "502,503,504").split(",") if code.strip()]
+    # fail: CircuitOpenError fails the test | skip: the test is skipped with the reason
+    CIRCUIT_BREAKER_MODE = os.getenv("CIRCUIT_BREAKER_MODE", "fail").lower()
+
+    # ============================================
+    # Client-side Rate Limiting (token bucket per role + endpoint)
+    # ============================================
+    # Requests/sec applied to every role+endpoint pair; 0 disables the default
+    RATE_LIMIT_DEFAULT_RPS = float(os.getenv("RATE_LIMIT_DEFAULT_RPS", "0"))
+    # Per-endpoint overrides: "<endpoint>=<rps>[:<burst>],..." (rps 0 = unlimited)
+    # e.g. "/api/v1/nmt/inference=5:10,/api/v1/asr/inference=2"
+    RATE_LIMIT_RULES = os.getenv("RATE_LIMIT_RULES", "")
+
+    # ============================================
+    # Response Cache (idempotent catalog GETs)
+    # ============================================
+    # Opt-in TTL + ETag cache shared by all APIClients, keyed by role and URL.
+    # Revalidates with If-None-Match once an entry expires, and drops a
+    # service's entries after any POST/PUT/PATCH/DELETE to that service.
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+    # Comma-separated endpoints cached by default (role, permission, model and
+    # tenant catalogs)
+    RESPONSE_CACHE_ENDPOINTS = [
+        endpoint.strip()
+        for endpoint in os.getenv(
+            "RESPONSE_CACHE_ENDPOINTS",
+            "/api/v1/auth/roles/list,/api/v1/auth/permission/list,"
+            "/api/v1/model-management/models,/api/v1/multi-tenant/admin/list/tenants",
+        ).split(",")
+        if endpoint.strip()
+    ]
+
+    # ============================================
+    # Single-flight GETs
+    # ============================================
+    # Opt-in, like RESPONSE_CACHE_ENABLED: identical GETs (same URL, params and
+    # headers) issued while one is already in flight wait for it and share its
+    # httpx.Response object (so concurrent tests assert on and attach the same
+    # response). Pass coalesce=False on a call to always send it.
+    HTTP_SINGLE_FLIGHT = os.getenv("HTTP_SINGLE_FLIGHT", "false").lower() == "true"
+
+    # ============================================
+    # Refresh on 401
+    # ============================================
+    # A 401 for a token past its exp (or replaced meanwhile) triggers one
+    # TokenManager refresh shared by every failing caller, and the request is
+    # replayed once with the new token.
+    HTTP_REFRESH_ON_401 = os.getenv("HTTP_REFRESH_ON_401", "true").lower() == "true"
+
+    # ============================================
+    # Record / Replay Cassettes
+    # ============================================
+    # off | record (hit the platform and save every APIClient exchange per test)
+    # | replay (serve the saved exchanges, no network). HTTP_CASSETTE_LATENCY
+    # scales the recorded response times replay sleeps for (0 = no delay).
+    HTTP_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "off").lower()
+    HTTP_CASSETTE_DIR = os.getenv("HTTP_CASSETTE_DIR", "cassettes")
+    HTTP_CASSETTE_LATENCY = float(os.getenv("HTTP_CASSETTE_LATENCY", "0"))
+
+    # ============================================
+    # Allure Request/Response Capture
+    # ============================================
+    # on_failure: keep raw exchanges, format + attach only for failed tests
+    # always:     format + attach every exchange immediately (old behaviour)
+    ALLURE_CAPTURE_MODE = os.getenv("ALLURE_CAPTURE_MODE", "on_failure").lower()
+    # Max size of one Request/Response attachment; longer bodies are truncated
+    ALLURE_ATTACHMENT_MAX_BYTES = int(os.getenv("ALLURE_ATTACHMENT_MAX_BYTES", "262144"))
+    # base64 strings at least this long (audioContent, OCR images) are replaced
+    # by a sha256/length/prefix summary in the JSON attachment
+    ALLURE_BLOB_MIN_CHARS = int(os.getenv("ALLURE_BLOB_MIN_CHARS", "1024"))
+    # When to attach the decoded blob itself (once per digest per test):
+    # on_failure | always | never
+    ALLURE_ATTACH_BLOBS = os.getenv("ALLURE_ATTACH_BLOBS", "on_failure").lower()
+
+
+http_settings = HTTPSettings()
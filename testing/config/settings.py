@@ -1,8 +1,11 @@
+import json
 import os
+import tempfile
 from dotenv import load_dotenv
+from config.http_settings import HTTPSettings
 
 load_dotenv()
-class Settings:
+class Settings(HTTPSettings):
 
     # Environment identifier
     ENVIRONMENT = os.getenv("ENVIRONMENT", "unknown")
@@ -12,10 +15,30 @@ class Settings:
     def __init__(self):
         print(f"🌍 Environment: {self.ENVIRONMENT} ({self.BASE_URL})")
 
-
     # BASE_URL = os.getenv("BASE_URL")
     REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT"))
+    # Refresh cadence for access tokens that carry no JWT exp / expires_in
     TOKEN_REFRESH_INTERVAL = int(os.getenv("TOKEN_REFRESH_INTERVAL"))
+    # Tokens are refreshed this many seconds before their exp claim
+    TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", "60"))
+    # Failed refreshes: retries with full-jitter exponential backoff, then a full re-login
+    TOKEN_REFRESH_RETRIES = int(os.getenv("TOKEN_REFRESH_RETRIES", "3"))
+    TOKEN_REFRESH_BACKOFF_BASE = float(os.getenv("TOKEN_REFRESH_BACKOFF_BASE", "2"))
+    TOKEN_REFRESH_BACKOFF_MAX = float(os.getenv("TOKEN_REFRESH_BACKOFF_MAX", "30"))
+    # Token managers log in on first token use, so roles a run never touches never log in
+    TOKEN_LAZY_LOGIN = os.getenv("TOKEN_LAZY_LOGIN", "true").lower() == "true"
+    # Refreshes run by one scheduler thread on a pool of this many workers
+    TOKEN_REFRESH_WORKERS = int(os.getenv("TOKEN_REFRESH_WORKERS", "4"))
+    # How a TokenPool hands out its accounts: round_robin | lru (least recently used)
+    TOKEN_POOL_STRATEGY = os.getenv("TOKEN_POOL_STRATEGY", "round_robin").lower()
+    # Logins a TokenPool runs at once (keeps large pools under the login rate limit)
+    TOKEN_POOL_LOGIN_CONCURRENCY = int(os.getenv("TOKEN_POOL_LOGIN_CONCURRENCY", "4"))
+    # Token cache shared by pytest-xdist workers (see utils/token_cache.py):
+    # auto = within one xdist run, on = across runs too, off = every worker logs in
+    TOKEN_CACHE = os.getenv("TOKEN_CACHE", "auto").lower()
+    TOKEN_CACHE_DIR = os.getenv("TOKEN_CACHE_DIR", os.path.join(tempfile.gettempdir(), "api-tests-token-cache"))
+    # Cached access tokens expiring within this many seconds are not reused
+    TOKEN_CACHE_MIN_TTL = float(os.getenv("TOKEN_CACHE_MIN_TTL", "60"))
     #Admin
     ADMIN_USERNAME = os.getenv("ADMIN_USERNAME")
     ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
@@ -71,6 +94,25 @@ class Settings:
     MULTI_TENANT_LIST_USERS = os.getenv("MULTI_TENANT_LIST_USERS", "/api/v1/multi-tenant/list/users")
     MULTI_TENANT_VIEW_USER = os.getenv("MULTI_TENANT_VIEW_USER", "/api/v1/multi-tenant/view/user")
     MULTI_TENANT_VIEW_TENANT = os.getenv("MULTI_TENANT_VIEW_TENANT", "/api/v1/multi-tenant/view/tenant")
+
+    @staticmethod
+    def credentials(role: str) -> list:
+        """
+        Accounts of a role as [(email, password), ...]
+
+        <ROLE>_CREDENTIALS holds a JSON list of {"username": ..., "password": ...}
+        objects (or [username, password] pairs); without it the single
+        <ROLE>_USERNAME / <ROLE>_PASSWORD account is used.
+        """
+        role = role.upper()
+        raw = os.getenv(f"{role}_CREDENTIALS")
+        if not raw:
+            username = os.getenv(f"{role}_USERNAME")
+            return [(username, os.getenv(f"{role}_PASSWORD"))] if username else []
+        return [
+            (account["username"], account["password"]) if isinstance(account, dict) else tuple(account)
+            for account in json.loads(raw)
+        ]
     
 
 
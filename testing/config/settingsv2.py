@@ -1,13 +1,15 @@
 import os
 from dotenv import load_dotenv
+from config.http_settings import HTTPSettings
 
 load_dotenv()
 
 
-class Settings:
+class Settings(HTTPSettings):
     """
     Settings for JWT-based authentication (test_api_01/)
     No API key support - pure JWT Bearer token authentication
+    HTTP client knobs (pool, retries, cache, ...) come from config/http_settings.py
     """
 
     # Environment identifier
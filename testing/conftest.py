@@ -4,10 +4,23 @@ from pathlib import Path
 API_DIR = Path(__file__).parent
 sys.path.insert(0, str(API_DIR))
 import pytest
-from utils.auth import login_and_get_token_manager
-from utils.api_client import APIClient
+import pytest_asyncio
+from utils.auth import login_and_get_token_manager, refresh_scheduler, refresh_stats
+from utils.api_client import APIClient, AsyncAPIClient
 from config.settings import settings
 from utils.services import ServiceWithPayloads
+from utils.allure_capture import capture
+from utils.retry import retry_log
+from utils.rate_limit import shared_rate_limiter
+from utils.http_metrics import metrics, format_samples
+from utils.response_cache import shared_response_cache
+from utils.circuit_breaker import CircuitOpenError, shared_circuit_breakers
+from utils.timeouts import BUDGET_WARN_FRACTION, budget_report, shared_timeout_profiles
+from utils.cassette import cassettes
+from utils.single_flight import shared_single_flight
+from utils.helper import token_managers_needed
+import allure
+import json
 import time
 import os
 
@@ -29,14 +42,18 @@ def admin_client_with_valid_api_key(admin_token_manager):
     """
     Authenticated API client with VALID API key
     """
-    return APIClient(admin_token_manager, api_key=settings.ADMIN_VALID_API_KEY)
+    client = APIClient(admin_token_manager, api_key=settings.ADMIN_VALID_API_KEY, role="admin")
+    yield client
+    client.close()
 
 @pytest.fixture(scope="session")
 def admin_client_with_expired_api_key(admin_token_manager):
     """
     Authenticated API client with EXPIRED API key
     """
-    return APIClient(admin_token_manager, api_key=settings.ADMIN_INVALID_API_KEY)
+    client = APIClient(admin_token_manager, api_key=settings.ADMIN_INVALID_API_KEY, role="admin")
+    yield client
+    client.close()
 
 
     
@@ -54,21 +71,37 @@ def user_client_with_valid_api_key(user_token_manager):
     """
     Authenticated API client for USER role with VALID API key
     """
-    return APIClient(user_token_manager, api_key=settings.USER_VALID_API_KEY)  
+    client = APIClient(user_token_manager, api_key=settings.USER_VALID_API_KEY, role="user")
+    yield client
+    client.close()
 
 @pytest.fixture(scope="session")
 def user_client_with_expired_api_key(user_token_manager):
     """
     Authenticated API client for USER role with EXPIRED API key
     """
-    return APIClient(user_token_manager, api_key=settings.USER_INVALID_API_KEY)
+    client = APIClient(user_token_manager, api_key=settings.USER_INVALID_API_KEY, role="user")
+    yield client
+    client.close()
 
 @pytest.fixture(scope="session")
 def user_client_with_no_api_key(user_token_manager):
     """
     Authenticated API client for USER role with NO API key
     """
-    return APIClient(user_token_manager, api_key=None)
+    client = APIClient(user_token_manager, api_key=None, role="user")
+    yield client
+    client.close()
+
+
+@pytest_asyncio.fixture
+async def user_async_client_with_valid_api_key(user_token_manager):
+    """
+    Async API client for USER role with VALID API key
+    Function-scoped: the async connection pool is bound to the test's event loop
+    """
+    async with AsyncAPIClient(user_token_manager, api_key=settings.USER_VALID_API_KEY, role="user") as client:
+        yield client
 
 
 @pytest.fixture(scope="session")
@@ -86,7 +119,9 @@ def guest_client_with_valid_api_key(guest_token_manager):
     """
     Authenticated API client for GUEST role with VALID API key
     """
-    return APIClient(guest_token_manager, api_key=settings.GUEST_VALID_API_KEY)
+    client = APIClient(guest_token_manager, api_key=settings.GUEST_VALID_API_KEY, role="guest")
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
@@ -103,7 +138,30 @@ def moderator_client_with_valid_api_key(moderator_token_manager):
     """
     Authenticated API client for Moderator role with VALID API key
     """
-    return APIClient(moderator_token_manager, api_key=settings.MODERATOR_VALID_API_KEY)
+    client = APIClient(moderator_token_manager, api_key=settings.MODERATOR_VALID_API_KEY, role="moderator")
+    yield client
+    client.close()
+
+
+# Roles with a <role>_token_manager fixture (here or in test_api_v2/conftest.py)
+TOKEN_MANAGER_ROLES = ("adopter_admin", "admin", "tenant_admin", "moderator", "user", "guest")
+
+
+def pytest_collection_finish(session):
+    """Report which token managers (roles) the selected tests need - only those ever log in"""
+    reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is None or not session.items:
+        return
+    needed = {}
+    for item in session.items:
+        for name in token_managers_needed(item, TOKEN_MANAGER_ROLES):
+            needed[name] = needed.get(name, 0) + 1
+    mode = "lazy, on first token use" if settings.TOKEN_LAZY_LOGIN else "eager"
+    reporter.write_sep("-", f"Roles needed by {len(session.items)} selected tests (login: {mode})")
+    if not needed:
+        reporter.write_line("none - no selected test uses a token manager")
+    for name, count in sorted(needed.items()):
+        reporter.write_line(f"{name.removesuffix('_token_manager'):<20} {count:>6} tests")
 
 
 #####################################################MODEL MANAGEMENT##########################################################
@@ -145,9 +203,195 @@ def created_model(admin_client_with_valid_api_key):
     }
 
 
+################################ALLURE CAPTURE, RETRIES & TIMINGS#######################
+test_failed_key = pytest.StashKey[bool]()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Point record/replay at this test's cassette before any fixture sends a request"""
+    if cassettes:
+        cassettes.start_test(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Attach captured API exchanges when a test phase fails; record retries and timings per test
+
+    With CIRCUIT_BREAKER_MODE=skip, failures caused by an open circuit are reported as skips.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if (report.failed and shared_circuit_breakers.mode == "skip"
+            and call.excinfo is not None and call.excinfo.errisinstance(CircuitOpenError)):
+        # Dead backend: report the test as skipped with the circuit's reason instead of failing it
+        report.outcome = "skipped"
+        report.longrepr = (str(item.path), item.location[1] or 0, f"Skipped: {call.excinfo.value}")
+    if report.failed:
+        item.stash[test_failed_key] = True
+        capture.flush()
+    if report.when == "teardown":
+        retries = retry_log.finish_test(passed=not item.stash.get(test_failed_key, False))
+        if retries:
+            # Lets the report tell retried-then-passed apart from clean passes; a
+            # passing test's exchanges are attached too, so the retried calls show up
+            allure.dynamic.tag("retried")
+            capture.flush()
+            allure.attach(
+                body=json.dumps(retries, indent=2),
+                name=f"Retries — {len(retries)}",
+                attachment_type=allure.attachment_type.JSON,
+            )
+            item.user_properties.append(("http_retries", len(retries)))
+
+        timings = metrics.finish_test()
+        if timings:
+            allure.attach(
+                body=format_samples(timings),
+                name=f"HTTP timings — {len(timings)} requests",
+                attachment_type=allure.attachment_type.TEXT,
+            )
+
+        if cassettes:
+            cassettes.finish_test()
+
+        stats = capture.finish_test()
+        item.user_properties.append(("allure_capture_skipped_bytes", stats["skipped_bytes"]))
+        if stats["saved_seconds_estimate"] is not None:
+            item.user_properties.append(
+                ("allure_capture_saved_seconds", round(stats["saved_seconds_estimate"], 4))
+            )
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report request timings, timeout budgets, rate limiting, response caching, single-flight GETs,
+    cassettes, circuit breakers, retries, token refreshes and lazy Allure capture savings"""
+    timing_summary = metrics.summary()
+    if timing_summary:
+        terminalreporter.write_sep("-", "HTTP timings (ms: mean / p50 / p95)")
+        terminalreporter.write_line(
+            f"{'role':<15} {'method':<6} {'endpoint':<50} {'count':>6} "
+            f"{'ttfb':>20} {'total':>20} {'connect':>8} {'resp MB':>8}"
+        )
+        for (role, method, endpoint), row in sorted(timing_summary.items()):
+            ttfb = "/".join(f"{row[f'ttfb_{stat}'] * 1000:.0f}" for stat in ("mean", "p50", "p95"))
+            total = "/".join(f"{row[f'total_{stat}'] * 1000:.0f}" for stat in ("mean", "p50", "p95"))
+            terminalreporter.write_line(
+                f"{role:<15} {method:<6} {endpoint:<50} {row['count']:>6} "
+                f"{ttfb:>20} {total:>20} {row['connect_mean'] * 1000:>8.1f} "
+                f"{row['response_bytes'] / 1024 / 1024:>8.2f}"
+            )
+
+    budgets = budget_report(shared_timeout_profiles, timing_summary, settings.REQUEST_TIMEOUT) if shared_timeout_profiles else []
+    if budgets:
+        # The read timeout bounds each socket read, so p95 TTFB is what gets close to it
+        terminalreporter.write_sep("-", "Timeout budgets (s: worst p95 ttfb / worst p95 total / read timeout)")
+        for group, count, ttfb_p95, total_p95, read_budget, fired in budgets:
+            near = read_budget and ttfb_p95 > BUDGET_WARN_FRACTION * read_budget
+            terminalreporter.write_line(
+                f"{group:<16} {count:>6} req  {ttfb_p95:>7.2f} / {total_p95:>7.2f} / {read_budget:>6g}"
+                f"  timeouts fired: {fired}" + ("  <- near budget" if near else "")
+            )
+
+    if shared_rate_limiter:
+        limiter_stats = shared_rate_limiter.stats()
+        if limiter_stats:
+            terminalreporter.write_sep("-", "Client rate limits")
+            for (role, endpoint), (requests, waited, rate) in sorted(limiter_stats.items()):
+                terminalreporter.write_line(
+                    f"{role:<15} {endpoint:<50} {requests:>6} req @ {rate:g}/s, waited {waited:.2f}s"
+                )
+
+    compressed = {
+        key: row for key, row in timing_summary.items()
+        if row["request_bytes"] != row["request_bytes_raw"] or row["response_bytes"] != row["response_bytes_raw"]
+    }
+    if compressed:
+        terminalreporter.write_sep("-", "HTTP compression (KB on the wire / uncompressed)")
+        for (role, method, endpoint), row in sorted(compressed.items()):
+            terminalreporter.write_line(
+                f"{role:<15} {method:<6} {endpoint:<50} "
+                f"req {row['request_bytes'] / 1024:.1f}/{row['request_bytes_raw'] / 1024:.1f} "
+                f"resp {row['response_bytes'] / 1024:.1f}/{row['response_bytes_raw'] / 1024:.1f} "
+                f"[{', '.join(row['encodings'])}]"
+            )
+
+    if shared_response_cache:
+        cache_stats = shared_response_cache.stats
+        terminalreporter.write_sep("-", "Response cache")
+        terminalreporter.write_line(
+            f"hits: {cache_stats['hits']} | revalidated (304): {cache_stats['revalidated']} | "
+            f"misses: {cache_stats['misses']} | invalidated: {cache_stats['invalidated']}"
+        )
+
+    if shared_single_flight and shared_single_flight.stats["coalesced"]:
+        flight_stats = shared_single_flight.stats
+        terminalreporter.write_sep("-", "Single-flight GETs")
+        terminalreporter.write_line(
+            f"{flight_stats['coalesced']} identical concurrent GETs shared an in-flight request "
+            f"({flight_stats['sent']} coalescable GETs sent)"
+        )
+
+    if cassettes:
+        cassette_stats = cassettes.stats
+        terminalreporter.write_sep("-", f"HTTP cassettes ({cassettes.mode}: {cassettes.directory})")
+        terminalreporter.write_line(
+            f"recorded: {cassette_stats['recorded']} | replayed: {cassette_stats['replayed']} "
+            f"(body/query changed: {cassette_stats['loose']}, from other tests: {cassette_stats['fallback']}) | "
+            f"misses: {cassette_stats['misses']}"
+        )
+
+    opened = shared_circuit_breakers.opened()
+    if opened:
+        terminalreporter.write_sep("-", "Circuit breakers")
+        for endpoint, breaker in sorted(opened.items()):
+            terminalreporter.write_line(
+                f"{endpoint:<50} opened {breaker.stats['opened']}x, "
+                f"{breaker.stats['short_circuited']} calls short-circuited, now {breaker.state} "
+                f"(last failure: {breaker.last_failure})"
+            )
+
+    retry_totals = retry_log.totals
+    if retry_totals["retries"]:
+        terminalreporter.write_sep("-", "HTTP retries")
+        terminalreporter.write_line(
+            f"{retry_totals['retries']} retries across {retry_totals['retried_tests']} tests, "
+            f"{retry_totals['retried_then_passed']} retried-then-passed"
+        )
+
+    refresh_summary = refresh_stats.summary()
+    if refresh_summary:
+        terminalreporter.write_sep(
+            "-", f"Token refresh (1 scheduler thread, {refresh_scheduler.max_workers} workers)"
+        )
+        now = time.time()
+        for email, account in sorted(refresh_summary.items()):
+            latency = (
+                f"latency p50 {account['latency_p50'] * 1000:.0f} ms / max {account['latency_max'] * 1000:.0f} ms"
+                if account["latency_p50"] is not None else "not refreshed yet"
+            )
+            terminalreporter.write_line(
+                f"{email:<35} refreshes: {account['refreshes']} | re-logins: {account['relogins']} | "
+                f"failed attempts: {account['failures']} | "
+                f"on expired-token 401: {account['on_401']} (+{account['on_401_shared']} shared) | {latency} | "
+                f"next in {account['next_refresh_at'] - now:.0f}s, token expires in {account['expires_at'] - now:.0f}s"
+            )
+
+    totals = capture.totals
+    if not totals["tests"]:
+        return
+    terminalreporter.write_sep("-", f"Allure capture ({capture.mode})")
+    terminalreporter.write_line(
+        f"Exchanges attached: {totals['attached']} | skipped: {totals['skipped']} "
+        f"({totals['skipped_bytes'] / 1024 / 1024:.2f} MB, "
+        f"~{totals['saved_seconds_estimate']:.2f}s formatting saved)"
+    )
+
+
 ################################Exit####################################################
 def pytest_sessionfinish(session, exitstatus):
-    """Write environment info to Allure results after test run."""
+    """Stop the token refresh scheduler and write environment info to Allure results after test run."""
+    refresh_scheduler.shutdown()
     os.makedirs("allure/allure-results", exist_ok=True)
     with open("allure/allure-results/environment.properties", "w") as f:
         f.write(f"Environment={settings.ENVIRONMENT}\n")
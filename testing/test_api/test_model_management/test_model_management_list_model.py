@@ -27,7 +27,7 @@ class TestModelManagementListModels:
         print(f"🔍 Endpoint: {endpoint}")
         print(f"{'='*60}")
         
-        response = client.get(endpoint)
+        response = client.get(endpoint, cache=False)
         
         print(f"📊 Status Code: {response.status_code}")
         
@@ -363,7 +363,7 @@ class TestModelManagementListModels:
         print(f"🔍 Endpoint: {endpoint}")
         print(f"{'='*60}")
         
-        response = client.get(endpoint)
+        response = client.get(endpoint, cache=False)
         
         print(f"📊 Status Code: {response.status_code}")
         
@@ -67,23 +67,24 @@ class TestAdminServicesWithValidAPIKey:
         endpoint = "/api/v1/tts/inference"
         payload = ServiceWithPayloads.tts_from_sample()
         
-        response = admin_client_with_valid_api_key.post(endpoint, json=payload)
+        # Streamed: the audio is hashed/probed chunk by chunk instead of buffered
+        result = admin_client_with_valid_api_key.stream_audio("POST", endpoint, json=payload)
         
-        assert response.status_code == 200, (
-            f"Expected 200, got {response.status_code}. Response: {response.text}"
+        assert result.status_code == 200, (
+            f"Expected 200, got {result.status_code}. Response: {result.data}"
         )
         
-        data = response.json()
+        data = result.data
         assert "audio" in data, "Response missing 'audio' field"
         assert len(data["audio"]) > 0, "Audio array is empty"
-        assert "audioContent" in data["audio"][0], "Missing 'audioContent' in response"
-        assert data["audio"][0]["audioContent"], "audioContent is empty"
+        assert len(result.audio) == len(data["audio"]), "Missing 'audioContent' in response"
+        assert result.audio[0]["bytes"] > 0, "audioContent is empty"
         
         source_text = payload["input"][0]["source"][:50]  # First 50 chars
-        audio_content = data["audio"][0]["audioContent"]
+        audio = result.audio[0]
         
         print(f"\n✅ TTS: Generated audio for '{source_text}...'")
-        print(f"   Audio length: {len(audio_content)} characters")
+        print(f"   Audio: {audio['bytes']} bytes, {audio['duration_seconds']}s, sha256 {audio['sha256'][:16]}")
 
     def test_transliteration_service_with_valid_api_key_Admin(self, admin_client_with_valid_api_key):
         """
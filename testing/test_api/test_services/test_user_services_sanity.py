@@ -7,6 +7,23 @@ import pytest
 from utils.services import ServiceWithPayloads
 
 
+def inference_calls() -> dict:
+    """Every USER inference service: {name: (endpoint, prepared sample body)}"""
+    return {
+        "NMT": ("/api/v1/nmt/inference", ServiceWithPayloads.prepared_from_sample("nmt")),
+        "ASR": ("/api/v1/asr/inference", ServiceWithPayloads.prepared_from_sample("asr")),
+        "TTS": ("/api/v1/tts/inference", ServiceWithPayloads.prepared_from_sample("tts")),
+        "Transliteration": ("/api/v1/transliteration/inference", ServiceWithPayloads.prepared_from_sample("transliteration")),
+        "Text Language Detection": ("/api/v1/language-detection/inference", ServiceWithPayloads.prepared_from_sample("text_language_detection")),
+        "Speaker Diarization": ("/api/v1/speaker-diarization/inference", ServiceWithPayloads.prepared_from_sample("speaker_diarization")),
+        "Language Diarization": ("/api/v1/language-diarization/inference", ServiceWithPayloads.prepared_from_sample("language_diarization")),
+        "Audio Language Detection": ("/api/v1/audio-lang-detection/inference", ServiceWithPayloads.prepared_from_sample("audio_language_detection")),
+        "NER": ("/api/v1/ner/inference", ServiceWithPayloads.prepared_from_sample("ner")),
+        "OCR": ("/api/v1/ocr/inference", ServiceWithPayloads.prepared_from_sample("ocr")),
+        "Pipeline": ("/api/v1/pipeline/inference", ServiceWithPayloads.prepared_from_sample("pipeline")),
+    }
+
+
 class TestUserServicesWithValidAPIKey:
     """Test USER role access to AI services with valid API key"""
     
@@ -15,7 +32,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test NMT service with valid API key
         """
         endpoint = "/api/v1/nmt/inference"
-        payload = ServiceWithPayloads.nmt_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("nmt")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -39,7 +56,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test ASR service with valid API key
         """
         endpoint = "/api/v1/asr/inference"
-        payload = ServiceWithPayloads.asr_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("asr")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -61,32 +78,33 @@ class TestUserServicesWithValidAPIKey:
         User : Test TTS service with valid API key
         """
         endpoint = "/api/v1/tts/inference"
-        payload = ServiceWithPayloads.tts_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("tts")
         
-        response = user_client_with_valid_api_key.post(endpoint, json=payload)
+        # Streamed: the audio is hashed/probed chunk by chunk instead of buffered
+        result = user_client_with_valid_api_key.stream_audio("POST", endpoint, json=payload)
         
-        assert response.status_code == 200, (
-            f"Expected 200, got {response.status_code}. Response: {response.text}"
+        assert result.status_code == 200, (
+            f"Expected 200, got {result.status_code}. Response: {result.data}"
         )
         
-        data = response.json()
+        data = result.data
         assert "audio" in data
         assert len(data["audio"]) > 0
-        assert "audioContent" in data["audio"][0]
-        assert data["audio"][0]["audioContent"]
+        assert len(result.audio) == len(data["audio"]), "Missing 'audioContent' in response"
+        assert result.audio[0]["bytes"] > 0
         
-        source_text = payload["input"][0]["source"][:50]
-        audio_content = data["audio"][0]["audioContent"]
+        source_text = payload.json()["input"][0]["source"][:50]
+        audio = result.audio[0]
         
         print(f"\n✅ USER TTS: Generated audio for '{source_text}...'")
-        print(f"   Audio length: {len(audio_content)} characters")
+        print(f"   Audio: {audio['bytes']} bytes, {audio['duration_seconds']}s, sha256 {audio['sha256'][:16]}")
 
     def test_transliteration_service_with_valid_api_key_User(self, user_client_with_valid_api_key):
         """
         User : Test Transliteration service with valid API key
         """
         endpoint = "/api/v1/transliteration/inference"
-        payload = ServiceWithPayloads.transliteration_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("transliteration")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -110,7 +128,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test Text Language Detection service with valid API key
         """
         endpoint = "/api/v1/language-detection/inference"
-        payload = ServiceWithPayloads.text_language_detection_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("text_language_detection")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -139,7 +157,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test Speaker Diarization service with valid API key
         """
         endpoint = "/api/v1/speaker-diarization/inference"
-        payload = ServiceWithPayloads.speaker_diarization_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("speaker_diarization")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -169,7 +187,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test Language Diarization service with valid API key
         """
         endpoint = "/api/v1/language-diarization/inference"
-        payload = ServiceWithPayloads.language_diarization_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("language_diarization")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -196,7 +214,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test Audio Language Detection service with valid API key
         """
         endpoint = "/api/v1/audio-lang-detection/inference"
-        payload = ServiceWithPayloads.audio_language_detection_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("audio_language_detection")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -223,7 +241,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test NER service with valid API key
         """
         endpoint = "/api/v1/ner/inference"
-        payload = ServiceWithPayloads.ner_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("ner")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -253,7 +271,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test OCR service with valid API key
         """
         endpoint = "/api/v1/ocr/inference"
-        payload = ServiceWithPayloads.ocr_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("ocr")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -278,7 +296,7 @@ class TestUserServicesWithValidAPIKey:
         User : Test Pipeline service with valid API key (ASR → Translation → TTS)
         """
         endpoint = "/api/v1/pipeline/inference"
-        payload = ServiceWithPayloads.pipeline_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("pipeline")
         
         response = user_client_with_valid_api_key.post(endpoint, json=payload)
         
@@ -329,6 +347,50 @@ class TestUserServicesWithValidAPIKey:
         print(f"   TTS: Generated audio ({len(audio_content)} chars)")
 
 
+class TestUserServicesConcurrent:
+    """Fire every USER inference call at once over the async client"""
+
+    @pytest.mark.asyncio
+    async def test_all_services_concurrently_with_valid_api_key_User(self, user_async_client_with_valid_api_key):
+        """
+        User : All inference services in parallel with valid API key
+        """
+        calls = inference_calls()
+
+        responses = await user_async_client_with_valid_api_key.batch(
+            [("POST", endpoint, {"json": payload}) for endpoint, payload in calls.values()]
+        )
+
+        failures = {
+            service: f"{response.status_code}: {response.text[:200]}"
+            for service, response in zip(calls, responses)
+            if response.status_code != 200
+        }
+        assert not failures, f"Expected 200 from every service, got: {failures}"
+
+        print(f"\n✅ USER concurrent inference: {len(responses)} services returned 200")
+
+    def test_all_services_blocked_concurrently_with_no_api_key_User(self, user_client_with_no_api_key):
+        """
+        User : All inference services in one batch with no API key
+        """
+        calls = inference_calls()
+
+        responses = user_client_with_no_api_key.batch(
+            [("POST", endpoint, {"json": payload}) for endpoint, payload in calls.values()],
+            max_concurrency=4,
+        )
+
+        not_blocked = {
+            service: f"{response.status_code}: {response.text[:200]}"
+            for service, response in zip(calls, responses)
+            if response.status_code not in [401, 403]
+        }
+        assert not not_blocked, f"Expected 401/403 from every service, got: {not_blocked}"
+
+        print(f"\n✅ USER batch: {len(responses)} services correctly blocked with no API key")
+
+
 class TestUserServicesWithInvalidAPIKey:
     """Test USER role access to AI services with invalid API key"""
     
@@ -337,7 +399,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test NMT service with invalid API key
         """
         endpoint = "/api/v1/nmt/inference"
-        payload = ServiceWithPayloads.nmt_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("nmt")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -356,7 +418,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test ASR service with invalid API key
         """
         endpoint = "/api/v1/asr/inference"
-        payload = ServiceWithPayloads.asr_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("asr")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -375,7 +437,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test TTS service with invalid API key
         """
         endpoint = "/api/v1/tts/inference"
-        payload = ServiceWithPayloads.tts_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("tts")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -394,7 +456,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test Transliteration service with invalid API key
         """
         endpoint = "/api/v1/transliteration/inference"
-        payload = ServiceWithPayloads.transliteration_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("transliteration")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -413,7 +475,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test Text Language Detection service with invalid API key
         """
         endpoint = "/api/v1/language-detection/inference"
-        payload = ServiceWithPayloads.text_language_detection_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("text_language_detection")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -432,7 +494,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test Speaker Diarization service with invalid API key
         """
         endpoint = "/api/v1/speaker-diarization/inference"
-        payload = ServiceWithPayloads.speaker_diarization_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("speaker_diarization")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -451,7 +513,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test Language Diarization service with invalid API key
         """
         endpoint = "/api/v1/language-diarization/inference"
-        payload = ServiceWithPayloads.language_diarization_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("language_diarization")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -470,7 +532,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test Audio Language Detection service with invalid API key
         """
         endpoint = "/api/v1/audio-lang-detection/inference"
-        payload = ServiceWithPayloads.audio_language_detection_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("audio_language_detection")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -489,7 +551,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test NER service with invalid API key
         """
         endpoint = "/api/v1/ner/inference"
-        payload = ServiceWithPayloads.ner_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("ner")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -508,7 +570,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test OCR service with invalid API key
         """
         endpoint = "/api/v1/ocr/inference"
-        payload = ServiceWithPayloads.ocr_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("ocr")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -527,7 +589,7 @@ class TestUserServicesWithInvalidAPIKey:
         User : Test Pipeline service with invalid API key
         """
         endpoint = "/api/v1/pipeline/inference"
-        payload = ServiceWithPayloads.pipeline_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("pipeline")
         
         response = user_client_with_expired_api_key.post(endpoint, json=payload)
         
@@ -550,7 +612,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test NMT service with no API key
         """
         endpoint = "/api/v1/nmt/inference"
-        payload = ServiceWithPayloads.nmt_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("nmt")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -569,7 +631,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test ASR service with no API key
         """
         endpoint = "/api/v1/asr/inference"
-        payload = ServiceWithPayloads.asr_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("asr")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -590,7 +652,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test TTS service with no API key
         """
         endpoint = "/api/v1/tts/inference"
-        payload = ServiceWithPayloads.tts_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("tts")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -609,7 +671,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test Transliteration service with no API key
         """
         endpoint = "/api/v1/transliteration/inference"
-        payload = ServiceWithPayloads.transliteration_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("transliteration")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -628,7 +690,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test Text Language Detection service with no API key
         """
         endpoint = "/api/v1/language-detection/inference"
-        payload = ServiceWithPayloads.text_language_detection_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("text_language_detection")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -647,7 +709,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test Speaker Diarization service with no API key
         """
         endpoint = "/api/v1/speaker-diarization/inference"
-        payload = ServiceWithPayloads.speaker_diarization_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("speaker_diarization")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -666,7 +728,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test Language Diarization service with no API key
         """
         endpoint = "/api/v1/language-diarization/inference"
-        payload = ServiceWithPayloads.language_diarization_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("language_diarization")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -685,7 +747,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test Audio Language Detection service with no API key
         """
         endpoint = "/api/v1/audio-lang-detection/inference"
-        payload = ServiceWithPayloads.audio_language_detection_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("audio_language_detection")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -704,7 +766,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test NER service with no API key
         """
         endpoint = "/api/v1/ner/inference"
-        payload = ServiceWithPayloads.ner_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("ner")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -723,7 +785,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test OCR service with no API key
         """
         endpoint = "/api/v1/ocr/inference"
-        payload = ServiceWithPayloads.ocr_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("ocr")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
@@ -743,7 +805,7 @@ class TestUserServicesWithNoAPIKey:
         User : Test Pipeline service with no API key
         """
         endpoint = "/api/v1/pipeline/inference"
-        payload = ServiceWithPayloads.pipeline_from_sample()
+        payload = ServiceWithPayloads.prepared_from_sample("pipeline")
         
         response = user_client_with_no_api_key.post(endpoint, json=payload)
         
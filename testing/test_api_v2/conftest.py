@@ -1,6 +1,7 @@
 """
 Pytest fixtures for test_api_v2/ - JWT-Only Authentication
-Provides session-scoped fixtures for all 6 roles with automatic token refresh
+Provides session-scoped fixtures for all 6 roles with automatic token refresh;
+the roles the collected tests need are logged in concurrently at session start
 """
 
 import sys
@@ -11,8 +12,11 @@ API_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(API_DIR))
 
 import pytest
-from utils.auth import login_and_get_token_manager
+from utils.auth import TokenPool, login_all
 from utils.api_clientv2 import APIClient
+from utils.base_client import prewarm_clients
+from utils.cassette import cassettes
+from utils.helper import token_managers_needed
 from config.settingsv2 import settings
 from utils.services import ServiceWithPayloads
 import time
@@ -23,88 +27,105 @@ import os
 # JWT TOKEN MANAGERS (Session-scoped)
 # ============================================
 
+# role -> (email, password)
+ROLE_CREDENTIALS = {
+    "adopter_admin": (settings.ADOPTER_ADMIN_USERNAME, settings.ADOPTER_ADMIN_PASSWORD),
+    "admin": (settings.ADMIN_USERNAME, settings.ADMIN_PASSWORD),
+    "tenant_admin": (settings.TENANT_ADMIN_USERNAME, settings.TENANT_ADMIN_PASSWORD),
+    "moderator": (settings.MODERATOR_USERNAME, settings.MODERATOR_PASSWORD),
+    "user": (settings.USER_USERNAME, settings.USER_PASSWORD),
+    "guest": (settings.GUEST_USERNAME, settings.GUEST_PASSWORD),
+}
+login_report_key = pytest.StashKey[tuple]()
+
+
+def requested_roles(items) -> list:
+    """Roles whose token manager any collected test uses (including via getfixturevalue parameters)"""
+    needed = set().union(*(token_managers_needed(item, ROLE_CREDENTIALS) for item in items))
+    return [role for role in ROLE_CREDENTIALS if f"{role}_token_manager" in needed]
+
+
+@pytest.fixture(scope="session")
+def role_token_managers(request):
+    """
+    Log in every role the collected tests use, concurrently, once per session
+
+    Returns {role: LoginResult}. A role whose login failed only errors its own
+    tests; the other roles still come up. Per-role login latency is reported
+    in the terminal summary.
+    """
+    roles = requested_roles(request.session.items)
+    started = time.perf_counter()
+    logins = login_all({role: ROLE_CREDENTIALS[role] for role in roles})
+    request.config.stash[login_report_key] = (time.perf_counter() - started, logins)
+    yield logins
+    for result in logins.values():
+        if result.manager:
+            result.manager.stop_background_refresh()
+
+
+def _token_manager_for(logins: dict, role: str):
+    """A role's TokenManager from the session bootstrap (logging in now if it was not requested)"""
+    if role not in logins:
+        logins.update(login_all({role: ROLE_CREDENTIALS[role]}))
+    result = logins[role]
+    if result.error is not None:
+        pytest.fail(f"Login failed for role '{role}': {result.error!r}", pytrace=False)
+    return result.manager
+
+
 @pytest.fixture(scope="session")
-def adopter_admin_token_manager():
+def adopter_admin_token_manager(role_token_managers):
     """
-    Login once per test session for ADOPTER ADMIN role
+    Token manager for ADOPTER ADMIN role
     Can create tenants (super admin privileges)
     """
-    token_manager = login_and_get_token_manager(
-        settings.ADOPTER_ADMIN_USERNAME,
-        settings.ADOPTER_ADMIN_PASSWORD
-    )
-    yield token_manager
-    token_manager.stop_background_refresh()
+    return _token_manager_for(role_token_managers, "adopter_admin")
 
 
 @pytest.fixture(scope="session")
-def admin_token_manager():
+def admin_token_manager(role_token_managers):
     """
-    Login once per test session for ADMIN role
+    Token manager for ADMIN role
     Full access except tenant creation
     """
-    token_manager = login_and_get_token_manager(
-        settings.ADMIN_USERNAME,
-        settings.ADMIN_PASSWORD
-    )
-    yield token_manager
-    token_manager.stop_background_refresh()
+    return _token_manager_for(role_token_managers, "admin")
 
 
 @pytest.fixture(scope="session")
-def tenant_admin_token_manager():
+def tenant_admin_token_manager(role_token_managers):
     """
-    Login once per test session for TENANT ADMIN role
+    Token manager for TENANT ADMIN role
     Tenant-scoped access, NO model/service management
     """
-    token_manager = login_and_get_token_manager(
-        settings.TENANT_ADMIN_USERNAME,
-        settings.TENANT_ADMIN_PASSWORD
-    )
-    yield token_manager
-    token_manager.stop_background_refresh()
+    return _token_manager_for(role_token_managers, "tenant_admin")
 
 
 @pytest.fixture(scope="session")
-def moderator_token_manager():
+def moderator_token_manager(role_token_managers):
     """
-    Login once per test session for MODERATOR role
+    Token manager for MODERATOR role
     Model registry view, logs, moderate access
     """
-    token_manager = login_and_get_token_manager(
-        settings.MODERATOR_USERNAME,
-        settings.MODERATOR_PASSWORD
-    )
-    yield token_manager
-    token_manager.stop_background_refresh()
+    return _token_manager_for(role_token_managers, "moderator")
 
 
 @pytest.fixture(scope="session")
-def user_token_manager():
+def user_token_manager(role_token_managers):
     """
-    Login once per test session for USER role
+    Token manager for USER role
     Inference access
     """
-    token_manager = login_and_get_token_manager(
-        settings.USER_USERNAME,
-        settings.USER_PASSWORD
-    )
-    yield token_manager
-    token_manager.stop_background_refresh()
+    return _token_manager_for(role_token_managers, "user")
 
 
 @pytest.fixture(scope="session")
-def guest_token_manager():
+def guest_token_manager(role_token_managers):
     """
-    Login once per test session for GUEST role
+    Token manager for GUEST role
     Limited inference (configurable: default NMT, ASR, TTS)
     """
-    token_manager = login_and_get_token_manager(
-        settings.GUEST_USERNAME,
-        settings.GUEST_PASSWORD
-    )
-    yield token_manager
-    token_manager.stop_background_refresh()
+    return _token_manager_for(role_token_managers, "guest")
 
 
 # ============================================
@@ -117,7 +138,9 @@ def adopter_admin_client(adopter_admin_token_manager):
     Authenticated API client for ADOPTER ADMIN role
     Uses JWT Bearer token only (no API keys)
     """
-    return APIClient(adopter_admin_token_manager)
+    client = APIClient(adopter_admin_token_manager, role="adopter_admin")
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
@@ -126,7 +149,9 @@ def admin_client(admin_token_manager):
     Authenticated API client for ADMIN role
     Uses JWT Bearer token only (no API keys)
     """
-    return APIClient(admin_token_manager)
+    client = APIClient(admin_token_manager, role="admin")
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
@@ -135,7 +160,9 @@ def tenant_admin_client(tenant_admin_token_manager):
     Authenticated API client for TENANT ADMIN role
     Uses JWT Bearer token only (no API keys)
     """
-    return APIClient(tenant_admin_token_manager)
+    client = APIClient(tenant_admin_token_manager, role="tenant_admin")
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
@@ -144,7 +171,9 @@ def moderator_client(moderator_token_manager):
     Authenticated API client for MODERATOR role
     Uses JWT Bearer token only (no API keys)
     """
-    return APIClient(moderator_token_manager)
+    client = APIClient(moderator_token_manager, role="moderator")
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
@@ -153,7 +182,9 @@ def user_client(user_token_manager):
     Authenticated API client for USER role
     Uses JWT Bearer token only (no API keys)
     """
-    return APIClient(user_token_manager)
+    client = APIClient(user_token_manager, role="user")
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
@@ -162,7 +193,73 @@ def guest_client(guest_token_manager):
     Authenticated API client for GUEST role
     Uses JWT Bearer token only (no API keys)
     """
-    return APIClient(guest_token_manager)
+    client = APIClient(guest_token_manager, role="guest")
+    yield client
+    client.close()
+
+
+# ============================================
+# MULTI-ACCOUNT TOKEN POOLS (load generation)
+# ============================================
+
+@pytest.fixture(scope="session")
+def token_pools():
+    """
+    TokenPool per role, logged in on first use: token_pools("user")
+
+    Accounts come from <ROLE>_CREDENTIALS (a JSON list), falling back to the
+    single <ROLE>_USERNAME account; TOKEN_POOL_STRATEGY picks round_robin or lru.
+    """
+    pools = {}
+
+    def pool_for(role: str) -> TokenPool:
+        if role not in pools:
+            pools[role] = TokenPool.for_role(role)
+        return pools[role]
+
+    yield pool_for
+    for pool in pools.values():
+        pool.stop()
+
+
+@pytest.fixture(scope="session")
+def user_pool_client(token_pools):
+    """
+    API client for USER role spreading requests over every configured USER account
+    For multi-user load on inference endpoints
+    """
+    client = APIClient(token_pools("user"), role="user")
+    yield client
+    client.close()
+
+
+# ============================================
+# CONNECTION PRE-WARMING (opt-in)
+# ============================================
+
+prewarm_key = pytest.StashKey[tuple]()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prewarmed_clients(request):
+    """
+    Open HTTP_PREWARM_CONNECTIONS keep-alive connections per role client
+    the collected tests use (all clients in parallel) before the first test
+    runs, so its latency reflects the API rather than DNS/TCP/TLS setup.
+    No-op when set to 0 or when replaying cassettes.
+    """
+    if settings.HTTP_PREWARM_CONNECTIONS <= 0 or (cassettes and cassettes.offline):
+        return
+    logins = request.getfixturevalue("role_token_managers")
+    # A role whose login failed errors its own tests, not the warm-up
+    clients = [request.getfixturevalue(f"{role}_client") for role, result in logins.items() if result.manager]
+    started = time.perf_counter()
+    results = prewarm_clients(
+        {client.role: client for client in clients},
+        settings.HTTP_PREWARM_CONNECTIONS,
+        settings.HTTP_PREWARM_PATH,
+    )
+    request.config.stash[prewarm_key] = (time.perf_counter() - started, results)
 
 
 # ============================================
@@ -181,7 +278,9 @@ def unauthenticated_client():
     mock_token_manager = MagicMock()
     mock_token_manager.get_access_token.return_value = None
 
-    return APIClient(None)  # No token manager = no auth
+    client = APIClient(None)
+    yield client
+    client.close()
 
 
 # ============================================
@@ -238,6 +337,32 @@ def created_model(admin_client):
     }
 
 
+# ============================================
+# TERMINAL SUMMARY
+# ============================================
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report per-role login latency and how long connection pre-warming took per role client"""
+    logins = config.stash.get(login_report_key, None)
+    if logins is not None:
+        elapsed, results = logins
+        terminalreporter.write_sep("-", f"Role logins (parallel session bootstrap: {elapsed:.2f}s wall)")
+        for role, result in results.items():
+            outcome = f"failed: {result.error!r}" if result.error is not None else "ok"
+            terminalreporter.write_line(f"{role:<15} {result.seconds * 1000:>7.0f} ms  {outcome}")
+
+    warmup = config.stash.get(prewarm_key, None)
+    if warmup is None:
+        return
+    elapsed, results = warmup
+    terminalreporter.write_sep(
+        "-", f"Connection pre-warm ({settings.HTTP_PREWARM_CONNECTIONS} per client, {elapsed:.2f}s wall)"
+    )
+    for role, result in results.items():
+        outcome = f"failed: {result!r}" if isinstance(result, Exception) else f"{result * 1000:.0f} ms"
+        terminalreporter.write_line(f"{role:<15} {outcome}")
+
+
 # ============================================
 # ALLURE REPORTING HOOK
 # ============================================
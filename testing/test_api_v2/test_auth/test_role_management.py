@@ -71,7 +71,7 @@ class TestRoleManagementRBAC:
         """
         client = request.getfixturevalue(role_fixture)
 
-        response = client.get(settings.ROLE_LIST)
+        response = client.get(settings.ROLE_LIST, cache=False)
 
         assert response.status_code == 200, (
             f"{role_name} should be able to list roles, got {response.status_code}: {response.text}"
@@ -100,7 +100,7 @@ class TestRoleManagementRBAC:
         """
         client = request.getfixturevalue(role_fixture)
 
-        response = client.get(settings.ROLE_LIST)
+        response = client.get(settings.ROLE_LIST, cache=False)
 
         assert response.status_code == 403, (
             f"{role_name} should NOT be able to list roles, expected 403 but got {response.status_code}: {response.text}"
@@ -160,7 +160,7 @@ class TestRoleManagementRBAC:
         """
         client = request.getfixturevalue(role_fixture)
 
-        response = client.get(settings.PERMISSION_CATALOG)
+        response = client.get(settings.PERMISSION_CATALOG, cache=False)
 
         assert response.status_code == 200, (
             f"{role_name} should be able to access permission catalog, got {response.status_code}: {response.text}"
@@ -193,7 +193,7 @@ class TestRoleManagementRBAC:
         """
         client = request.getfixturevalue(role_fixture)
 
-        response = client.get(settings.PERMISSION_CATALOG)
+        response = client.get(settings.PERMISSION_CATALOG, cache=False)
 
         assert response.status_code == 403, (
             f"{role_name} should NOT be able to access permission catalog, expected 403 but got {response.status_code}: {response.text}"
@@ -0,0 +1,69 @@
+"""
+Offline fixtures for the utils/ unit tests
+
+Clients here send through httpx.MockTransport, so nothing reaches the
+network and no role has to log in.
+"""
+
+import httpx
+import pytest
+import pytest_asyncio
+from utils.base_client import AsyncClientMixin, BaseAPIClient
+
+MOCK_BASE_URL = "http://platform.test"
+
+
+class MockAPIClient(BaseAPIClient):
+    """APIClient whose requests are answered by handler(request)"""
+
+    def __init__(self, handler, token_manager=None, **client_options):
+        """
+        Args:
+            handler: Callable(httpx.Request) -> httpx.Response (see httpx.MockTransport)
+            token_manager: Optional TokenManager stand-in
+            **client_options: BaseAPIClient options (retry_policy=, response_cache=, ...)
+        """
+        self.handler = handler
+        super().__init__(MOCK_BASE_URL, token_manager, 5.0, **client_options)
+
+    def _build_headers(self, access_token: str) -> dict:
+        return {"Authorization": f"Bearer {access_token}"} if access_token else {}
+
+    def _client_kwargs(self) -> dict:
+        kwargs = super()._client_kwargs()
+        kwargs["transport"] = httpx.MockTransport(self.handler)
+        return kwargs
+
+
+class AsyncMockAPIClient(AsyncClientMixin, MockAPIClient):
+    """asyncio variant of MockAPIClient (close with `async with` / aclose())"""
+
+
+@pytest.fixture
+def mock_client():
+    """Factory: mock_client(handler, **client_options) -> MockAPIClient, closed after the test"""
+    clients = []
+
+    def make(handler, **client_options):
+        client = MockAPIClient(handler, **client_options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest_asyncio.fixture
+async def async_mock_client():
+    """Factory: async_mock_client(handler, **client_options) -> AsyncMockAPIClient, closed after the test"""
+    clients = []
+
+    def make(handler, **client_options):
+        client = AsyncMockAPIClient(handler, **client_options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,143 @@
+"""
+Unit tests for utils/cassette.py (offline, httpx.MockTransport + tmp_path)
+
+Test Coverage:
+- Record writes one gzip cassette per test without the bearer token
+- Replay serves recorded responses in order, then repeats the last one
+- Canonical JSON body keys; loose (role, method, path) and cross-cassette fallbacks
+- Unrecorded requests raise CassetteMissError
+"""
+
+import gzip
+import json
+import allure
+import httpx
+import pytest
+from utils.cassette import CassetteMissError, CassetteStore, CassetteTransport, cassette_name, request_keys
+
+TEST_ID = "test_api_v2/test_auth/test_login.py::TestLogin::test_me[user_client-User]"
+TOKEN = "secret-bearer-token"
+
+
+def platform():
+    """MockTransport handler numbering its responses"""
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, headers={"Set-Cookie": "session=1"}, json={"response": len(sent)})
+
+    handler.sent = sent
+    return handler
+
+
+def record(directory, nodeid: str, *requests, role: str = "user"):
+    """Record (method, path, json) requests for one test; returns the platform handler"""
+    handler = platform()
+    store = CassetteStore("record", directory)
+    store.start_test(nodeid)
+    with httpx.Client(base_url="http://platform.test",
+                      transport=CassetteTransport(store, role, httpx.MockTransport(handler)),
+                      headers={"Authorization": f"Bearer {TOKEN}"}) as client:
+        for method, path, body in requests:
+            client.request(method, path, json=body)
+    store.finish_test()
+    return handler
+
+
+def replay_client(store: CassetteStore, role: str = "user") -> httpx.Client:
+    return httpx.Client(base_url="http://platform.test", transport=CassetteTransport(store, role))
+
+
+@allure.epic("Test Harness")
+@allure.feature("Cassettes")
+class TestRecord:
+    """Record mode"""
+
+    def test_writes_one_cassette_per_test(self, tmp_path):
+        record(tmp_path, TEST_ID, ("GET", "/api/v1/auth/me", None), ("POST", "/api/v1/nmt/inference", {"a": 1}))
+
+        path = tmp_path / cassette_name(TEST_ID)
+        content = json.loads(gzip.decompress(path.read_bytes()))
+        assert content["test"] == TEST_ID
+        assert [exchange["status"] for exchange in content["exchanges"]] == [200, 200]
+
+    def test_secrets_and_volatile_headers_not_stored(self, tmp_path):
+        record(tmp_path, TEST_ID, ("GET", "/api/v1/auth/me", None))
+
+        raw = gzip.decompress((tmp_path / cassette_name(TEST_ID)).read_bytes()).decode()
+        assert TOKEN not in raw
+        assert "session=1" not in raw
+
+    def test_nothing_written_without_exchanges(self, tmp_path):
+        store = CassetteStore("record", tmp_path)
+        store.start_test(TEST_ID)
+        store.finish_test()
+        assert list(tmp_path.iterdir()) == []
+
+
+@allure.epic("Test Harness")
+@allure.feature("Cassettes")
+class TestReplay:
+    """Replay mode"""
+
+    def test_replays_in_order_then_repeats_last(self, tmp_path):
+        record(tmp_path, TEST_ID, *[("GET", "/api/v1/auth/me", None)] * 2)
+        store = CassetteStore("replay", tmp_path)
+        store.start_test(TEST_ID)
+
+        with replay_client(store) as client:
+            served = [client.get("/api/v1/auth/me").json()["response"] for _ in range(3)]
+
+        assert served == [1, 2, 2]
+        assert store.stats["replayed"] == 3
+
+    def test_json_body_matched_in_canonical_form(self, tmp_path):
+        record(tmp_path, TEST_ID, ("POST", "/api/v1/nmt/inference", {"a": 1, "b": 2}))
+        store = CassetteStore("replay", tmp_path)
+        store.start_test(TEST_ID)
+
+        with replay_client(store) as client:
+            response = client.post("/api/v1/nmt/inference", content=b'{"b": 2, "a": 1}',
+                                   headers={"Content-Type": "application/json"})
+
+        assert response.status_code == 200
+        assert store.stats["loose"] == 0, "Reordered keys should still be an exact match"
+
+    def test_changed_body_falls_back_to_loose_key(self, tmp_path):
+        record(tmp_path, TEST_ID, ("POST", "/api/v1/model-management/models", {"name": "model-1700000000"}))
+        store = CassetteStore("replay", tmp_path)
+        store.start_test(TEST_ID)
+
+        with replay_client(store) as client:
+            response = client.post("/api/v1/model-management/models", json={"name": "model-1800000000"})
+
+        assert response.json() == {"response": 1}
+        assert store.stats["loose"] == 1
+
+    def test_other_tests_cassettes_used_as_fallback(self, tmp_path):
+        record(tmp_path, "test_api_v2/conftest.py::setup", ("GET", "/api/v1/auth/roles/list", None))
+        store = CassetteStore("replay", tmp_path)
+        store.start_test(TEST_ID)
+
+        with replay_client(store) as client:
+            assert client.get("/api/v1/auth/roles/list").status_code == 200
+        assert store.stats["fallback"] == 1
+
+    def test_role_is_part_of_the_key(self, tmp_path):
+        record(tmp_path, TEST_ID, ("GET", "/api/v1/auth/me", None), role="admin")
+        store = CassetteStore("replay", tmp_path)
+        store.start_test(TEST_ID)
+
+        with replay_client(store, role="guest") as client, pytest.raises(CassetteMissError):
+            client.get("/api/v1/auth/me")
+        assert store.stats["misses"] == 1
+
+    def test_query_order_does_not_matter(self):
+        first = httpx.Request("GET", "http://platform.test/api/v1/x?b=2&a=1")
+        second = httpx.Request("GET", "http://platform.test/api/v1/x?a=1&b=2")
+        assert request_keys("user", first) == request_keys("user", second)
+
+    def test_replay_is_offline(self):
+        assert CassetteStore("replay", "unused").offline
+        assert not CassetteStore("record", "unused").offline
@@ -0,0 +1,201 @@
+"""
+Unit tests for utils/circuit_breaker.py (offline, httpx.MockTransport)
+
+Test Coverage:
+- closed -> open after N consecutive failures; successes reset the count
+- open circuits fail fast with CircuitOpenError
+- half-open: a single probe, closed by success, re-opened by failure
+- abandon_probe releases a probe cancelled mid-flight
+- APIClient records one outcome per call, after its retries
+"""
+
+import asyncio
+import allure
+import httpx
+import pytest
+from utils import retry
+from utils.circuit_breaker import (
+    CLOSED, HALF_OPEN, NO_BREAKER, OPEN, CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError,
+)
+from utils.retry import RetryLog, RetryPolicy
+
+ENDPOINT = "/api/v1/ocr/inference"
+
+
+def trip(breaker: CircuitBreaker, times: int):
+    """Record `times` failed 503 calls"""
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record_response(httpx.Response(503))
+
+
+@allure.epic("Test Harness")
+@allure.feature("Circuit Breaker")
+class TestBreakerStates:
+    """CircuitBreaker state machine"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=3, cooldown=60)
+
+        trip(breaker, 2)
+        assert breaker.state == CLOSED
+        trip(breaker, 1)
+
+        assert breaker.state == OPEN
+        assert breaker.stats["opened"] == 1
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=3, cooldown=60)
+
+        trip(breaker, 2)
+        breaker.record_response(httpx.Response(200))
+        trip(breaker, 2)
+
+        assert breaker.state == CLOSED
+
+    def test_non_failure_status_counts_as_success(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=1, cooldown=60)
+        breaker.record_response(httpx.Response(404))
+        assert breaker.state == CLOSED
+
+    def test_transport_errors_count(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=2, cooldown=60)
+        breaker.record_error(httpx.ConnectError("refused"))
+        breaker.record_error(httpx.ReadTimeout("slow"))
+        assert breaker.state == OPEN
+        assert breaker.last_failure.startswith("ReadTimeout")
+
+    def test_open_circuit_fails_fast(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=1, cooldown=60)
+        trip(breaker, 1)
+
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.before_request()
+
+        assert error.value.endpoint == ENDPOINT
+        assert 0 < error.value.retry_in <= 60
+        assert breaker.stats["short_circuited"] == 1
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=1, cooldown=0)
+        trip(breaker, 1)
+
+        breaker.before_request()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_successful_probe_closes(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=1, cooldown=0)
+        trip(breaker, 1)
+
+        breaker.before_request()
+        breaker.record_response(httpx.Response(200))
+
+        assert breaker.state == CLOSED
+        assert breaker.failures == 0
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=5, cooldown=0)
+        trip(breaker, 5)
+
+        breaker.before_request()
+        breaker.record_response(httpx.Response(503))
+
+        assert breaker.state == OPEN
+        assert breaker.stats["opened"] == 2
+
+    def test_abandoned_probe_is_released(self):
+        breaker = CircuitBreaker(ENDPOINT, failure_threshold=1, cooldown=0)
+        trip(breaker, 1)
+        breaker.before_request()
+
+        breaker.abandon_probe()
+
+        breaker.before_request()
+        assert breaker.state == HALF_OPEN
+
+    def test_disabled_registry_hands_out_no_breaker(self):
+        assert CircuitBreakerRegistry(failure_threshold=0).breaker(ENDPOINT) is NO_BREAKER
+
+    def test_registry_shares_breakers_per_template(self):
+        registry = CircuitBreakerRegistry(failure_threshold=1, cooldown=60)
+        assert registry.breaker(ENDPOINT) is registry.breaker(ENDPOINT)
+        trip(registry.breaker(ENDPOINT), 1)
+        assert list(registry.opened()) == [ENDPOINT]
+
+
+@allure.epic("Test Harness")
+@allure.feature("Circuit Breaker")
+class TestClientBreaker:
+    """Breaker applied by APIClient"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_retry_log(self, monkeypatch):
+        monkeypatch.setattr(retry, "retry_log", RetryLog())
+
+    def test_retries_count_as_one_failure(self, mock_client):
+        sent = []
+
+        def unavailable(request):
+            sent.append(request)
+            return httpx.Response(503)
+
+        registry = CircuitBreakerRegistry(failure_threshold=3, cooldown=60)
+        policy = RetryPolicy(max_attempts=3, backoff_base=0, backoff_max=0)
+        client = mock_client(unavailable, circuit_breakers=registry, retry_policy=policy)
+
+        client.get(ENDPOINT)
+        client.get(ENDPOINT)
+
+        assert len(sent) == 6
+        assert registry.breaker(ENDPOINT).failures == 2
+        assert registry.breaker(ENDPOINT).state == CLOSED
+
+        client.get(ENDPOINT)
+        with pytest.raises(CircuitOpenError):
+            client.get(ENDPOINT)
+        assert len(sent) == 9, "An open circuit must not send"
+
+    def test_breakers_are_per_endpoint_template(self, mock_client):
+        registry = CircuitBreakerRegistry(failure_threshold=1, cooldown=60)
+        client = mock_client(lambda request: httpx.Response(503), circuit_breakers=registry)
+
+        client.get("/api/v1/model-management/models/123")
+
+        with pytest.raises(CircuitOpenError):
+            client.get("/api/v1/model-management/models/456")
+        assert client.get("/api/v1/model-management/services").status_code == 503
+
+    def test_transport_error_recorded_and_raised(self, mock_client):
+        def refuse(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        registry = CircuitBreakerRegistry(failure_threshold=1, cooldown=60)
+        client = mock_client(refuse, circuit_breakers=registry)
+
+        with pytest.raises(httpx.ConnectError):
+            client.get(ENDPOINT)
+        assert registry.breaker(ENDPOINT).state == OPEN
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_does_not_wedge_half_open(self, async_mock_client):
+        started = asyncio.Event()
+
+        async def hang(request):
+            started.set()
+            await asyncio.sleep(60)
+
+        registry = CircuitBreakerRegistry(failure_threshold=1, cooldown=0)
+        trip(registry.breaker(ENDPOINT), 1)
+        client = async_mock_client(hang, circuit_breakers=registry)
+
+        probe = asyncio.create_task(client.post(ENDPOINT, json={}))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        breaker = registry.breaker(ENDPOINT)
+        breaker.before_request()
+        assert breaker.state == HALF_OPEN, "The cancelled probe should have been released"
@@ -0,0 +1,144 @@
+"""
+Unit tests for utils/rate_limit.py (offline, fake clock)
+
+Test Coverage:
+- RATE_LIMIT_RULES parsing, including malformed entries
+- Token bucket burst, refill and wait accounting
+- Rule resolution: longest prefix, 0 rps = unlimited, default rate
+- Buckets are per role + endpoint
+"""
+
+import allure
+import pytest
+from utils import rate_limit
+from utils.rate_limit import RateLimiter, TokenBucket, parse_rules
+
+
+class FakeClock:
+    """Stand-in for the time module: sleep() advances monotonic() instantly"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+@allure.epic("Test Harness")
+@allure.feature("Rate Limiting")
+class TestParseRules:
+    """RATE_LIMIT_RULES parsing"""
+
+    def test_rates_and_bursts(self):
+        rules = parse_rules("/api/v1/nmt/inference=5:10, /api/v1/asr/inference=2,/api/v1/tts=0")
+        assert rules == {
+            "/api/v1/nmt/inference": (5.0, 10.0),
+            "/api/v1/asr/inference": (2.0, None),
+            "/api/v1/tts": (0.0, None),
+        }
+
+    def test_empty_spec(self):
+        assert parse_rules("") == {}
+        assert parse_rules(" , ") == {}
+
+    @pytest.mark.parametrize("spec", ["5", "/api/v1/nmt/inference:5", "=5", " =5"])
+    def test_missing_endpoint_or_separator_names_the_entry(self, spec):
+        with pytest.raises(ValueError, match="expected <endpoint>=<rps>"):
+            parse_rules(f"/api/v1/asr/inference=2,{spec}")
+
+    @pytest.mark.parametrize("spec", ["/api/v1/nmt/inference=fast", "/api/v1/nmt/inference=5:lots"])
+    def test_non_numeric_rate_names_the_entry(self, spec):
+        with pytest.raises(ValueError, match="/api/v1/nmt/inference"):
+            parse_rules(spec)
+
+    def test_negative_rate_rejected(self):
+        with pytest.raises(ValueError, match="negative rate"):
+            parse_rules("/api/v1/nmt/inference=-1")
+
+
+@allure.epic("Test Harness")
+@allure.feature("Rate Limiting")
+class TestTokenBucket:
+    """Token bucket timing"""
+
+    def test_burst_then_paced(self, clock):
+        bucket = TokenBucket(rate=2, capacity=3)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0], "Burst capacity should be served at once"
+        assert waits[3:] == pytest.approx([0.5, 0.5])
+        assert bucket.acquired == 5
+        assert bucket.waited_seconds == pytest.approx(1.0)
+
+    def test_idle_time_refills_up_to_capacity(self, clock):
+        bucket = TokenBucket(rate=1, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        clock.now += 60
+
+        assert [bucket.acquire() for _ in range(3)] == pytest.approx([0.0, 0.0, 1.0])
+
+    def test_default_capacity(self):
+        assert TokenBucket(rate=0.5).capacity == 1.0
+        assert TokenBucket(rate=4).capacity == 4
+
+    @pytest.mark.asyncio
+    async def test_async_acquire_waits(self, clock, monkeypatch):
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+
+        monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+        bucket = TokenBucket(rate=4, capacity=1)
+
+        assert await bucket.acquire_async() == 0.0
+        assert await bucket.acquire_async() == pytest.approx(0.25)
+        assert slept == pytest.approx([0.25])
+
+
+@allure.epic("Test Harness")
+@allure.feature("Rate Limiting")
+class TestRateLimiter:
+    """Rule resolution and bucket sharing"""
+
+    def test_longest_prefix_wins(self):
+        limiter = RateLimiter(rules={"/api/v1/nmt": (10, None), "/api/v1/nmt/inference": (2, None)})
+        assert limiter.bucket("user", "/api/v1/nmt/inference").rate == 2
+        assert limiter.bucket("user", "/api/v1/nmt/models").rate == 10
+
+    def test_zero_rate_rule_is_unlimited(self):
+        limiter = RateLimiter(default_rate=5, rules={"/api/v1/asr": (0, None)})
+        assert limiter.bucket("user", "/api/v1/asr/inference") is None
+        assert limiter.acquire("user", "/api/v1/asr/inference") == 0.0
+        assert limiter.bucket("user", "/api/v1/nmt/inference").rate == 5
+
+    def test_no_default_means_unlimited(self):
+        limiter = RateLimiter(rules={"/api/v1/asr": (1, None)})
+        assert limiter.bucket("user", "/api/v1/nmt/inference") is None
+
+    def test_buckets_per_role_and_endpoint(self, clock):
+        limiter = RateLimiter(default_rate=1)
+
+        assert limiter.acquire("user", "/api/v1/nmt/inference") == 0.0
+        assert limiter.acquire("guest", "/api/v1/nmt/inference") == 0.0
+        assert limiter.acquire("user", "/api/v1/asr/inference") == 0.0
+        assert limiter.acquire("user", "/api/v1/nmt/inference") == pytest.approx(1.0)
+
+        stats = limiter.stats()
+        assert stats[("user", "/api/v1/nmt/inference")] == (2, pytest.approx(1.0), 1)
+        assert stats[("guest", "/api/v1/nmt/inference")][0] == 1
@@ -0,0 +1,143 @@
+"""
+Unit tests for RefreshScheduler in utils/auth.py (offline, fake token managers)
+
+Test Coverage:
+- Registered managers are refreshed when due, then re-queued
+- unregister / re-register drop the stale heap entry (generation check)
+- A failed or crashing refresh is retried after TOKEN_REFRESH_BACKOFF_MAX
+- Many managers share one scheduler thread; shutdown stops it
+"""
+
+import threading
+import time
+import allure
+import pytest
+from utils import auth
+from utils.auth import RefreshScheduler, RefreshStats
+
+
+class FakeManager:
+    """The part of TokenManager the scheduler uses"""
+
+    def __init__(self, email: str, delay: float = 0.02, outcomes=()):
+        self.email = email
+        self.expires_at = time.time() + 900
+        self.delay = delay
+        self.outcomes = list(outcomes)  # refresh() results in order, then True; exceptions are raised
+        self.refreshes = []
+        self.refreshed = threading.Event()
+
+    def next_refresh_delay(self) -> float:
+        return self.delay
+
+    def refresh(self) -> bool:
+        self.refreshes.append(time.monotonic())
+        self.refreshed.set()
+        outcome = self.outcomes.pop(0) if self.outcomes else True
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def wait_for(condition, timeout: float = 5.0):
+    """Poll until condition() is true (fails the test on timeout)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for the scheduler"
+        time.sleep(0.005)
+
+
+@allure.epic("Test Harness")
+@allure.feature("Token Refresh")
+class TestRefreshScheduler:
+    """Scheduling, cancellation and backoff"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_stats(self, monkeypatch):
+        monkeypatch.setattr(auth, "refresh_stats", RefreshStats())
+
+    @pytest.fixture
+    def scheduler(self):
+        scheduler = RefreshScheduler(max_workers=2)
+        yield scheduler
+        scheduler.shutdown()
+
+    def test_refreshes_when_due_and_requeues(self, scheduler):
+        manager = FakeManager("user@example.com", delay=0.05)
+        registered = time.monotonic()
+
+        scheduler.register(manager)
+        wait_for(lambda: len(manager.refreshes) >= 2)
+
+        assert manager.refreshes[0] - registered >= 0.04, "Refreshed before it was due"
+        assert auth.refresh_stats.summary()["user@example.com"]["next_refresh_at"] is not None
+
+    def test_unregister_cancels_queued_refresh(self, scheduler):
+        manager = FakeManager("user@example.com", delay=0.1)
+
+        scheduler.register(manager)
+        scheduler.unregister(manager)
+        time.sleep(0.25)
+
+        assert manager.refreshes == []
+
+    def test_reregister_replaces_previous_entry(self, scheduler):
+        manager = FakeManager("user@example.com", delay=0.05)
+        scheduler.register(manager)
+        manager.delay = 0.3
+        scheduler.register(manager)
+
+        time.sleep(0.2)
+        assert manager.refreshes == [], "The first generation's entry should have been skipped"
+        assert manager.refreshed.wait(5)
+
+    def test_unregister_during_refresh_stops_requeue(self, scheduler):
+        manager = FakeManager("user@example.com", delay=0.02)
+        release = threading.Event()
+        refresh = manager.refresh
+
+        def slow_refresh():
+            result = refresh()
+            release.wait(5)
+            return result
+
+        manager.refresh = slow_refresh
+        scheduler.register(manager)
+        assert manager.refreshed.wait(5)
+        scheduler.unregister(manager)
+        release.set()
+        time.sleep(0.1)
+
+        assert len(manager.refreshes) == 1
+
+    @pytest.mark.parametrize("outcome", [False, RuntimeError("refresh endpoint down")])
+    def test_failed_refresh_retried_after_backoff(self, scheduler, monkeypatch, outcome):
+        monkeypatch.setattr(auth.settings, "TOKEN_REFRESH_BACKOFF_MAX", 0.15)
+        manager = FakeManager("user@example.com", delay=0.01, outcomes=[outcome])
+
+        scheduler.register(manager)
+        wait_for(lambda: len(manager.refreshes) == 2)
+
+        assert manager.refreshes[1] - manager.refreshes[0] >= 0.1, "Retry should wait TOKEN_REFRESH_BACKOFF_MAX"
+
+    def test_one_thread_for_many_managers(self, scheduler):
+        before = threading.active_count()
+        managers = [FakeManager(f"user{i}@example.com", delay=0.02) for i in range(10)]
+
+        for manager in managers:
+            scheduler.register(manager)
+        wait_for(lambda: all(manager.refreshes for manager in managers))
+
+        assert threading.active_count() - before <= 1 + scheduler.max_workers
+
+    def test_shutdown_stops_refreshing(self, scheduler):
+        manager = FakeManager("user@example.com", delay=0.02)
+        scheduler.register(manager)
+        wait_for(lambda: manager.refreshes)
+
+        scheduler.shutdown()
+        count = len(manager.refreshes)
+        time.sleep(0.1)
+
+        assert len(manager.refreshes) == count
+        assert not any(thread.name == "token-refresh-scheduler" for thread in threading.enumerate())
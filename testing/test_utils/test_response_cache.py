@@ -0,0 +1,195 @@
+"""
+Unit tests for utils/response_cache.py (offline, httpx.MockTransport)
+
+Test Coverage:
+- Fresh entries served without a request
+- ETag revalidation: If-None-Match sent, 304 keeps the cached response
+- Invalidation by service prefix after a mutation, for every role
+- Keys: credentials, query params, cache= overrides
+- LRU bound
+"""
+
+import allure
+import httpx
+import pytest
+from utils.response_cache import ResponseCache, service_prefix
+
+ROLES = "/api/v1/auth/roles/list"
+MODELS = "/api/v1/model-management/models"
+
+
+def catalog(etag: str = '"v1"'):
+    """MockTransport handler serving a catalog with an ETag; answers 304 when it matches"""
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        if request.method != "GET":
+            return httpx.Response(201, json={})
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag}, json={"path": request.url.path, "request": len(sent)})
+
+    handler.sent = sent
+    return handler
+
+
+@allure.epic("Test Harness")
+@allure.feature("Response Cache")
+class TestResponseCache:
+    """Caching through APIClient"""
+
+    def test_fresh_entry_served_without_request(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=60, endpoints=[ROLES])
+        client = mock_client(handler, response_cache=cache)
+
+        first = client.get(ROLES)
+        second = client.get(ROLES)
+
+        assert len(handler.sent) == 1
+        assert second.json() == first.json()
+        assert cache.stats["hits"] == 1
+
+    def test_expired_entry_revalidated_with_etag(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=0, endpoints=[ROLES])
+        client = mock_client(handler, response_cache=cache)
+
+        first = client.get(ROLES)
+        second = client.get(ROLES)
+
+        assert len(handler.sent) == 2
+        assert "If-None-Match" not in handler.sent[0].headers
+        assert handler.sent[1].headers["If-None-Match"] == '"v1"'
+        assert second.status_code == 200, "A 304 should hand back the cached 200"
+        assert second.json() == first.json()
+        assert cache.stats["revalidated"] == 1
+
+    def test_changed_etag_replaces_entry(self, mock_client):
+        versions = iter(['"v1"', '"v2"'])
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(200, headers={"ETag": next(versions)}, json={"request": len(sent)})
+
+        cache = ResponseCache(ttl=0, endpoints=[ROLES])
+        client = mock_client(handler, response_cache=cache)
+
+        client.get(ROLES)
+        second = client.get(ROLES)
+
+        assert second.json() == {"request": 2}
+        entry = cache.get(cache.key_for("anonymous", "GET", ROLES))
+        assert entry.etag == '"v2"'
+
+    def test_mutation_invalidates_same_service_only(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=60, endpoints=[ROLES, MODELS])
+        client = mock_client(handler, response_cache=cache)
+        client.get(ROLES)
+        client.get(MODELS)
+
+        client.post("/api/v1/auth/roles/assign", json={"user_id": 1})
+        client.get(ROLES)
+        client.get(MODELS)
+
+        paths = [request.url.path for request in handler.sent if request.method == "GET"]
+        assert paths == [ROLES, MODELS, ROLES], "Only the auth service's entries should be dropped"
+        assert cache.stats["invalidated"] == 1
+
+    def test_invalidation_applies_to_every_role(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=60, endpoints=[ROLES])
+        admin = mock_client(handler, response_cache=cache, role="admin")
+        user = mock_client(handler, response_cache=cache, role="user")
+        admin.get(ROLES)
+        user.get(ROLES)
+
+        admin.delete("/api/v1/auth/roles/remove")
+
+        assert cache.invalidate() == 0, "Both roles' entries should already be gone"
+
+    def test_failed_response_not_cached(self, mock_client):
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(500 if len(sent) == 1 else 200, json={})
+
+        cache = ResponseCache(ttl=60, endpoints=[ROLES])
+        client = mock_client(handler, response_cache=cache)
+
+        assert client.get(ROLES).status_code == 500
+        assert client.get(ROLES).status_code == 200
+        assert client.get(ROLES).status_code == 200
+        assert len(sent) == 2
+
+
+@allure.epic("Test Harness")
+@allure.feature("Response Cache")
+class TestCacheKeys:
+    """Which requests share an entry"""
+
+    def test_different_credentials_never_share(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=60, endpoints=[ROLES])
+        client = mock_client(handler, response_cache=cache, role="admin")
+
+        client.get(ROLES, extra_headers={"X-API-Key": "valid"})
+        client.get(ROLES, extra_headers={"X-API-Key": "expired"})
+        client.get(ROLES, extra_headers={"x-api-key": "valid"})
+
+        assert len(handler.sent) == 2
+
+    def test_query_params_only_cached_on_request(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=60, endpoints=[MODELS])
+        client = mock_client(handler, response_cache=cache)
+
+        client.get(MODELS, params={"task": "asr"})
+        client.get(MODELS, params={"task": "asr"})
+        assert len(handler.sent) == 2, "Filtered GETs are not cached by default"
+
+        client.get(MODELS, params={"task": "asr"}, cache=True)
+        client.get(MODELS, params={"task": "asr"}, cache=True)
+        client.get(MODELS, params={"task": "nmt"}, cache=True)
+        assert len(handler.sent) == 4
+
+    def test_cache_false_bypasses(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=60, endpoints=[ROLES])
+        client = mock_client(handler, response_cache=cache)
+
+        client.get(ROLES)
+        client.get(ROLES, cache=False)
+
+        assert len(handler.sent) == 2
+
+    def test_undesignated_endpoint_not_cached(self):
+        cache = ResponseCache(ttl=60, endpoints=[ROLES])
+        assert cache.key_for("user", "GET", "/api/v1/auth/me") is None
+        assert cache.key_for("user", "POST", ROLES, use_cache=True) is None
+
+    def test_lru_bound(self, mock_client):
+        handler = catalog()
+        cache = ResponseCache(ttl=60, max_entries=2)
+        client = mock_client(handler, response_cache=cache)
+
+        for endpoint in ("/api/v1/auth/a", "/api/v1/auth/b", "/api/v1/auth/a", "/api/v1/auth/c"):
+            client.get(endpoint, cache=True)
+        client.get("/api/v1/auth/a", cache=True)
+        client.get("/api/v1/auth/b", cache=True)
+
+        paths = [request.url.path for request in handler.sent]
+        assert paths == ["/api/v1/auth/a", "/api/v1/auth/b", "/api/v1/auth/c", "/api/v1/auth/b"]
+
+
+@pytest.mark.parametrize("endpoint,prefix", [
+    ("/api/v1/auth/roles/list", "/api/v1/auth"),
+    ("/api/v1/model-management/models?task=asr", "/api/v1/model-management"),
+    ("/api/v1/nmt", "/api/v1/nmt"),
+])
+def test_service_prefix(endpoint, prefix):
+    assert service_prefix(endpoint) == prefix
@@ -0,0 +1,196 @@
+"""
+Unit tests for utils/retry.py (offline, httpx.MockTransport)
+
+Test Coverage:
+- Retry-After parsing: delta-seconds, HTTP-date, invalid values
+- Idempotency rules: which methods retry on which statuses and errors
+- Attempt limit and total retry budget
+- APIClient retrying through the policy, sync and async, with retry_log entries
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import allure
+import httpx
+import pytest
+from utils import retry
+from utils.retry import RetryLog, RetryPolicy, parse_retry_after
+
+
+def no_backoff(**overrides) -> RetryPolicy:
+    """Policy that retries without sleeping"""
+    options = {"max_attempts": 3, "backoff_base": 0, "backoff_max": 0, "total_budget": 30}
+    options.update(overrides)
+    return RetryPolicy(**options)
+
+
+def responses(*statuses, retry_after: str = None):
+    """MockTransport handler answering with the given statuses in turn; records the requests"""
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        status = statuses[min(len(sent), len(statuses)) - 1]
+        headers = {"Retry-After": retry_after} if retry_after is not None and status != 200 else {}
+        return httpx.Response(status, headers=headers, json={"attempt": len(sent)})
+
+    handler.sent = sent
+    return handler
+
+
+@pytest.fixture
+def fresh_retry_log(monkeypatch):
+    """Isolated retry_log, so this test's retries do not count in the session totals"""
+    log = RetryLog()
+    monkeypatch.setattr(retry, "retry_log", log)
+    return log
+
+
+@allure.epic("Test Harness")
+@allure.feature("Retry Policy")
+class TestParseRetryAfter:
+    """Retry-After header parsing"""
+
+    def test_delta_seconds(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(" 0 ") == 0.0
+
+    def test_http_date_in_the_future(self):
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        delay = parse_retry_after(format_datetime(when, usegmt=True))
+        assert 28 <= delay <= 30, f"Expected ~30s, got {delay}"
+
+    def test_http_date_in_the_past_is_zero(self):
+        when = datetime.now(timezone.utc) - timedelta(minutes=5)
+        assert parse_retry_after(format_datetime(when, usegmt=True)) == 0.0
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "-5", "1.5"])
+    def test_missing_or_invalid_is_none(self, value):
+        assert parse_retry_after(value) is None
+
+
+@allure.epic("Test Harness")
+@allure.feature("Retry Policy")
+class TestNextDelay:
+    """RetryPolicy.next_delay decisions"""
+
+    def test_get_retries_on_configured_status(self):
+        policy = no_backoff()
+        assert policy.next_delay("GET", 1, time.monotonic(), response=httpx.Response(503)) == 0
+
+    def test_status_outside_retry_statuses_is_final(self):
+        policy = no_backoff()
+        assert policy.next_delay("GET", 1, time.monotonic(), response=httpx.Response(500)) is None
+
+    def test_post_retries_only_on_429(self):
+        policy = no_backoff()
+        started = time.monotonic()
+        assert policy.next_delay("POST", 1, started, response=httpx.Response(503)) is None
+        assert policy.next_delay("POST", 1, started, response=httpx.Response(429)) == 0
+
+    def test_post_retries_only_errors_raised_before_sending(self):
+        policy = no_backoff()
+        started = time.monotonic()
+        assert policy.next_delay("POST", 1, started, error=httpx.ConnectError("refused")) == 0
+        assert policy.next_delay("POST", 1, started, error=httpx.ReadTimeout("slow")) is None
+        assert policy.next_delay("GET", 1, started, error=httpx.ReadTimeout("slow")) == 0
+
+    def test_idempotent_flag_allows_post_retries(self):
+        policy = no_backoff()
+        assert policy.next_delay("POST", 1, time.monotonic(), response=httpx.Response(503), idempotent=True) == 0
+
+    def test_stops_at_max_attempts(self):
+        policy = no_backoff(max_attempts=2)
+        started = time.monotonic()
+        assert policy.next_delay("GET", 1, started, response=httpx.Response(503)) == 0
+        assert policy.next_delay("GET", 2, started, response=httpx.Response(503)) is None
+
+    def test_retry_after_overrides_backoff(self):
+        policy = no_backoff()
+        response = httpx.Response(429, headers={"Retry-After": "4"})
+        assert policy.next_delay("GET", 1, time.monotonic(), response=response) == 4.0
+
+    def test_retry_after_beyond_total_budget_stops(self):
+        policy = no_backoff(total_budget=5)
+        response = httpx.Response(503, headers={"Retry-After": "10"})
+        assert policy.next_delay("GET", 1, time.monotonic(), response=response) is None
+
+    def test_elapsed_time_counts_against_budget(self):
+        policy = no_backoff(total_budget=5)
+        started = time.monotonic() - 4.5
+        response = httpx.Response(503, headers={"Retry-After": "1"})
+        assert policy.next_delay("GET", 1, started, response=response) is None
+
+    def test_backoff_is_capped(self):
+        policy = RetryPolicy(max_attempts=10, backoff_base=1, backoff_max=2)
+        delays = [policy.next_delay("GET", 6, time.monotonic(), response=httpx.Response(503)) for _ in range(50)]
+        assert all(0 <= delay <= 2 for delay in delays), f"Backoff exceeded backoff_max: {max(delays)}"
+
+
+@allure.epic("Test Harness")
+@allure.feature("Retry Policy")
+class TestClientRetries:
+    """APIClient sending through a RetryPolicy"""
+
+    def test_transient_statuses_are_retried_until_success(self, mock_client, fresh_retry_log):
+        handler = responses(503, 502, 200)
+        client = mock_client(handler, retry_policy=no_backoff())
+
+        response = client.get("/api/v1/auth/roles/list")
+
+        assert response.status_code == 200
+        assert len(handler.sent) == 3
+        events = fresh_retry_log.finish_test(passed=True)
+        assert [event["reason"] for event in events] == ["HTTP 503", "HTTP 502"]
+        assert fresh_retry_log.totals == {"retries": 2, "retried_tests": 1, "retried_then_passed": 1}
+
+    def test_last_response_returned_when_attempts_run_out(self, mock_client, fresh_retry_log):
+        handler = responses(503)
+        client = mock_client(handler, retry_policy=no_backoff(max_attempts=2))
+
+        response = client.get("/api/v1/auth/roles/list")
+
+        assert response.status_code == 503
+        assert response.json() == {"attempt": 2}
+        assert len(handler.sent) == 2
+
+    def test_retry_false_sends_once(self, mock_client, fresh_retry_log):
+        handler = responses(503, 200)
+        client = mock_client(handler, retry_policy=no_backoff())
+
+        assert client.get("/api/v1/auth/roles/list", retry=False).status_code == 503
+        assert len(handler.sent) == 1
+
+    def test_post_not_retried_on_503(self, mock_client, fresh_retry_log):
+        handler = responses(503, 200)
+        client = mock_client(handler, retry_policy=no_backoff())
+
+        assert client.post("/api/v1/nmt/inference", json={}).status_code == 503
+        assert len(handler.sent) == 1
+        assert fresh_retry_log.finish_test(passed=False) == []
+
+    def test_transport_error_raised_after_last_attempt(self, mock_client, fresh_retry_log):
+        attempts = []
+
+        def refuse(request):
+            attempts.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client = mock_client(refuse, retry_policy=no_backoff(max_attempts=3))
+
+        with pytest.raises(httpx.ConnectError):
+            client.get("/api/v1/auth/roles/list")
+        assert len(attempts) == 3
+        assert len(fresh_retry_log.finish_test(passed=False)) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_client_retries(self, async_mock_client, fresh_retry_log):
+        handler = responses(429, 200, retry_after="0")
+        client = async_mock_client(handler, retry_policy=no_backoff())
+
+        response = await client.post("/api/v1/nmt/inference", json={})
+
+        assert response.status_code == 200
+        assert len(handler.sent) == 2
+        assert [event["delay"] for event in fresh_retry_log.finish_test(passed=True)] == [0.0]
@@ -0,0 +1,199 @@
+"""
+Unit tests for utils/single_flight.py (offline)
+
+Test Coverage:
+- Concurrent calls with one key run fn once and share its result
+- The leader's exception is raised in every waiting caller
+- Completed calls are not cached; different keys never merge
+- asyncio variant, including a cancelled leader
+- APIClient coalescing identical GETs only
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import allure
+import httpx
+import pytest
+from utils.single_flight import SingleFlight
+
+KEY = SingleFlight.key_for("GET", "http://platform.test/api/v1/model-management/models", {"Authorization": "Bearer a"})
+
+
+def wait_for(condition, timeout: float = 5.0):
+    """Poll until condition() is true (fails the test on timeout)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for callers to join the flight"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight: SingleFlight, fn, callers: int) -> list:
+    """Call flight.do(KEY, fn) from `callers` threads while fn is held in flight; returns futures"""
+    release = threading.Event()
+    calls = []
+
+    def leader_fn():
+        calls.append(1)
+        release.wait(5)
+        return fn()
+
+    executor = ThreadPoolExecutor(callers)
+    futures = [executor.submit(flight.do, KEY, leader_fn) for _ in range(callers)]
+    wait_for(lambda: flight.stats["coalesced"] == callers - 1)
+    release.set()
+    executor.shutdown(wait=True)
+    assert len(calls) == 1, "Only the leader should run fn"
+    return futures
+
+
+@allure.epic("Test Harness")
+@allure.feature("Single-flight GETs")
+class TestSingleFlight:
+    """Thread-based coalescing"""
+
+    def test_concurrent_callers_share_one_result(self):
+        flight = SingleFlight()
+        result = object()
+
+        futures = run_concurrently(flight, lambda: result, callers=4)
+
+        assert all(future.result() is result for future in futures)
+        assert flight.stats == {"sent": 1, "coalesced": 3}
+
+    def test_leader_exception_raised_in_every_caller(self):
+        flight = SingleFlight()
+        error = httpx.ConnectError("connection refused")
+
+        def fail():
+            raise error
+
+        futures = run_concurrently(flight, fail, callers=3)
+
+        for future in futures:
+            with pytest.raises(httpx.ConnectError) as raised:
+                future.result()
+            assert raised.value is error
+
+    def test_finished_call_is_not_reused(self):
+        flight = SingleFlight()
+        results = iter([1, 2])
+
+        assert flight.do(KEY, lambda: next(results)) == 1
+        assert flight.do(KEY, lambda: next(results)) == 2
+        assert flight.stats == {"sent": 2, "coalesced": 0}
+
+    def test_key_left_clean_after_failure(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            flight.do(KEY, fail)
+
+        assert flight.do(KEY, lambda: "ok") == "ok"
+
+    def test_key_identity(self):
+        url = "http://platform.test/api/v1/auth/users"
+        assert SingleFlight.key_for("GET", url, {"X-API-Key": "k"}) == SingleFlight.key_for("GET", url, {"x-api-key": "k"})
+        assert SingleFlight.key_for("GET", url, {"X-API-Key": "k"}) != SingleFlight.key_for("GET", url, {"X-API-Key": "j"})
+        assert SingleFlight.key_for("GET", url, {}) != SingleFlight.key_for("GET", url + "?page=2", {})
+
+
+@allure.epic("Test Harness")
+@allure.feature("Single-flight GETs")
+class TestSingleFlightAsync:
+    """asyncio coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_share_one_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "models"
+
+        results = await asyncio.gather(*(flight.do_async(KEY, fetch) for _ in range(5)))
+
+        assert results == ["models"] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_leader_exception_raised_in_every_task(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise httpx.ReadTimeout("slow")
+
+        results = await asyncio.gather(*(flight.do_async(KEY, fail) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, httpx.ReadTimeout) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_cancels_followers_and_frees_key(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        leader = asyncio.create_task(flight.do_async(KEY, hang))
+        await started.wait()
+        follower = asyncio.create_task(flight.do_async(KEY, hang))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        async def ok():
+            return "ok"
+
+        assert await flight.do_async(KEY, ok) == "ok"
+
+
+@allure.epic("Test Harness")
+@allure.feature("Single-flight GETs")
+class TestClientSingleFlight:
+    """Coalescing through APIClient"""
+
+    def test_identical_gets_in_a_batch_sent_once(self, mock_client):
+        flight = SingleFlight()
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            if request.method == "GET":
+                # Hold the leader until the other batch workers have joined it
+                wait_for(lambda: flight.stats["coalesced"] == 2)
+            return httpx.Response(200, json={"models": []})
+
+        client = mock_client(handler, single_flight=flight)
+
+        responses = client.batch([("GET", "/api/v1/model-management/models")] * 3)
+
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert len(sent) == 1
+
+    def test_posts_and_coalesce_false_always_sent(self, mock_client):
+        flight = SingleFlight()
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(200, json={})
+
+        client = mock_client(handler, single_flight=flight)
+        client.post("/api/v1/nmt/inference", json={})
+        client.get("/api/v1/model-management/models", coalesce=False)
+
+        assert len(sent) == 2
+        assert flight.stats["sent"] == 0
@@ -0,0 +1,89 @@
+"""
+Unit tests for utils/timeouts.py (offline, httpx.MockTransport)
+
+Test Coverage:
+- Profiles are opt-in: while disabled, APIClient keeps REQUEST_TIMEOUT
+- Endpoint group lookup on whole path segments, longest prefix wins
+- APIClient applies the group's Timeout unless the call passes timeout=
+- Fired timeouts counted per group in the budget report
+"""
+
+import allure
+import httpx
+import pytest
+from utils import timeouts
+from utils.timeouts import TimeoutProfiles, budget_report
+
+AUTH = httpx.Timeout(15.0, connect=5.0)
+AUDIO = httpx.Timeout(90.0, connect=5.0)
+
+
+def profiles() -> TimeoutProfiles:
+    return TimeoutProfiles(
+        {"auth": AUTH, "inference-audio": AUDIO},
+        {"/api/v1/auth": "auth", "/api/v1/asr": "inference-audio", "/api/v1/asr/health": "auth"},
+    )
+
+
+def timeout_seen():
+    """MockTransport handler remembering the read timeout of each request"""
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={})
+
+    handler.seen = seen
+    return handler
+
+
+@allure.epic("Test Harness")
+@allure.feature("Timeout Profiles")
+class TestTimeoutProfiles:
+    """Group lookup and per-call timeouts"""
+
+    def test_disabled_profiles_build_nothing(self, monkeypatch):
+        monkeypatch.setattr(timeouts.http_settings, "TIMEOUT_PROFILES_ENABLED", False)
+        assert TimeoutProfiles.from_settings() is None
+
+    @pytest.mark.parametrize("endpoint,group", [
+        ("/api/v1/auth/me", "auth"),
+        ("/api/v1/auth", "auth"),
+        ("/api/v1/authz/check", None),
+        ("/api/v1/asr/inference", "inference-audio"),
+        ("/api/v1/asr/health", "auth"),
+        ("/api/v1/nmt/inference", None),
+    ])
+    def test_group_for(self, endpoint, group):
+        assert profiles().group_for(endpoint) == group
+
+    def test_client_applies_group_timeout(self, mock_client):
+        handler = timeout_seen()
+        client = mock_client(handler, timeout_profiles=profiles())
+
+        client.get("/api/v1/auth/me")
+        client.post("/api/v1/asr/inference", json={})
+        client.post("/api/v1/nmt/inference", json={})
+        client.get("/api/v1/auth/me", timeout=1.0)
+
+        assert handler.seen == [15.0, 90.0, 5.0, 1.0]
+
+    def test_client_without_profiles_keeps_its_timeout(self, mock_client, monkeypatch):
+        monkeypatch.setattr("utils.base_client.shared_timeout_profiles", None)
+        handler = timeout_seen()
+        client = mock_client(handler)
+
+        client.get("/api/v1/auth/me")
+        client.post("/api/v1/asr/inference", json={})
+
+        assert handler.seen == [5.0, 5.0]
+
+    def test_budget_report_counts_fired_timeouts(self):
+        table = profiles()
+        table.record_timeout("/api/v1/asr/inference", httpx.ReadTimeout("slow"))
+        table.record_timeout("/api/v1/nmt/inference", httpx.ReadTimeout("slow"))
+        summary = {("user", "POST", "/api/v1/asr/inference"): {"count": 3, "ttfb_p95": 40.0, "total_p95": 41.0}}
+
+        rows = budget_report(table, summary, default_budget=30.0)
+
+        assert rows == [("default", 0, 0.0, 0.0, 30.0, 1), ("inference-audio", 3, 40.0, 41.0, 90.0, 1)]
@@ -0,0 +1,188 @@
+"""
+Unit tests for utils/token_cache.py (offline, tmp_path)
+
+Test Coverage:
+- JWT exp extraction
+- store/load round trip, min TTL, file permissions
+- Keys per account and per xdist run
+- fcntl lock: exclusive across file handles, serialized read-modify-write
+- TOKEN_CACHE modes
+"""
+
+import base64
+import json
+import stat
+import threading
+import time
+import allure
+import pytest
+from utils import token_cache as token_cache_module
+from utils.token_cache import TokenCache, fcntl, jwt_expiry
+
+pytestmark = pytest.mark.skipif(fcntl is None, reason="fcntl is POSIX-only")
+
+
+def jwt(claims: dict) -> str:
+    """Unsigned JWT carrying the given claims"""
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJub25lIn0.{payload}.sig"
+
+
+@allure.epic("Test Harness")
+@allure.feature("Token Cache")
+class TestJwtExpiry:
+    """exp claim parsing"""
+
+    def test_reads_exp(self):
+        assert jwt_expiry(jwt({"sub": "x", "exp": 1792206464})) == 1792206464.0
+
+    @pytest.mark.parametrize("token", [None, "", "opaque-token", jwt({"sub": "x"}), "a.!!!.c"])
+    def test_none_without_exp(self, token):
+        assert jwt_expiry(token) is None
+
+
+@allure.epic("Test Harness")
+@allure.feature("Token Cache")
+class TestTokenCacheEntries:
+    """Entries on disk"""
+
+    def test_round_trip_uses_jwt_exp(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        expires = time.time() + 900
+        key = cache.key_for("user@example.com")
+
+        with cache.locked(key):
+            cache.store(key, jwt({"exp": expires}), "refresh", expires_in=60)
+            entry = cache.load(key)
+
+        assert entry["refresh_token"] == "refresh"
+        assert entry["expires_at"] == pytest.approx(expires)
+
+    def test_expires_in_used_for_opaque_tokens(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        entry = cache.store("k", "opaque", "refresh", expires_in=600)
+        assert entry["expires_at"] == pytest.approx(time.time() + 600, abs=5)
+
+    def test_entry_expiring_within_min_ttl_is_missing(self, tmp_path):
+        cache = TokenCache(tmp_path, min_ttl=60)
+        cache.store("soon", jwt({"exp": time.time() + 30}), "refresh", expires_in=30)
+        cache.store("later", jwt({"exp": time.time() + 300}), "refresh", expires_in=300)
+
+        assert cache.load("soon") is None
+        assert cache.load("later") is not None
+
+    def test_missing_or_corrupt_entry_is_none(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        (tmp_path / "corrupt.json").write_text("{not json")
+        assert cache.load("absent") is None
+        assert cache.load("corrupt") is None
+
+    def test_private_permissions(self, tmp_path):
+        directory = tmp_path / "tokens"
+        cache = TokenCache(directory)
+        cache.store("k", "opaque", "refresh", expires_in=600)
+
+        assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+        assert stat.S_IMODE((directory / "k.json").stat().st_mode) == 0o600
+        assert [path.name for path in directory.iterdir()] == ["k.json"], "No temporary file should remain"
+
+    def test_keys_per_account_and_run(self, tmp_path):
+        shared = TokenCache(tmp_path)
+        run_a = TokenCache(tmp_path, run_id="a")
+        run_b = TokenCache(tmp_path, run_id="b")
+
+        assert shared.key_for("user@example.com") != shared.key_for("admin@example.com")
+        assert run_a.key_for("user@example.com") != run_b.key_for("user@example.com")
+        assert run_a.key_for("user@example.com") == TokenCache(tmp_path, run_id="a").key_for("user@example.com")
+
+
+@allure.epic("Test Harness")
+@allure.feature("Token Cache")
+class TestTokenCacheLock:
+    """fcntl locking"""
+
+    def test_lock_is_exclusive_across_handles(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        held = threading.Event()
+
+        def hold():
+            with cache.locked("k"):
+                held.set()
+                time.sleep(0.2)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        held.wait(5)
+        started = time.monotonic()
+        with cache.locked("k"):
+            waited = time.monotonic() - started
+        holder.join()
+
+        assert waited >= 0.15, f"Second holder got the lock after {waited:.3f}s"
+
+    def test_read_modify_write_is_serialized(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        counter = tmp_path / "counter"
+        counter.write_text("0")
+
+        def increment():
+            for _ in range(25):
+                with cache.locked("counter"):
+                    value = int(counter.read_text())
+                    time.sleep(0)
+                    counter.write_text(str(value + 1))
+
+        workers = [threading.Thread(target=increment) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert counter.read_text() == "100"
+
+    def test_lock_released_on_error(self, tmp_path):
+        cache = TokenCache(tmp_path)
+        with pytest.raises(RuntimeError):
+            with cache.locked("k"):
+                raise RuntimeError("login failed")
+
+        acquired = threading.Event()
+
+        def take():
+            with cache.locked("k"):
+                acquired.set()
+
+        thread = threading.Thread(target=take)
+        thread.start()
+        thread.join(5)
+        assert acquired.is_set()
+
+
+@allure.epic("Test Harness")
+@allure.feature("Token Cache")
+class TestTokenCacheModes:
+    """TOKEN_CACHE settings"""
+
+    @pytest.fixture
+    def configure(self, monkeypatch, tmp_path):
+        def apply(mode: str, run_id: str = None):
+            monkeypatch.setattr(token_cache_module.settings, "TOKEN_CACHE", mode)
+            monkeypatch.setattr(token_cache_module.settings, "TOKEN_CACHE_DIR", str(tmp_path))
+            if run_id is None:
+                monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+            else:
+                monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", run_id)
+            return TokenCache.from_settings()
+        return apply
+
+    def test_off(self, configure):
+        assert configure("off", run_id="run") is None
+
+    def test_auto_without_xdist(self, configure):
+        assert configure("auto") is None
+
+    def test_auto_under_xdist_is_scoped_to_the_run(self, configure):
+        assert configure("auto", run_id="run-1").run_id == "run-1"
+
+    def test_on_shares_across_runs(self, configure):
+        assert configure("on", run_id="run-1").run_id == ""
@@ -0,0 +1,154 @@
+"""
+Lazy Allure capture of API request/response exchanges
+
+Formatting an exchange for Allure means json.loads + json.dumps(indent=2) of
+both bodies, which is expensive for base64-heavy ASR/OCR/pipeline payloads.
+In "on_failure" mode the clients only keep a reference to the raw exchange;
+the conftest hooks format and attach them when a test phase fails and drop
+them (recording what was saved) when the test finishes cleanly.
+"""
+
+import threading
+import time
+import allure
+import httpx
+from config.http_settings import http_settings
+from utils.attachment_policy import sniff_media_type
+
+MODE_ALWAYS = "always"
+MODE_ON_FAILURE = "on_failure"
+MODE_NEVER = "never"
+
+
+def exchange_size(response: httpx.Response) -> int:
+    """Raw request + response body bytes held for one exchange"""
+    size = 0
+    try:
+        size += len(response.request.content)
+    except httpx.RequestNotRead:
+        pass
+    try:
+        size += len(response.content)
+    except httpx.ResponseNotRead:
+        pass
+    return size
+
+
+class AllureCapture:
+    """
+    Per-test buffer of captured exchanges
+
+    Exchanges are recorded as (attach callback, response, method); the
+    callback is the client's _attach_to_allure and only runs on flush().
+    """
+
+    def __init__(self, mode: str = MODE_ON_FAILURE, blob_policy: str = MODE_ON_FAILURE):
+        self.mode = mode
+        self.blob_policy = blob_policy
+        self._lock = threading.RLock()
+        self._pending = []
+        self._flushing = False
+        self._attached_blobs = set()
+        self._attached = 0
+        self._format_seconds = 0.0
+        # Running cost of formatting, used to estimate time saved on skipped exchanges
+        self._formatted_bytes = 0
+        self._formatted_seconds = 0.0
+        self.totals = {"tests": 0, "attached": 0, "skipped": 0, "skipped_bytes": 0, "saved_seconds_estimate": 0.0}
+
+    def _attach(self, attach, response, method):
+        start = time.perf_counter()
+        attach(response, method)
+        elapsed = time.perf_counter() - start
+        self._attached += 1
+        self._format_seconds += elapsed
+        self._formatted_bytes += exchange_size(response)
+        self._formatted_seconds += elapsed
+
+    def record(self, attach, response: httpx.Response, method: str):
+        """
+        Record one exchange for the current test
+
+        Args:
+            attach: Callable(response, method) that formats and attaches it
+            response: httpx.Response (carries the request too)
+            method: HTTP method label for the attachment name
+        """
+        with self._lock:
+            if self.mode == MODE_ALWAYS:
+                self._attach(attach, response, method)
+            else:
+                self._pending.append((attach, response, method))
+
+    def flush(self):
+        """Format and attach every pending exchange (a test phase failed)"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._flushing = True
+            try:
+                for attach, response, method in pending:
+                    self._attach(attach, response, method)
+            finally:
+                self._flushing = False
+
+    def attach_blobs(self, blobs: dict):
+        """
+        Attach decoded base64 blobs, once per digest per test
+
+        Called from the clients' _attach_to_allure with the blobs that were
+        summarized out of the JSON attachments. ALLURE_ATTACH_BLOBS decides
+        whether they are attached always, only while flushing a failed test,
+        or never.
+        """
+        if self.blob_policy == MODE_NEVER:
+            return
+        if self.blob_policy == MODE_ON_FAILURE and not self._flushing:
+            return
+        with self._lock:
+            for digest, data in blobs.items():
+                if digest in self._attached_blobs:
+                    continue
+                self._attached_blobs.add(digest)
+                mime_type, extension = sniff_media_type(data)
+                allure.attach(
+                    body=data,
+                    name=f"Blob — {digest[:16]}",
+                    attachment_type=mime_type,
+                    extension=extension,
+                )
+
+    def finish_test(self) -> dict:
+        """
+        Drop exchanges that were never needed and return this test's stats
+
+        Returns:
+            dict: exchanges attached/skipped, bytes skipped, formatting time
+                  spent and an estimate of the formatting time saved
+        """
+        with self._lock:
+            skipped, self._pending = self._pending, []
+            skipped_bytes = sum(exchange_size(response) for _, response, _ in skipped)
+            seconds_per_byte = (
+                self._formatted_seconds / self._formatted_bytes if self._formatted_bytes else None
+            )
+            stats = {
+                "attached": self._attached,
+                "skipped": len(skipped),
+                "skipped_bytes": skipped_bytes,
+                "format_seconds": self._format_seconds,
+                "saved_seconds_estimate": (
+                    skipped_bytes * seconds_per_byte if seconds_per_byte is not None else None
+                ),
+            }
+            self._attached = 0
+            self._format_seconds = 0.0
+            self._attached_blobs.clear()
+
+            self.totals["tests"] += 1
+            for key in ("attached", "skipped", "skipped_bytes"):
+                self.totals[key] += stats[key]
+            self.totals["saved_seconds_estimate"] += stats["saved_seconds_estimate"] or 0.0
+            return stats
+
+
+capture = AllureCapture(http_settings.ALLURE_CAPTURE_MODE, http_settings.ALLURE_ATTACH_BLOBS)
@@ -0,0 +1,87 @@
+"""
+Size-aware formatting of API payloads for Allure attachments
+
+ASR, diarization and pipeline requests carry audioContent, OCR requests carry
+images and TTS responses carry generated audio - all as base64 strings that
+can be megabytes long. Dumping them verbatim into every JSON attachment bloats
+allure-results and every archived report, so long base64 values are replaced
+by a short summary (sha256, length, prefix) and the decoded blob is attached
+separately, once per digest, only when the policy asks for it.
+"""
+
+import base64
+import binascii
+import hashlib
+import re
+
+BASE64_RE = re.compile(r"[A-Za-z0-9+/\r\n]+={0,2}")
+# Encoded binary always mixes in digits or +/ early on; long plain words do not
+BASE64_NON_ALPHA_RE = re.compile(r"[0-9+/]")
+
+# (magic prefix, mime type, extension) for the media the platform exchanges
+MEDIA_SIGNATURES = [
+    (b"\xff\xd8\xff", "image/jpeg", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+    (b"GIF8", "image/gif", "gif"),
+    (b"ID3", "audio/mpeg", "mp3"),
+    (b"\xff\xfb", "audio/mpeg", "mp3"),
+    (b"OggS", "audio/ogg", "ogg"),
+    (b"fLaC", "audio/flac", "flac"),
+    (b"%PDF", "application/pdf", "pdf"),
+]
+
+
+def sniff_media_type(data: bytes):
+    """
+    Guess the media type of a decoded blob from its magic bytes
+
+    Returns:
+        tuple: (mime_type, extension)
+    """
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "audio/wav", "wav"
+    for magic, mime_type, extension in MEDIA_SIGNATURES:
+        if data.startswith(magic):
+            return mime_type, extension
+    return "application/octet-stream", "bin"
+
+
+def summarize_blobs(value, min_chars: int, blobs: dict):
+    """
+    Replace long base64 strings in a parsed JSON payload with summaries
+
+    Args:
+        value: Parsed JSON value (dict / list / scalar)
+        min_chars: Strings at least this long that look like base64 are summarized
+        blobs: Filled with {sha256: decoded bytes} for every summarized string
+
+    Returns:
+        The payload with blobs replaced by "<base64 sha256=... bytes=... prefix=...>"
+    """
+    if isinstance(value, dict):
+        return {key: summarize_blobs(item, min_chars, blobs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [summarize_blobs(item, min_chars, blobs) for item in value]
+    if (isinstance(value, str) and len(value) >= min_chars
+            and BASE64_NON_ALPHA_RE.search(value, 0, 1024) and BASE64_RE.fullmatch(value)):
+        try:
+            data = base64.b64decode(value)
+        except (binascii.Error, ValueError):
+            return value
+        digest = hashlib.sha256(data).hexdigest()
+        blobs[digest] = data
+        mime_type, _ = sniff_media_type(data)
+        return (
+            f"<base64 {mime_type} sha256={digest[:16]} chars={len(value)} "
+            f"bytes={len(data)} prefix={value[:24]}...>"
+        )
+    return value
+
+
+def truncate_to_budget(text: str, max_bytes: int) -> str:
+    """Cut an attachment body down to max_bytes (UTF-8), noting what was dropped"""
+    encoded = text.encode("utf-8")
+    if max_bytes <= 0 or len(encoded) <= max_bytes:
+        return text
+    kept = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{kept}\n\n... truncated {len(encoded) - max_bytes} bytes (ALLURE_ATTACHMENT_MAX_BYTES={max_bytes})"
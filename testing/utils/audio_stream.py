@@ -0,0 +1,280 @@
+"""
+Streaming handling of base64 audio in JSON responses (TTS)
+
+TTS answers {"audio": [{"audioContent": "<base64>", ...}], ...}. Reading that
+with response.json() holds the body, the decoded str and then every copy made
+for Allure in memory at once; long-text or concurrent TTS runs blow up the
+runner. APIClient.stream_audio() instead feeds the body through
+AudioFieldScanner chunk by chunk: every audioContent string is base64-decoded
+on the fly into sinks (hash, WAV duration probe, file on disk) and the rest of
+the JSON is kept as a small skeleton. Peak memory stays flat regardless of
+output length.
+"""
+
+import base64
+import hashlib
+import json
+import struct
+from pathlib import Path
+
+AUDIO_FIELD = "audioContent"
+WHITESPACE = " \t\r\n"
+
+
+class HashSink:
+    """Running digest and size of the decoded audio"""
+
+    def __init__(self, algorithm: str = "sha256"):
+        self.algorithm = algorithm
+        self._hash = hashlib.new(algorithm)
+        self.size = 0
+
+    def write(self, data: bytes):
+        self._hash.update(data)
+        self.size += len(data)
+
+    def close(self):
+        pass
+
+    def result(self) -> dict:
+        return {self.algorithm: self._hash.hexdigest(), "bytes": self.size}
+
+
+class FileSink:
+    """Write the decoded audio straight to disk"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+    def result(self) -> dict:
+        return {"path": str(self.path)}
+
+
+class WavProbe:
+    """
+    Duration of a RIFF/WAVE stream from its header and total size
+
+    Only the first few KB are buffered (enough for the fmt and data chunk
+    headers); the rest is just counted.
+    """
+
+    HEADER_LIMIT = 4096
+
+    def __init__(self):
+        self._header = b""
+        self.size = 0
+
+    def write(self, data: bytes):
+        if len(self._header) < self.HEADER_LIMIT:
+            self._header += data[:self.HEADER_LIMIT - len(self._header)]
+        self.size += len(data)
+
+    def close(self):
+        pass
+
+    def _parse_header(self):
+        """(channels, sample_rate, byte_rate, bits_per_sample, data_offset) or None"""
+        header = self._header
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        fmt, offset = None, 12
+        while offset + 8 <= len(header):
+            chunk_id, chunk_size = header[offset:offset + 4], struct.unpack("<I", header[offset + 4:offset + 8])[0]
+            if chunk_id == b"fmt " and offset + 24 <= len(header):
+                _, channels, sample_rate, byte_rate, _, bits = struct.unpack("<HHIIHH", header[offset + 8:offset + 24])
+                fmt = (channels, sample_rate, byte_rate, bits)
+            elif chunk_id == b"data" and fmt:
+                return (*fmt, offset + 8)
+            offset += 8 + chunk_size + (chunk_size & 1)
+        return None
+
+    def result(self) -> dict:
+        parsed = self._parse_header()
+        if not parsed or not parsed[2]:
+            return {"format": None, "duration_seconds": None}
+        channels, sample_rate, byte_rate, bits, data_offset = parsed
+        return {
+            "format": "wav",
+            "channels": channels,
+            "sample_rate": sample_rate,
+            "bits_per_sample": bits,
+            "duration_seconds": round((self.size - data_offset) / byte_rate, 3),
+        }
+
+
+def default_sinks(index: int) -> list:
+    """Sinks used when stream_audio() is not given any: digest + WAV duration"""
+    return [HashSink(), WavProbe()]
+
+
+def file_sinks(directory, prefix: str = "tts"):
+    """Sink factory that also writes each audio item to <directory>/<prefix>_<index>.audio"""
+    def factory(index: int) -> list:
+        return [HashSink(), WavProbe(), FileSink(Path(directory) / f"{prefix}_{index}.audio")]
+    return factory
+
+
+class Base64Decoder:
+    """Incremental base64 decoder (carries partial quads between chunks)"""
+
+    def __init__(self, sinks: list):
+        self.sinks = sinks
+        self._carry = ""
+        self.chars = 0
+
+    def feed(self, text: str):
+        self.chars += len(text)
+        text = self._carry + text
+        usable = len(text) - len(text) % 4
+        self._carry = text[usable:]
+        if usable:
+            self._emit(base64.b64decode(text[:usable]))
+
+    def close(self):
+        if self._carry.rstrip("="):
+            self._emit(base64.b64decode(self._carry + "=" * (-len(self._carry) % 4)))
+        self._carry = ""
+        for sink in self.sinks:
+            sink.close()
+
+    def _emit(self, data: bytes):
+        for sink in self.sinks:
+            sink.write(data)
+
+
+class AudioFieldScanner:
+    """
+    Incremental JSON scanner diverting one string field into decoders
+
+    Text outside the audio field is copied into a skeleton; each audio
+    string is replaced there by "<streamed:<index>>" and its contents are
+    decoded into the sinks returned by sink_factory(index).
+    """
+
+    def __init__(self, sink_factory=default_sinks, field: str = AUDIO_FIELD):
+        self.sink_factory = sink_factory
+        self.field = field
+        self.decoders = []
+        self._skeleton = []
+        self._in_string = False
+        self._escape = False
+        self._string = []
+        self._key_pending = False
+        self._value_pending = False
+        self._decoder = None
+        self._pending_escape = ""
+
+    def feed(self, text: str):
+        i, length = 0, len(text)
+        while i < length:
+            if self._decoder is not None:
+                i = self._feed_audio(text, i)
+                continue
+            char = text[i]
+            self._skeleton.append(char)
+            i += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._key_pending = "".join(self._string) == self.field
+                    self._string = []
+                elif len(self._string) <= len(self.field):
+                    self._string.append(char)
+            elif char == '"':
+                if self._value_pending:
+                    self._start_audio()
+                else:
+                    self._in_string = True
+            elif char == ":" and self._key_pending:
+                self._key_pending = False
+                self._value_pending = True
+            elif char not in WHITESPACE:
+                self._key_pending = self._value_pending = False
+
+    def _start_audio(self):
+        self._value_pending = False
+        index = len(self.decoders)
+        self._decoder = Base64Decoder(self.sink_factory(index))
+        self.decoders.append(self._decoder)
+        self._skeleton.append(f"<streamed:{index}>")
+
+    def _feed_audio(self, text: str, start: int) -> int:
+        """Decode audio chars from text[start:]; returns the index to resume at"""
+        end = text.find('"', start)
+        segment = self._pending_escape + text[start:end if end != -1 else len(text)]
+        self._pending_escape = ""
+        if "\\" in segment:
+            # JSON encoders may escape "/" and wrap long strings with "\n"
+            if segment.endswith("\\") and (len(segment) - len(segment.rstrip("\\"))) % 2:
+                segment, self._pending_escape = segment[:-1], "\\"
+            segment = segment.replace("\\/", "/").replace("\\n", "").replace("\\r", "")
+        self._decoder.feed(segment)
+        if end == -1:
+            return len(text)
+        self._decoder.close()
+        self._decoder = None
+        self._skeleton.append('"')
+        return end + 1
+
+    def skeleton(self):
+        """Parsed JSON with audio strings replaced by "<streamed:<index>>" placeholders"""
+        return json.loads("".join(self._skeleton))
+
+
+class StreamedAudio:
+    """Outcome of APIClient.stream_audio()"""
+
+    def __init__(self, response, data, audio: list):
+        """
+        Args:
+            response: httpx.Response (body consumed and closed)
+            data: Response JSON with each audio string replaced by its summary
+            audio: One dict per audio field (sink results merged + base64 char count)
+        """
+        self.response = response
+        self.data = data
+        self.audio = audio
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+
+def finish_stream(response, scanner: AudioFieldScanner) -> StreamedAudio:
+    """Build a StreamedAudio from a fully fed scanner"""
+    audio = []
+    for decoder in scanner.decoders:
+        result = {"base64_chars": decoder.chars}
+        for sink in decoder.sinks:
+            result.update(sink.result())
+        audio.append(result)
+
+    try:
+        data = _replace_placeholders(scanner.skeleton(), audio)
+    except json.JSONDecodeError:
+        data = None
+    return StreamedAudio(response, data, audio)
+
+
+def _replace_placeholders(value, audio: list):
+    if isinstance(value, dict):
+        return {key: _replace_placeholders(item, audio) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_placeholders(item, audio) for item in value]
+    if isinstance(value, str) and value.startswith("<streamed:") and value.endswith(">"):
+        item = audio[int(value[len("<streamed:"):-1])]
+        digest = item.get("sha256", "")[:16]
+        return f"<streamed base64 sha256={digest} chars={item['base64_chars']} bytes={item.get('bytes')}>"
+    return value
@@ -1,27 +1,235 @@
+import heapq
 import httpx
+import itertools
+import random
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 import threading
 from config.settings import settings
+from utils.retry import RetryPolicy
+from utils.cassette import cassettes
+from utils.token_cache import jwt_expiry, token_cache
+from utils.http_metrics import percentile
+
+# A token this close to its exp counts as expired when a request with it gets a 401 (clock skew)
+TOKEN_EXPIRY_LEEWAY = 5.0
+
+
+class RefreshStats:
+    """Thread-safe token refresh schedule and latency per account (for the terminal summary)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._accounts = {}
+
+    def _account(self, email: str) -> dict:
+        return self._accounts.setdefault(email, {
+            "refreshes": 0, "failures": 0, "relogins": 0, "latencies": [],
+            "on_401": 0, "on_401_shared": 0,
+            "expires_at": None, "next_refresh_at": None,
+        })
+
+    def scheduled(self, email: str, expires_at: float, delay: float):
+        """Record when the next refresh is due and when the current token expires"""
+        with self._lock:
+            account = self._account(email)
+            account["expires_at"] = expires_at
+            account["next_refresh_at"] = time.time() + delay
+
+    def refreshed(self, email: str, latency: float, relogin: bool = False):
+        """Record a successful refresh (or fallback re-login) and how long it took incl. retries"""
+        with self._lock:
+            account = self._account(email)
+            account["relogins" if relogin else "refreshes"] += 1
+            account["latencies"].append(latency)
+
+    def refreshed_on_401(self, email: str, shared: bool):
+        """Record a 401 on an expired token: one caller refreshes, concurrent callers share its token"""
+        with self._lock:
+            self._account(email)["on_401_shared" if shared else "on_401"] += 1
+
+    def failed(self, email: str):
+        """Record a failed refresh attempt"""
+        with self._lock:
+            self._account(email)["failures"] += 1
+
+    def summary(self) -> dict:
+        """{email: counters, latency_p50 / latency_max (s), expires_at / next_refresh_at (epoch)}"""
+        with self._lock:
+            accounts = {email: dict(account, latencies=list(account["latencies"]))
+                        for email, account in self._accounts.items()}
+        for account in accounts.values():
+            latencies = account.pop("latencies")
+            account["latency_p50"] = percentile(latencies, 0.5) if latencies else None
+            account["latency_max"] = max(latencies) if latencies else None
+        return accounts
+
+
+refresh_stats = RefreshStats()
+
+
+class RefreshScheduler:
+    """
+    One thread refreshing every registered TokenManager when it falls due
+
+    Due times live in a heap; the scheduler thread sleeps until the earliest
+    one and hands the refresh to a bounded worker pool, then the manager is
+    re-queued for its next due time. The thread count stays at one plus
+    TOKEN_REFRESH_WORKERS however many identities are registered.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Args:
+            max_workers: Refreshes running at once
+        """
+        self.max_workers = max_workers
+        self._heap = []  # (due monotonic time, sequence, generation, manager)
+        self._generations = {}  # manager -> generation of its live heap entry
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._executor = None
+
+    def register(self, manager):
+        """Schedule a manager's refreshes (starts the scheduler on first use)"""
+        with self._condition:
+            generation = next(self._sequence)
+            self._generations[manager] = generation
+            self._push(manager, generation, manager.next_refresh_delay())
+            if not self._running:
+                self._running = True
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="token-refresh")
+                self._thread = threading.Thread(target=self._run, name="token-refresh-scheduler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def unregister(self, manager):
+        """Stop refreshing a manager (its queued entry is dropped when it falls due)"""
+        with self._condition:
+            self._generations.pop(manager, None)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the scheduler and wait for in-flight refreshes (called at session end)"""
+        with self._condition:
+            self._running = False
+            self._generations.clear()
+            self._heap.clear()
+            self._condition.notify_all()
+            thread, executor = self._thread, self._executor
+            self._thread = self._executor = None
+        if thread:
+            thread.join(timeout)
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _push(self, manager, generation: int, delay: float):
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), generation, manager))
+        refresh_stats.scheduled(manager.email, manager.expires_at, delay)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._condition.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if not self._running:
+                    return
+                _, _, generation, manager = heapq.heappop(self._heap)
+                if self._generations.get(manager) != generation:
+                    continue
+                executor = self._executor
+            executor.submit(self._refresh, manager, generation)
+
+    def _refresh(self, manager, generation: int):
+        try:
+            refreshed = manager.refresh()
+        except Exception as e:
+            logger.error(f"Token refresh crashed for {manager.email}: {e!r}")
+            refreshed = False
+        with self._condition:
+            if self._generations.get(manager) != generation:
+                return
+            # Everything failed: try again after a short pause instead of giving up for good
+            delay = manager.next_refresh_delay() if refreshed else settings.TOKEN_REFRESH_BACKOFF_MAX
+            self._push(manager, generation, delay)
+            self._condition.notify()
+
+
+refresh_scheduler = RefreshScheduler(settings.TOKEN_REFRESH_WORKERS)
 
 
 class TokenManager:
     """Manages access token and automatic background refresh"""
 
-    def __init__(self, email: str, password: str):
+    def __init__(self, email: str, password: str, lazy: bool = False):
+        """
+        Args:
+            email: Account email
+            password: Account password
+            lazy: Defer login until the first get_access_token() / get_token_snapshot()
+        """
         self.username = None
         self.password = password
         self.email = email
         self.access_token = None
         self.refresh_token = None
         self.expires_in = None
-        self.refresh_thread = None
-        self._stop_event = threading.Event()  # ← fixed: created here
+        self.expires_at = None
+        # Set while this manager is not scheduled; wakes a refresh backing off when stopped
+        self._stop_event = threading.Event()
+        # Guards access_token/refresh_token swaps; token_version bumps on every swap
+        # so clients can cache headers until the token rotates
+        self._token_lock = threading.RLock()
+        self.token_version = 0
+        # One refresh at a time (scheduled or after a 401); later callers reuse its token
+        self._refresh_lock = threading.Lock()
+        # Entry shared with other pytest-xdist workers (see utils/token_cache.py)
+        self._cache_key = token_cache.key_for(email) if token_cache else None
+        self._cached_at = None  # updated_at of the cache entry our tokens came from
+        # Lazy login: the first token read logs in, and only then is refresh scheduled
+        self._login_lock = threading.Lock()
+        self.logged_in = False
+        self._refresh_requested = False
+
+        if not lazy:
+            self._ensure_logged_in()
 
-        self._login()
+    def _ensure_logged_in(self):
+        """Log in once, on first use (starting background refresh if it was requested meanwhile)"""
+        if self.logged_in:
+            return
+        with self._login_lock:
+            if self.logged_in:
+                return
+            self._login()
+            self.logged_in = True
+            if self._refresh_requested:
+                refresh_scheduler.register(self)
 
     def _login(self):
-        """Perform login and get tokens"""
+        """Perform login and get tokens (or reuse another worker's from the token cache)"""
+        if cassettes and cassettes.offline:
+            # Replayed exchanges are keyed without the bearer token, any token will do
+            self._set_tokens("cassette-replay", "cassette-replay")
+            self._set_expiry()
+            logger.info(f"✓ Cassette replay: skipped login for {self.email}")
+            return
+        if not token_cache:
+            self._login_request()
+            return
+        # Other workers block here until the first one has logged in, then reuse its tokens
+        with token_cache.locked(self._cache_key):
+            if self._adopt_cached_tokens():
+                logger.info(f"✓ Reusing cached token for {self.email}")
+                return
+            self._login_request()
+            self._store_cached_tokens()
+
+    def _login_request(self):
+        """POST /auth/login and store the tokens"""
         url = f"{settings.BASE_URL}/api/v1/auth/login"
         payload = {
             "email": self.email,
@@ -31,60 +239,344 @@ class TokenManager:
         logger.info(f"🔍 Login URL: {url}")
         logger.info(f"🔍 Password: {'*' * len(self.password)}")
 
-        response = httpx.post(url, json=payload, timeout=settings.REQUEST_TIMEOUT)
+        # Logging in again is harmless, so transient failures are retried like a GET
+        response = RetryPolicy.from_settings().call(
+            "POST", url,
+            lambda: httpx.post(url, json=payload, timeout=settings.REQUEST_TIMEOUT),
+            idempotent=True
+        )
         response.raise_for_status()
         data = response.json()
-        self.access_token = data["access_token"]
-        self.refresh_token = data["refresh_token"]
-        self.expires_in = 900
+        self._set_tokens(data["access_token"], data["refresh_token"])
+        self._set_expiry(data.get("expires_in"))
         logger.info(f"✓ Login successful. Token expires in {self.expires_in}s")
 
+    def _set_tokens(self, access_token: str, refresh_token: str = None):
+        """Swap in new tokens atomically and bump token_version"""
+        with self._token_lock:
+            self.access_token = access_token
+            if refresh_token is not None:
+                self.refresh_token = refresh_token
+            self.token_version += 1
+
+    def _set_expiry(self, expires_in: float = None, expires_at: float = None):
+        """
+        Work out when the current access token expires
+
+        Prefers the token's own JWT `exp` claim, then the server's expires_in;
+        tokens with neither are assumed to live TOKEN_REFRESH_INTERVAL +
+        TOKEN_REFRESH_MARGIN so they are refreshed every TOKEN_REFRESH_INTERVAL.
+        """
+        self.expires_at = (
+            expires_at
+            or jwt_expiry(self.access_token)
+            or time.time() + (expires_in or settings.TOKEN_REFRESH_INTERVAL + settings.TOKEN_REFRESH_MARGIN)
+        )
+        self.expires_in = max(0, int(self.expires_at - time.time()))
+
+    def next_refresh_delay(self) -> float:
+        """Seconds until the token is due for refresh: TOKEN_REFRESH_MARGIN before exp (at most half its remaining life)"""
+        remaining = self.expires_at - time.time()
+        return max(1.0, remaining - min(settings.TOKEN_REFRESH_MARGIN, remaining / 2))
+
+    def _adopt_cached_tokens(self) -> bool:
+        """Take over the cached tokens if they are usable (call under the cache lock)"""
+        entry = token_cache.load(self._cache_key)
+        if entry is None:
+            return False
+        if entry["access_token"] != self.access_token:
+            self._set_tokens(entry["access_token"], entry["refresh_token"])
+        self._set_expiry(expires_at=entry["expires_at"])
+        self._cached_at = entry["updated_at"]
+        return True
+
+    def _store_cached_tokens(self):
+        """Publish our tokens to the other workers (call under the cache lock)"""
+        entry = token_cache.store(self._cache_key, self.access_token, self.refresh_token, self.expires_in)
+        self._cached_at = entry["updated_at"]
+
     def _refresh_access_token(self):
-        """Refresh access token"""
+        """Refresh access token (once across workers when the token cache is on); raises on failure"""
+        if cassettes and cassettes.offline:
+            return
+        if not token_cache:
+            self._refresh_request()
+            return
+        with token_cache.locked(self._cache_key):
+            cached = token_cache.load(self._cache_key)
+            if cached and cached["updated_at"] != self._cached_at:
+                # Another worker refreshed (or re-logged in) since we last looked
+                self._adopt_cached_tokens()
+                return
+            self._refresh_request()
+            self._store_cached_tokens()
+
+    def _refresh_request(self):
+        """POST /auth/refresh and swap in the new token (raises on failure)"""
         url = f"{settings.BASE_URL}/api/v1/auth/refresh"
         payload = {"refresh_token": self.refresh_token}
 
+        response = httpx.post(url, json=payload, timeout=settings.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        # Servers rotating refresh tokens return a new one too
+        self._set_tokens(data["access_token"], data.get("refresh_token"))
+        self._set_expiry(data.get("expires_in"))
+
+    def _relogin(self):
+        """Full login with the password, replacing tokens the refresh endpoint no longer accepts"""
+        if not token_cache:
+            self._login_request()
+            return
+        with token_cache.locked(self._cache_key):
+            self._login_request()
+            self._store_cached_tokens()
+
+    def refresh(self) -> bool:
+        """
+        Refresh now, retrying with backoff and falling back to a full re-login
+
+        Transient failures (transport errors, 429, 5xx) are retried up to
+        TOKEN_REFRESH_RETRIES times with full-jitter exponential backoff; a
+        rejected refresh token (other 4xx) goes straight to re-login.
+
+        Returns:
+            bool: False if refresh and re-login both failed (or the manager was stopped)
+        """
+        with self._refresh_lock:
+            return self._refresh_with_retries()
+
+    def token_expired(self, version: int) -> bool:
+        """True if the token of this version has been replaced or is (about to be) past its exp"""
+        with self._token_lock:
+            if version != self.token_version:
+                return True
+            expires_at = jwt_expiry(self.access_token) or self.expires_at
+        return expires_at is not None and expires_at - time.time() <= TOKEN_EXPIRY_LEEWAY
+
+    def refresh_after_401(self, version: int):
+        """
+        Refresh after a request with token `version` got a 401 for an expired token
+
+        Callers failing concurrently queue on the refresh lock; the first one
+        refreshes and the rest find token_version moved on and reuse its token.
+
+        Returns:
+            tuple or None: (access_token, token_version) to replay the request with,
+                           or None if no newer token could be obtained
+        """
+        with self._refresh_lock:
+            if version != self.token_version:
+                refresh_stats.refreshed_on_401(self.email, shared=True)
+            else:
+                refresh_stats.refreshed_on_401(self.email, shared=False)
+                logger.info(f"Access token for {self.email} expired before its scheduled refresh, refreshing now")
+                if not self._refresh_with_retries():
+                    return None
+            with self._token_lock:
+                if self.token_version == version:
+                    return None
+                return self.access_token, self.token_version
+
+    def _refresh_with_retries(self) -> bool:
+        """refresh() without the lock"""
+        started = time.perf_counter()
+        for attempt in range(settings.TOKEN_REFRESH_RETRIES + 1):
+            try:
+                self._refresh_access_token()
+            except Exception as e:
+                refresh_stats.failed(self.email)
+                logger.warning(f"Token refresh failed for {self.email} (attempt {attempt + 1}): {e!r}")
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                if status is not None and status < 500 and status != 429:
+                    break
+                if attempt < settings.TOKEN_REFRESH_RETRIES:
+                    ceiling = min(settings.TOKEN_REFRESH_BACKOFF_MAX, settings.TOKEN_REFRESH_BACKOFF_BASE * 2 ** attempt)
+                    if self._stop_event.wait(random.uniform(0, ceiling)):
+                        return False
+            else:
+                refresh_stats.refreshed(self.email, time.perf_counter() - started)
+                return True
         try:
-            response = httpx.post(url, json=payload, timeout=settings.REQUEST_TIMEOUT)
-            response.raise_for_status()
-            data = response.json()
-            self.access_token = data["access_token"]
+            self._relogin()
         except Exception as e:
-            print(f"Failed to refresh token: {e}")
-            self._stop_event.set()  # ← stop on failure
-
-    def _background_refresh(self):
-        """Background thread to auto-refresh token"""
-        while not self._stop_event.wait(timeout=settings.TOKEN_REFRESH_INTERVAL):
-            # wait() returns False on timeout, True when event is set
-            # so when stop is signalled, wait() returns True and loop exits
-            self._refresh_access_token()
+            refresh_stats.failed(self.email)
+            logger.error(f"Token refresh and re-login failed for {self.email}: {e!r}")
+            return False
+        refresh_stats.refreshed(self.email, time.perf_counter() - started, relogin=True)
+        logger.info(f"✓ Re-logged in {self.email} after failed token refresh")
+        return True
 
     def start_background_refresh(self):
-        """Start background token refresh thread"""
-        if self.refresh_thread is None or not self.refresh_thread.is_alive():
-            self._stop_event.clear()
-            self.refresh_thread = threading.Thread(
-                target=self._background_refresh,
-                daemon=True  # ← dies automatically when pytest exits
-            )
-            self.refresh_thread.start()
-            print("✓ Background token refresh started")
+        """Register with the shared refresh scheduler (refreshes shortly before exp; after login if lazy)"""
+        self._stop_event.clear()
+        with self._login_lock:
+            self._refresh_requested = True
+            if self.logged_in:
+                refresh_scheduler.register(self)
+        print("✓ Background token refresh started")
 
     def stop_background_refresh(self):
-        """Stop background token refresh thread"""
-        self._stop_event.set()  # ← wakes thread immediately
-        if self.refresh_thread:
-            self.refresh_thread.join(timeout=3)
+        """Unregister from the shared refresh scheduler"""
+        self._stop_event.set()  # ← wakes a refresh that is backing off
+        with self._login_lock:
+            self._refresh_requested = False
+        refresh_scheduler.unregister(self)
         print("✓ Background token refresh stopped")
 
     def get_access_token(self):
         """Get current access token"""
-        return self.access_token
+        return self.get_token_snapshot()[0]
 
+    def get_token_snapshot(self):
+        """
+        Get the current access token together with its version
 
-def login_and_get_token_manager(email: str, password: str) -> TokenManager:
-    """Login and return TokenManager with background refresh"""
-    token_manager = TokenManager(email, password)
+        Logs in first if this is a lazy manager's first use.
+
+        Returns:
+            tuple: (access_token, token_version) read consistently, so callers
+                   never pair a new token with a stale version or vice versa
+        """
+        self._ensure_logged_in()
+        with self._token_lock:
+            return self.access_token, self.token_version
+
+
+def login_and_get_token_manager(email: str, password: str, lazy: bool = None) -> TokenManager:
+    """
+    Return a TokenManager with background refresh
+
+    Args:
+        email: Account email
+        password: Account password
+        lazy: Log in on first token use instead of now (defaults to TOKEN_LAZY_LOGIN)
+    """
+    if lazy is None:
+        lazy = settings.TOKEN_LAZY_LOGIN
+    token_manager = TokenManager(email, password, lazy=lazy)
     token_manager.start_background_refresh()
-    return token_manager
\ No newline at end of file
+    return token_manager
+
+
+# Outcome of one login in login_all(): manager is None when it failed with `error`
+LoginResult = namedtuple("LoginResult", "manager error seconds")
+
+
+def login_all(credentials: dict, max_workers: int = None) -> dict:
+    """
+    Log in several identities concurrently, each with background refresh
+
+    One identity failing to log in does not keep the others from coming up.
+
+    Args:
+        credentials: {label: (email, password)}
+        max_workers: Logins in flight at once (defaults to all of them)
+
+    Returns:
+        dict: {label: LoginResult(manager, error, seconds)} in the order given
+    """
+    def login(account):
+        email, password = account
+        started = time.perf_counter()
+        try:
+            manager = login_and_get_token_manager(email, password, lazy=False)
+        except Exception as e:
+            logger.error(f"Login failed for {email}: {e!r}")
+            return LoginResult(None, e, time.perf_counter() - started)
+        return LoginResult(manager, None, time.perf_counter() - started)
+
+    if not credentials:
+        return {}
+    workers = min(len(credentials), max_workers or len(credentials))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login") as executor:
+        return dict(zip(credentials, executor.map(login, credentials.values())))
+
+
+class TokenPool:
+    """
+    Several accounts of one role, logged in concurrently, handed out in turn
+
+    Stands in for a TokenManager: an APIClient built on a pool sends each
+    request with the next account's token (round_robin, or lru: the account
+    whose token was handed out longest ago), so load spreads over per-user
+    rate limits and shows up as many users. Every account is refreshed by the
+    shared refresh scheduler; a 401 for an expired token refreshes only the
+    account that sent it.
+    """
+
+    STRATEGIES = ("round_robin", "lru")
+
+    def __init__(self, role: str, credentials: list, strategy: str = None, max_workers: int = None):
+        """
+        Args:
+            role: Role label (also used as the client's metrics role)
+            credentials: [(email, password), ...]
+            strategy: round_robin or lru (defaults to TOKEN_POOL_STRATEGY)
+            max_workers: Logins in flight at once (defaults to TOKEN_POOL_LOGIN_CONCURRENCY)
+        """
+        strategy = strategy or settings.TOKEN_POOL_STRATEGY
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown token pool strategy '{strategy}', expected one of {self.STRATEGIES}")
+        self.role = role
+        self.strategy = strategy
+        logins = login_all(
+            {email: (email, password) for email, password in credentials},
+            max_workers or settings.TOKEN_POOL_LOGIN_CONCURRENCY,
+        )
+        self.errors = {email: result.error for email, result in logins.items() if result.error is not None}
+        self.managers = [result.manager for result in logins.values() if result.manager]
+        if not self.managers:
+            raise RuntimeError(f"No account of role '{role}' could log in: {self.errors!r}")
+        self.uses = [0] * len(self.managers)
+        self._last_used = [0.0] * len(self.managers)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_role(cls, role: str, strategy: str = None):
+        """Pool of the accounts configured for a role (<ROLE>_CREDENTIALS, else <ROLE>_USERNAME)"""
+        return cls(role, settings.credentials(role), strategy)
+
+    def __len__(self):
+        return len(self.managers)
+
+    def next_manager(self) -> tuple:
+        """(index, TokenManager) of the account to use next"""
+        with self._lock:
+            if self.strategy == "lru":
+                index = min(range(len(self.managers)), key=self._last_used.__getitem__)
+            else:
+                index = self._next
+                self._next = (index + 1) % len(self.managers)
+            self._last_used[index] = time.monotonic()
+            self.uses[index] += 1
+        return index, self.managers[index]
+
+    def get_access_token(self):
+        """Access token of the next account"""
+        return self.get_token_snapshot()[0]
+
+    def get_token_snapshot(self):
+        """(access_token, (account index, token_version)) of the next account"""
+        index, manager = self.next_manager()
+        access_token, version = manager.get_token_snapshot()
+        return access_token, (index, version)
+
+    def token_expired(self, version: tuple) -> bool:
+        index, manager_version = version
+        return self.managers[index].token_expired(manager_version)
+
+    def refresh_after_401(self, version: tuple):
+        """Refresh the account that sent the request; its new (access_token, version), or None"""
+        index, manager_version = version
+        snapshot = self.managers[index].refresh_after_401(manager_version)
+        if snapshot is None:
+            return None
+        access_token, manager_version = snapshot
+        return access_token, (index, manager_version)
+
+    def stop(self):
+        """Stop refreshing every account"""
+        for manager in self.managers:
+            manager.stop_background_refresh()
@@ -0,0 +1,846 @@
+import asyncio
+import gzip
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import MappingProxyType
+import httpx
+from loguru import logger
+from config.http_settings import http_settings
+from utils.allure_capture import capture
+from utils.attachment_policy import summarize_blobs, truncate_to_budget
+from utils.retry import RetryPolicy, NO_RETRY
+from utils.rate_limit import RateLimiter, shared_rate_limiter
+from utils.circuit_breaker import CircuitBreakerRegistry, shared_circuit_breakers
+from utils.timeouts import TimeoutProfiles, shared_timeout_profiles
+from utils.helper import endpoint_template
+from utils.response_cache import ResponseCache, shared_response_cache
+from utils.single_flight import SingleFlight, shared_single_flight
+from utils.payload import encode_request_body
+from utils.audio_stream import AudioFieldScanner, StreamedAudio, default_sinks, finish_stream
+from utils.http_metrics import metrics, install_trace, install_trace_async
+from utils.cassette import CassetteTransport, AsyncCassetteTransport, cassettes
+import allure
+import json
+
+# Characters decoded per step by stream_audio() (bounds its peak memory)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def build_limits() -> httpx.Limits:
+    """Connection pool limits shared by every APIClient (see config/http_settings.py)"""
+    return httpx.Limits(
+        max_connections=http_settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=http_settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=http_settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def prewarm_clients(clients: dict, connections: int, path: str = "/") -> dict:
+    """
+    Pre-warm several clients' pools in parallel
+
+    Args:
+        clients: {label: APIClient}
+        connections: Keep-alive connections to open per client
+        path: Cheap path to request
+
+    Returns:
+        dict: {label: seconds taken, or the exception that stopped the warm-up}
+    """
+    def warm(client):
+        try:
+            return client.prewarm(connections, path)
+        except Exception as error:
+            return error
+
+    if not clients:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(clients), thread_name_prefix="api-prewarm-clients") as executor:
+        return dict(zip(clients, executor.map(warm, clients.values())))
+
+
+def http2_available() -> bool:
+    """HTTP/2 is only usable when the optional 'h2' package is installed"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class BaseAPIClient:
+    """
+    Shared plumbing for the v1 (API key + JWT) and v2 (JWT-only) API clients
+
+    Owns one long-lived httpx.Client so every request made through a client
+    reuses pooled keep-alive connections instead of paying a new TCP + TLS
+    handshake per call. Subclasses only decide which headers to send.
+    """
+
+    def __init__(self, base_url: str, token_manager, timeout: float,
+                 limits: httpx.Limits = None, http2: bool = None,
+                 retry_policy: RetryPolicy = None, role: str = None,
+                 rate_limiter: RateLimiter = None, response_cache: ResponseCache = None,
+                 gzip_requests: bool = None, circuit_breakers: CircuitBreakerRegistry = None,
+                 timeout_profiles: TimeoutProfiles = None, single_flight: SingleFlight = None):
+        """
+        Args:
+            base_url: Platform base URL (e.g., settings.BASE_URL)
+            token_manager: TokenManager instance, or None for unauthenticated calls
+            timeout: Default request timeout in seconds (endpoints without a timeout profile)
+            limits: Optional httpx.Limits (defaults to the http_settings pool limits)
+            http2: Enable HTTP/2 (defaults to http_settings.HTTP2_ENABLED)
+            retry_policy: RetryPolicy for transient failures (defaults to http_settings HTTP_RETRY_*)
+            role: Role label used to key rate limits (defaults to a TokenPool's role,
+                  else the token manager's email)
+            rate_limiter: RateLimiter shared across clients (defaults to the session-wide
+                          limiter from http_settings RATE_LIMIT_*, if any is configured)
+            response_cache: ResponseCache for catalog GETs (defaults to the session-wide
+                            cache when http_settings RESPONSE_CACHE_ENABLED is set)
+            gzip_requests: gzip bodies >= HTTP_GZIP_MIN_BYTES (defaults to http_settings.HTTP_GZIP_REQUESTS)
+            circuit_breakers: Per-endpoint breakers (defaults to the session-wide registry
+                              from http_settings CIRCUIT_BREAKER_*)
+            timeout_profiles: Per-endpoint-group httpx.Timeout (defaults to http_settings
+                              TIMEOUT_PROFILES when TIMEOUT_PROFILES_ENABLED is set)
+            single_flight: Coalesces identical concurrent GETs (defaults to the session-wide
+                           instance when http_settings HTTP_SINGLE_FLIGHT is set)
+        """
+        self.base_url = base_url
+        self.token_manager = token_manager
+        self.timeout = timeout
+        self.limits = limits or build_limits()
+        self.retry_policy = retry_policy or RetryPolicy.from_settings()
+        self.role = role or getattr(token_manager, "role", None) or getattr(token_manager, "email", None) or "anonymous"
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self.response_cache = response_cache or shared_response_cache
+        self.circuit_breakers = circuit_breakers or shared_circuit_breakers
+        self.timeout_profiles = timeout_profiles or shared_timeout_profiles
+        self.single_flight = single_flight or shared_single_flight
+
+        if http2 is None:
+            http2 = http_settings.HTTP2_ENABLED
+        if http2 and not http2_available():
+            logger.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.gzip_requests = http_settings.HTTP_GZIP_REQUESTS if gzip_requests is None else gzip_requests
+
+        # (token_version, read-only headers) - rebuilt only when the token rotates
+        self._headers_cache = None
+
+        self._client = self._open_client()
+
+    def _client_kwargs(self) -> dict:
+        """Keyword arguments used to build the underlying httpx client"""
+        kwargs = {
+            "limits": self.limits,
+            "http2": self.http2,
+            "timeout": self.timeout,
+            "headers": {"Accept-Encoding": http_settings.HTTP_ACCEPT_ENCODING},
+            "event_hooks": self._event_hooks(),
+        }
+        if cassettes:
+            kwargs["transport"] = self._cassette_transport()
+        return kwargs
+
+    def _cassette_transport(self):
+        """Record/replay transport (see utils.cassette); replay never opens a connection"""
+        if cassettes.offline:
+            return CassetteTransport(cassettes, self.role)
+        return CassetteTransport(cassettes, self.role, httpx.HTTPTransport(limits=self.limits, http2=self.http2))
+
+    def _event_hooks(self) -> dict:
+        """httpx event hooks: a per-request trace feeding utils.http_metrics"""
+        return {"request": [install_trace]}
+
+    def _open_client(self):
+        """Create the pooled httpx client owned by this APIClient"""
+        return httpx.Client(**self._client_kwargs())
+
+    def close(self):
+        """Close pooled connections (called by the session fixtures)"""
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def prewarm(self, connections: int = 1, path: str = "/") -> float:
+        """
+        Open keep-alive connections before the first test needs them
+
+        Sends `connections` concurrent HEAD requests so DNS, TCP and TLS setup
+        happen now instead of inside whichever test runs first. The warm-up
+        bypasses retries, breakers, metrics and Allure capture; any response
+        status will do. With HTTP/2 one connection carries every stream.
+
+        Args:
+            connections: Connections to open (capped at the keep-alive pool size)
+            path: Cheap path to request (e.g., "/")
+
+        Returns:
+            float: Seconds the warm-up took
+        """
+        connections = max(1, min(connections, self.limits.max_keepalive_connections or connections))
+        if self.http2:
+            connections = 1
+        url = self._build_url(path)
+        # Release every request together so none can reuse a connection another one opened
+        barrier = threading.Barrier(connections)
+
+        def touch(_):
+            barrier.wait()
+            self._client.request("HEAD", url)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="api-prewarm") as executor:
+            list(executor.map(touch, range(connections)))
+        return time.perf_counter() - started
+
+    def _build_headers(self, access_token: str) -> dict:
+        """Build the base request headers for a token - implemented by the v1/v2 clients"""
+        raise NotImplementedError
+
+    def _get_headers(self, extra_headers: dict = None):
+        """
+        Headers for one request, cached per token version
+
+        The base headers are built once per token and shared as a read-only
+        mapping; they are only rebuilt after TokenManager swaps in a new
+        token. extra_headers are merged into a per-request copy.
+
+        Args:
+            extra_headers: Optional additional headers to merge
+
+        Returns:
+            Mapping: HTTP headers for the request
+        """
+        return self._versioned_headers(extra_headers)[1]
+
+    def _versioned_headers(self, extra_headers: dict = None):
+        """(token_version, headers) - see _get_headers"""
+        if self.token_manager:
+            access_token, version = self.token_manager.get_token_snapshot()
+        else:
+            access_token, version = None, None
+
+        cached = self._headers_cache
+        if cached is None or cached[0] != version:
+            cached = (version, MappingProxyType(self._build_headers(access_token)))
+            self._headers_cache = cached
+
+        if extra_headers:
+            return version, {**cached[1], **extra_headers}
+        return cached
+
+    def _attach_to_allure(self, response: httpx.Response, method: str):
+        """
+        Attach request and response details to the Allure report.
+
+        Long base64 values (audio, images) are summarized in the JSON and
+        handed to the capture as blobs; bodies are cut to the attachment budget.
+        """
+        min_chars = http_settings.ALLURE_BLOB_MIN_CHARS
+        blobs = {}
+        self._attach_request_to_allure(response.request, method, blobs)
+
+        # --- RESPONSE ---
+        try:
+            response_body = json.dumps(summarize_blobs(response.json(), min_chars, blobs), indent=2)
+        except Exception:
+            response_body = response.text or "(no body)"
+        self._attach_response_to_allure(response, response_body)
+
+        if blobs:
+            capture.attach_blobs(blobs)
+
+    def _attach_request_to_allure(self, request: httpx.Request, method: str, blobs: dict):
+        """Attach the request line and (blob-summarized) body"""
+        # Request body (may be empty for GET/DELETE); show gzip bodies decompressed
+        content = request.content
+        if request.headers.get("Content-Encoding") == "gzip":
+            content = gzip.decompress(content)
+        try:
+            request_body = summarize_blobs(json.loads(content), http_settings.ALLURE_BLOB_MIN_CHARS, blobs)
+            request_body_str = json.dumps(request_body, indent=2)
+        except Exception:
+            request_body_str = content.decode("utf-8", errors="ignore") or "(no body)"
+
+        allure.attach(
+            body=truncate_to_budget(f"{method} {request.url}\n\n{request_body_str}", http_settings.ALLURE_ATTACHMENT_MAX_BYTES),
+            name=f"Request — {method}",
+            attachment_type=allure.attachment_type.JSON,
+        )
+
+    def _attach_response_to_allure(self, response: httpx.Response, response_body: str):
+        """Attach the response status and an already formatted body"""
+        allure.attach(
+            body=truncate_to_budget(f"Status: {response.status_code}\n\n{response_body}", http_settings.ALLURE_ATTACHMENT_MAX_BYTES),
+            name=f"Response — {response.status_code}",
+            attachment_type=allure.attachment_type.JSON,
+        )
+
+    def _attach_streamed_to_allure(self, streamed: StreamedAudio, response: httpx.Response, method: str):
+        """Allure attachment for stream_audio(): the audio was never buffered, only its summary is shown"""
+        blobs = {}
+        self._attach_request_to_allure(response.request, method, blobs)
+        if streamed.data is not None:
+            response_body = json.dumps(streamed.data, indent=2)
+        else:
+            response_body = "(streamed body was not JSON)"
+        self._attach_response_to_allure(response, response_body)
+        if blobs:
+            capture.attach_blobs(blobs)
+
+    def _build_url(self, endpoint: str) -> str:
+        """Join the base URL and an endpoint path"""
+        return f"{self.base_url}{endpoint}"
+
+    def _resolve_retry(self, retry) -> RetryPolicy:
+        """Per-call retry override: None = client policy, False = no retries"""
+        if retry is None:
+            return self.retry_policy
+        if retry is False:
+            return NO_RETRY
+        return retry
+
+    def _encode_body(self, kwargs: dict):
+        """
+        Encode the body once per call (PreparedBody bytes, optional gzip)
+
+        Returns:
+            tuple: (kwargs, extra headers, uncompressed body size or None)
+        """
+        compress = kwargs.pop("compress", None)
+        return encode_request_body(
+            kwargs,
+            compress=self.gzip_requests if compress is None else compress,
+            min_bytes=http_settings.HTTP_GZIP_MIN_BYTES,
+            level=http_settings.HTTP_GZIP_LEVEL,
+        )
+
+    def _cache_lookup(self, method: str, endpoint: str, use_cache, params, headers):
+        """(key, entry) for a cacheable GET; entry may be fresh, stale or None"""
+        if not self.response_cache:
+            return None, None
+        key = self.response_cache.key_for(self.role, method, endpoint, params, use_cache, headers)
+        return key, (self.response_cache.get(key) if key else None)
+
+    def _cache_store(self, key, entry, method: str, endpoint: str, response: httpx.Response):
+        """Cache a GET outcome (304 -> cached response) or invalidate after a mutation"""
+        if not self.response_cache:
+            return response
+        if key:
+            return self.response_cache.update(key, response, entry)
+        self.response_cache.mutated(method, endpoint)
+        return response
+
+    def _flight_key(self, method: str, url: str, headers: dict, kwargs: dict, coalesce):
+        """Single-flight key for a GET that may share an identical in-flight request, else None"""
+        if not self.single_flight or method != "GET" or coalesce is False:
+            return None
+        return self.single_flight.key_for(method, httpx.URL(url, params=kwargs.get("params")), headers)
+
+    def _apply_timeout(self, template: str, kwargs: dict):
+        """Use the endpoint group's httpx.Timeout unless the call passes timeout= itself"""
+        if self.timeout_profiles and "timeout" not in kwargs:
+            timeout = self.timeout_profiles.timeout_for(template)
+            if timeout is not None:
+                kwargs["timeout"] = timeout
+
+    def _token_expired(self, response: httpx.Response, version, extra_headers: dict) -> bool:
+        """True if a 401 was caused by our token expiring (not by a test sending its own credentials)"""
+        if response.status_code != 401 or not self.token_manager or not http_settings.HTTP_REFRESH_ON_401:
+            return False
+        if extra_headers and any(name.lower() == "authorization" for name in extra_headers):
+            return False
+        return self.token_manager.token_expired(version) or "invalid_token" in response.headers.get("WWW-Authenticate", "")
+
+    def _replay_headers(self, headers, access_token: str, extra_headers: dict) -> dict:
+        """A request's headers with the refreshed token of the same account swapped in"""
+        return {**headers, **self._build_headers(access_token), **(extra_headers or {})}
+
+    def _call_with_reauth(self, policy: RetryPolicy, breaker, method: str, url: str, send, version, headers,
+                          extra_headers: dict) -> httpx.Response:
+        """
+        policy.call(send), replayed once with a refreshed token after a 401 for an expired token
+
+        The breaker records one outcome for the whole call, after its retries,
+        so a few retried 503s do not open the endpoint's circuit on their own.
+
+        Args:
+            breaker: CircuitBreaker of the endpoint template
+            send: Callable(headers) performing one attempt
+            version: Token version the headers were built with
+            headers: Headers of the first attempt
+        """
+        breaker.before_request()
+        try:
+            response = policy.call(method, url, lambda: send(headers))
+            if self._token_expired(response, version, extra_headers):
+                snapshot = self.token_manager.refresh_after_401(version)
+                if snapshot is not None:
+                    # A 401 was not processed, so replaying is safe for POST too; reading the
+                    # (small) body hands a streamed response's connection back to the pool
+                    response.read()
+                    fresh_headers = self._replay_headers(headers, snapshot[0], extra_headers)
+                    response = policy.call(method, url, lambda: send(fresh_headers))
+        except httpx.RequestError as error:
+            breaker.record_error(error)
+            raise
+        except BaseException:
+            breaker.abandon_probe()
+            raise
+        breaker.record_response(response)
+        return response
+
+    def _record_timeout(self, template: str, error: httpx.TimeoutException):
+        """Count a timeout that fired against the endpoint's timeout group"""
+        if self.timeout_profiles:
+            self.timeout_profiles.record_timeout(template, error)
+
+    def _send(self, method: str, endpoint: str, extra_headers: dict = None, **kwargs):
+        """
+        Send a request over the pooled connection (cache, rate limit, retries, timings)
+
+        Thread-safe; Allure capture is left to the caller because allure-pytest
+        only attaches from the test's own thread.
+
+        Args:
+            method: HTTP method (GET, POST, ...)
+            endpoint: API endpoint path (e.g., "/api/v1/auth/me")
+            extra_headers: Optional additional headers
+            **kwargs: Additional httpx request parameters (json= dict or PreparedBody, params=, timeout=, ...)
+                      plus retry= (None: client policy, False: no retries, or a RetryPolicy)
+                      and cache= (None: designated catalog GETs, True: cache this GET,
+                      False: bypass the response cache)
+                      and compress= (None: client gzip_requests, True/False: override it)
+                      and coalesce= (False: never share an identical in-flight GET)
+
+        Returns:
+            httpx.Response: Response of the final attempt
+        """
+        policy = self._resolve_retry(kwargs.pop("retry", None))
+        coalesce = kwargs.pop("coalesce", None)
+        kwargs, body_headers, raw_bytes = self._encode_body(kwargs)
+        url = self._build_url(endpoint)
+        version, headers = self._versioned_headers(extra_headers)
+        if body_headers:
+            headers = {**headers, **body_headers}
+        template = endpoint_template(endpoint)
+        self._apply_timeout(template, kwargs)
+
+        cache_key, entry = self._cache_lookup(
+            method, endpoint, kwargs.pop("cache", None), kwargs.get("params"), headers
+        )
+        if entry and self.response_cache.is_fresh(entry):
+            return self.response_cache.hit(entry)
+        if entry and entry.etag:
+            headers = {**headers, "If-None-Match": entry.etag}
+
+        breaker = self.circuit_breakers.breaker(template)
+
+        def send(headers):
+            if self.rate_limiter:
+                self.rate_limiter.acquire(self.role, template)
+            try:
+                response = self._client.request(method, url, headers=headers, **kwargs)
+            except httpx.TimeoutException as error:
+                self._record_timeout(template, error)
+                raise
+            metrics.observe(self.role, method, template, response, raw_bytes)
+            return response
+
+        def fetch():
+            response = self._call_with_reauth(policy, breaker, method, url, send, version, headers, extra_headers)
+            return self._cache_store(cache_key, entry, method, endpoint, response)
+
+        flight_key = self._flight_key(method, url, headers, kwargs, coalesce)
+        if flight_key:
+            return self.single_flight.do(flight_key, fetch)
+        return fetch()
+
+    def request(self, method: str, endpoint: str, extra_headers: dict = None, **kwargs):
+        """
+        Send a request over the pooled connection and capture it for Allure
+
+        Args:
+            method: HTTP method (GET, POST, ...)
+            endpoint: API endpoint path (e.g., "/api/v1/auth/me")
+            extra_headers: Optional additional headers
+            **kwargs: httpx request parameters plus retry= / cache= / compress= / coalesce= (see _send)
+
+        Returns:
+            httpx.Response: Response of the final attempt
+        """
+        response = self._send(method, endpoint, extra_headers, **kwargs)
+        capture.record(self._attach_to_allure, response, method)
+        return response
+
+    def _prepare_stream(self, method: str, endpoint: str, extra_headers: dict, kwargs: dict):
+        """(retry policy, url, endpoint template, token version, headers, httpx kwargs, raw body size)
+        for stream_audio()"""
+        policy = self._resolve_retry(kwargs.pop("retry", None))
+        kwargs.pop("cache", None)
+        kwargs.pop("coalesce", None)
+        kwargs, body_headers, raw_bytes = self._encode_body(kwargs)
+        url = self._build_url(endpoint)
+        version, headers = self._versioned_headers(extra_headers)
+        headers = {**headers, **body_headers}
+        template = endpoint_template(endpoint)
+        self._apply_timeout(template, kwargs)
+        return policy, url, template, version, headers, kwargs, raw_bytes
+
+    def _finish_stream(self, method: str, template: str, response: httpx.Response,
+                       scanner: AudioFieldScanner, raw_bytes: int = None) -> StreamedAudio:
+        """Record timings and Allure capture for a fully consumed stream"""
+        metrics.observe(self.role, method, template, response, raw_bytes)
+        streamed = finish_stream(response, scanner)
+        capture.record(partial(self._attach_streamed_to_allure, streamed), response, method)
+        return streamed
+
+    def stream_audio(self, method: str, endpoint: str, sinks=None, extra_headers: dict = None,
+                     **kwargs) -> StreamedAudio:
+        """
+        Send a request and stream base64 audio out of the JSON response
+
+        Each audioContent string is decoded chunk by chunk into the sinks
+        returned by sinks(index) - by default a sha256 HashSink and a WavProbe
+        (see utils.audio_stream, e.g. file_sinks() to also write it to disk) -
+        so long or concurrent TTS runs never hold the audio in memory.
+        Error responses (non-2xx) are small and read normally.
+
+        Args:
+            method: HTTP method (TTS inference is POST)
+            endpoint: API endpoint path (e.g., "/api/v1/tts/inference")
+            sinks: Callable(index) -> list of sinks for each audio field
+            extra_headers: Optional additional headers
+            **kwargs: httpx request parameters (json= dict or PreparedBody, params=, timeout=, ...) plus retry=, compress=
+
+        Returns:
+            StreamedAudio: .status_code, .data (JSON with audio summarized), .audio (sink results)
+        """
+        policy, url, template, version, headers, kwargs, raw_bytes = self._prepare_stream(
+            method, endpoint, extra_headers, kwargs
+        )
+
+        breaker = self.circuit_breakers.breaker(template)
+
+        def send(headers):
+            if self.rate_limiter:
+                self.rate_limiter.acquire(self.role, template)
+            request = self._client.build_request(method, url, headers=headers, **kwargs)
+            try:
+                return self._client.send(request, stream=True)
+            except httpx.TimeoutException as error:
+                self._record_timeout(template, error)
+                raise
+
+        response = self._call_with_reauth(policy, breaker, method, url, send, version, headers, extra_headers)
+        scanner = AudioFieldScanner(sinks or default_sinks)
+        try:
+            if response.is_success:
+                for chunk in response.iter_text(STREAM_CHUNK_SIZE):
+                    scanner.feed(chunk)
+            else:
+                response.read()
+                scanner.feed(response.text)
+        finally:
+            response.close()
+        return self._finish_stream(method, template, response, scanner, raw_bytes)
+
+    def batch(self, requests, max_concurrency: int = None, return_exceptions: bool = False) -> list:
+        """
+        Run independent requests concurrently over the pooled connection
+
+        Wall time becomes roughly the slowest request instead of the sum of
+        all of them. Every exchange is captured for Allure in request order,
+        from the calling (test) thread.
+
+        Args:
+            requests: Iterable of (method, endpoint) or (method, endpoint, kwargs);
+                      kwargs are those of request() incl. extra_headers=
+            max_concurrency: Requests in flight at once (defaults to HTTP_MAX_CONNECTIONS)
+            return_exceptions: Put transport errors in the result list instead of raising
+                               the first one (after all requests have finished)
+
+        Returns:
+            list: httpx.Response (or exception) per request, in input order
+        """
+        calls = [(item[0], item[1], dict(item[2]) if len(item) > 2 else {}) for item in requests]
+        if not calls:
+            return []
+        workers = min(len(calls), max_concurrency or http_settings.HTTP_MAX_CONNECTIONS)
+
+        def run(call):
+            method, endpoint, kwargs = call
+            try:
+                return self._send(method, endpoint, **kwargs)
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-batch") as executor:
+            results = list(executor.map(run, calls))
+        return self._record_batch(calls, results, return_exceptions)
+
+    def _record_batch(self, calls: list, results: list, return_exceptions: bool) -> list:
+        """Capture batch responses in order, then surface the first error if asked to"""
+        for (method, _, _), result in zip(calls, results):
+            if isinstance(result, httpx.Response):
+                capture.record(self._attach_to_allure, result, method)
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+
+    def get(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP GET request"""
+        return self.request("GET", endpoint, extra_headers, **kwargs)
+
+    def post(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP POST request"""
+        return self.request("POST", endpoint, extra_headers, **kwargs)
+
+    def patch(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP PATCH request"""
+        return self.request("PATCH", endpoint, extra_headers, **kwargs)
+
+    def delete(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP DELETE request"""
+        return self.request("DELETE", endpoint, extra_headers, **kwargs)
+
+    def put(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP PUT request"""
+        return self.request("PUT", endpoint, extra_headers, **kwargs)
+
+
+class AsyncClientMixin:
+    """
+    asyncio counterpart of BaseAPIClient's request methods
+
+    Mix in ahead of a concrete APIClient to reuse its _get_headers and
+    _attach_to_allure while sending over one pooled httpx.AsyncClient:
+
+        class AsyncAPIClient(AsyncClientMixin, APIClient): ...
+
+    The pool is bound to the event loop it is first used on, so create and
+    close async clients inside the same loop (e.g. a function-scoped
+    pytest-asyncio fixture using `async with`).
+    """
+
+    def _event_hooks(self) -> dict:
+        """Async event hooks (httpx.AsyncClient awaits them)"""
+        return {"request": [install_trace_async]}
+
+    def _cassette_transport(self):
+        """Async record/replay transport"""
+        if cassettes.offline:
+            return AsyncCassetteTransport(cassettes, self.role)
+        return AsyncCassetteTransport(
+            cassettes, self.role, httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+        )
+
+    def _open_client(self):
+        """Create the pooled httpx.AsyncClient owned by this client"""
+        return httpx.AsyncClient(**self._client_kwargs())
+
+    def close(self):
+        raise TypeError("Async API clients must be closed with 'await client.aclose()'")
+
+    async def prewarm(self, connections: int = 1, path: str = "/") -> float:
+        """asyncio version of prewarm(): concurrent HEAD requests on the event loop"""
+        connections = max(1, min(connections, self.limits.max_keepalive_connections or connections))
+        if self.http2:
+            connections = 1
+        url = self._build_url(path)
+        started = time.perf_counter()
+        await asyncio.gather(*(self._client.request("HEAD", url) for _ in range(connections)))
+        return time.perf_counter() - started
+
+    async def aclose(self):
+        """Close pooled connections"""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _ensure_logged_in(self):
+        """Run a lazy token manager's first login in a thread instead of blocking the event loop"""
+        if self.token_manager is not None and getattr(self.token_manager, "logged_in", True) is False:
+            await asyncio.to_thread(self.token_manager.get_token_snapshot)
+
+    async def _send(self, method: str, endpoint: str, extra_headers: dict = None, **kwargs):
+        """
+        Send a request over the pooled async connection (cache, rate limit, retries, timings)
+
+        Args:
+            method: HTTP method (GET, POST, ...)
+            endpoint: API endpoint path (e.g., "/api/v1/nmt/inference")
+            extra_headers: Optional additional headers
+            **kwargs: Additional httpx request parameters (json= dict or PreparedBody, params=, timeout=, ...)
+                      plus retry= (None: client policy, False: no retries, or a RetryPolicy)
+                      and cache= (None: designated catalog GETs, True: cache this GET,
+                      False: bypass the response cache)
+                      and compress= (None: client gzip_requests, True/False: override it)
+                      and coalesce= (False: never share an identical in-flight GET)
+
+        Returns:
+            httpx.Response: Response of the final attempt
+        """
+        await self._ensure_logged_in()
+        policy = self._resolve_retry(kwargs.pop("retry", None))
+        coalesce = kwargs.pop("coalesce", None)
+        kwargs, body_headers, raw_bytes = self._encode_body(kwargs)
+        url = self._build_url(endpoint)
+        version, headers = self._versioned_headers(extra_headers)
+        if body_headers:
+            headers = {**headers, **body_headers}
+        template = endpoint_template(endpoint)
+        self._apply_timeout(template, kwargs)
+
+        cache_key, entry = self._cache_lookup(
+            method, endpoint, kwargs.pop("cache", None), kwargs.get("params"), headers
+        )
+        if entry and self.response_cache.is_fresh(entry):
+            return self.response_cache.hit(entry)
+        if entry and entry.etag:
+            headers = {**headers, "If-None-Match": entry.etag}
+
+        breaker = self.circuit_breakers.breaker(template)
+
+        async def send(headers):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(self.role, template)
+            try:
+                response = await self._client.request(method, url, headers=headers, **kwargs)
+            except httpx.TimeoutException as error:
+                self._record_timeout(template, error)
+                raise
+            metrics.observe(self.role, method, template, response, raw_bytes)
+            return response
+
+        async def fetch():
+            response = await self._call_with_reauth(policy, breaker, method, url, send, version, headers, extra_headers)
+            return self._cache_store(cache_key, entry, method, endpoint, response)
+
+        flight_key = self._flight_key(method, url, headers, kwargs, coalesce)
+        if flight_key:
+            return await self.single_flight.do_async(flight_key, fetch)
+        return await fetch()
+
+    async def _call_with_reauth(self, policy: RetryPolicy, breaker, method: str, url: str, send, version,
+                                headers, extra_headers: dict) -> httpx.Response:
+        """asyncio version of _call_with_reauth(); send is a coroutine function taking the headers"""
+        breaker.before_request()
+        try:
+            response = await policy.call_async(method, url, lambda: send(headers))
+            if self._token_expired(response, version, extra_headers):
+                snapshot = await asyncio.to_thread(self.token_manager.refresh_after_401, version)
+                if snapshot is not None:
+                    await response.aread()
+                    fresh_headers = self._replay_headers(headers, snapshot[0], extra_headers)
+                    response = await policy.call_async(method, url, lambda: send(fresh_headers))
+        except httpx.RequestError as error:
+            breaker.record_error(error)
+            raise
+        except BaseException:
+            breaker.abandon_probe()
+            raise
+        breaker.record_response(response)
+        return response
+
+    async def request(self, method: str, endpoint: str, extra_headers: dict = None, **kwargs):
+        """
+        Send a request over the pooled async connection and capture it for Allure
+
+        Args:
+            method: HTTP method (GET, POST, ...)
+            endpoint: API endpoint path (e.g., "/api/v1/nmt/inference")
+            extra_headers: Optional additional headers
+            **kwargs: httpx request parameters plus retry= / cache= / compress= / coalesce= (see _send)
+
+        Returns:
+            httpx.Response: Response of the final attempt
+        """
+        response = await self._send(method, endpoint, extra_headers, **kwargs)
+        capture.record(self._attach_to_allure, response, method)
+        return response
+
+    async def stream_audio(self, method: str, endpoint: str, sinks=None, extra_headers: dict = None,
+                           **kwargs) -> StreamedAudio:
+        """asyncio version of stream_audio()"""
+        await self._ensure_logged_in()
+        policy, url, template, version, headers, kwargs, raw_bytes = self._prepare_stream(
+            method, endpoint, extra_headers, kwargs
+        )
+
+        breaker = self.circuit_breakers.breaker(template)
+
+        async def send(headers):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(self.role, template)
+            request = self._client.build_request(method, url, headers=headers, **kwargs)
+            try:
+                return await self._client.send(request, stream=True)
+            except httpx.TimeoutException as error:
+                self._record_timeout(template, error)
+                raise
+
+        response = await self._call_with_reauth(policy, breaker, method, url, send, version, headers, extra_headers)
+        scanner = AudioFieldScanner(sinks or default_sinks)
+        try:
+            if response.is_success:
+                async for chunk in response.aiter_text(STREAM_CHUNK_SIZE):
+                    scanner.feed(chunk)
+            else:
+                await response.aread()
+                scanner.feed(response.text)
+        finally:
+            await response.aclose()
+        return self._finish_stream(method, template, response, scanner, raw_bytes)
+
+    async def batch(self, requests, max_concurrency: int = None, return_exceptions: bool = False) -> list:
+        """asyncio version of batch(): gather under a semaphore capping requests in flight"""
+        calls = [(item[0], item[1], dict(item[2]) if len(item) > 2 else {}) for item in requests]
+        if not calls:
+            return []
+        semaphore = asyncio.Semaphore(min(len(calls), max_concurrency or http_settings.HTTP_MAX_CONNECTIONS))
+
+        async def run(call):
+            method, endpoint, kwargs = call
+            async with semaphore:
+                try:
+                    return await self._send(method, endpoint, **kwargs)
+                except Exception as error:
+                    return error
+
+        results = await asyncio.gather(*(run(call) for call in calls))
+        return self._record_batch(calls, results, return_exceptions)
+
+    async def get(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP GET request"""
+        return await self.request("GET", endpoint, extra_headers, **kwargs)
+
+    async def post(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP POST request"""
+        return await self.request("POST", endpoint, extra_headers, **kwargs)
+
+    async def patch(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP PATCH request"""
+        return await self.request("PATCH", endpoint, extra_headers, **kwargs)
+
+    async def delete(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP DELETE request"""
+        return await self.request("DELETE", endpoint, extra_headers, **kwargs)
+
+    async def put(self, endpoint: str, extra_headers: dict = None, **kwargs):
+        """HTTP PUT request"""
+        return await self.request("PUT", endpoint, extra_headers, **kwargs)
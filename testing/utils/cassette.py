@@ -0,0 +1,279 @@
+"""
+Record / replay cassettes for APIClient traffic
+
+HTTP_CASSETTE_MODE=record sends every APIClient request to the platform as
+usual and also saves the exchange, per test, to a gzip-compressed JSON
+cassette under HTTP_CASSETTE_DIR. HTTP_CASSETTE_MODE=replay serves those
+cassettes instead, with no network at all, so assertions in test_api_v2/ can
+be iterated on in seconds and the harness' own overhead can be measured
+without platform latency.
+
+- exchanges are keyed by (role, method, path?sorted query, body hash); the
+  bearer token, host and request headers are never stored, and JSON bodies are
+  hashed in canonical form (gzip request bodies decompressed first)
+- a key requested several times in one test replays its recorded responses in
+  order, then repeats the last one
+- a request whose body or query changed since recording (timestamps in names)
+  falls back to the same (role, method, path); a request the current test never
+  recorded (a fixture set up by another test) falls back to every cassette
+- HTTP_CASSETTE_LATENCY scales the recorded response time that replay sleeps
+  for (0: as fast as possible, 1: as recorded)
+
+Only traffic through APIClient is recorded (record mode reads streamed bodies
+whole); in replay mode TokenManager skips login and refresh. Tests that call
+httpx directly still need the network.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+import httpx
+from config.http_settings import http_settings
+
+# Response headers not worth storing (or replaying)
+DROPPED_HEADERS = frozenset({"set-cookie", "date", "server", "connection", "keep-alive", "transfer-encoding"})
+
+
+class CassetteMissError(LookupError):
+    """Replay mode found no recorded exchange for a request"""
+
+
+def _body_hash(request: httpx.Request) -> str:
+    """sha256 of the request body, JSON in canonical form"""
+    content = request.read()
+    if not content:
+        return ""
+    if request.headers.get("Content-Encoding") == "gzip":
+        content = gzip.decompress(content)
+    content_type = request.headers.get("Content-Type", "")
+    if "json" in content_type:
+        try:
+            content = json.dumps(json.loads(content), sort_keys=True, separators=(",", ":")).encode()
+        except ValueError:
+            pass
+    elif "multipart/" in content_type and "boundary=" in content_type:
+        boundary = content_type.split("boundary=", 1)[1].encode()
+        content = content.replace(boundary, b"BOUNDARY")
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def request_keys(role: str, request: httpx.Request) -> tuple:
+    """(exact key, loose key) of a request; the loose key ignores query and body"""
+    path = request.url.path
+    query = "&".join(sorted(request.url.query.decode().split("&"))) if request.url.query else ""
+    exact = f"{role} {request.method} {path}?{query} {_body_hash(request)}"
+    loose = f"{role} {request.method} {path}"
+    return exact, loose
+
+
+def cassette_name(nodeid: str) -> str:
+    """File name for a test's cassette ("test_api_v2/test_x.py::T::test[a]" -> safe name)"""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_") + ".json.gz"
+
+
+class CassetteStore:
+    """Recorded exchanges of the session, one cassette file per test"""
+
+    def __init__(self, mode: str, directory: str, latency: float = 0.0):
+        """
+        Args:
+            mode: "record" or "replay"
+            directory: Where cassettes are written / read
+            latency: Replay sleeps latency x the recorded response time
+        """
+        self.mode = mode
+        self.directory = Path(directory)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._test = None
+        self._recorded = []
+        # replay: {key: [exchange, ...]} for the current test and for all cassettes
+        self._current = {}
+        self._fallback = None
+        self._served = {}
+        self.stats = {"recorded": 0, "replayed": 0, "loose": 0, "fallback": 0, "misses": 0}
+
+    @classmethod
+    def from_settings(cls):
+        """Store from http_settings, or None when HTTP_CASSETTE_MODE is off"""
+        mode = http_settings.HTTP_CASSETTE_MODE
+        if mode not in ("record", "replay"):
+            return None
+        return cls(mode, http_settings.HTTP_CASSETTE_DIR, http_settings.HTTP_CASSETTE_LATENCY)
+
+    @property
+    def offline(self) -> bool:
+        """True when no request may reach the network"""
+        return self.mode == "replay"
+
+    def start_test(self, nodeid: str):
+        """Switch to a test's cassette (called by the conftest hooks)"""
+        with self._lock:
+            self._test = nodeid
+            self._recorded = []
+            self._served = {}
+            self._current = self._index(self._load(self.directory / cassette_name(nodeid))) if self.offline else {}
+
+    def finish_test(self):
+        """Write the current test's cassette (record mode)"""
+        with self._lock:
+            test, exchanges = self._test, self._recorded
+            self._test, self._recorded = None, []
+        if self.mode != "record" or test is None or not exchanges:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        content = json.dumps({"test": test, "exchanges": exchanges}, separators=(",", ":")).encode()
+        (self.directory / cassette_name(test)).write_bytes(gzip.compress(content, mtime=0))
+
+    @staticmethod
+    def _load(path: Path) -> list:
+        try:
+            return json.loads(gzip.decompress(path.read_bytes()))["exchanges"]
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _index(exchanges: list) -> dict:
+        index = {}
+        for exchange in exchanges:
+            index.setdefault(exchange["key"], []).append(exchange)
+            index.setdefault(exchange["loose"], []).append(exchange)
+        return index
+
+    def record(self, role: str, request: httpx.Request, response: httpx.Response, content: bytes, elapsed: float):
+        """Add one exchange to the current test's cassette"""
+        exact, loose = request_keys(role, request)
+        exchange = {
+            "key": exact,
+            "loose": loose,
+            "status": response.status_code,
+            "headers": [[name, value] for name, value in response.headers.multi_items()
+                        if name.lower() not in DROPPED_HEADERS],
+            "elapsed": round(elapsed, 4),
+        }
+        try:
+            exchange["text"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            exchange["base64"] = base64.b64encode(content).decode("ascii")
+        with self._lock:
+            self._recorded.append(exchange)
+            self.stats["recorded"] += 1
+
+    def lookup(self, role: str, request: httpx.Request) -> dict:
+        """Recorded exchange for a request (raises CassetteMissError)"""
+        exact, loose = request_keys(role, request)
+        with self._lock:
+            for key, index, stat in ((exact, lambda: self._current, None), (loose, lambda: self._current, "loose"),
+                                     (exact, self._all, "fallback"), (loose, self._all, "fallback")):
+                exchanges = index().get(key)
+                if exchanges:
+                    served = self._served.get((stat, key), 0)
+                    self._served[(stat, key)] = served + 1
+                    self.stats["replayed"] += 1
+                    if stat:
+                        self.stats[stat] += 1
+                    return exchanges[min(served, len(exchanges) - 1)]
+            self.stats["misses"] += 1
+        raise CassetteMissError(f"No recorded exchange for {exact} (test: {self._test})")
+
+    def _all(self) -> dict:
+        """Index of every cassette in the directory (loaded on first miss)"""
+        if self._fallback is None:
+            self._fallback = self._index([
+                exchange for path in sorted(self.directory.glob("*.json.gz")) for exchange in self._load(path)
+            ])
+        return self._fallback
+
+    def replay(self, role: str, request: httpx.Request) -> tuple:
+        """(httpx.Response, seconds to sleep) for a request"""
+        exchange = self.lookup(role, request)
+        content = exchange["text"].encode("utf-8") if "text" in exchange else base64.b64decode(exchange["base64"])
+        response = httpx.Response(
+            exchange["status"],
+            headers=[(name, value) for name, value in exchange["headers"] if name.lower() != "content-length"],
+            content=content,
+            request=request,
+        )
+        # content= sets Content-Length; keep the recorded Content-Encoding so wire/raw byte metrics match
+        return response, exchange["elapsed"] * self.latency
+
+
+def _record_response(response: httpx.Response, content: bytes) -> httpx.Response:
+    """Rebuild a response around its already-read raw body"""
+    return httpx.Response(
+        response.status_code,
+        headers=response.headers,
+        content=content,
+        extensions=response.extensions,
+    )
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """httpx transport recording to / replaying from a CassetteStore for one client role"""
+
+    def __init__(self, store: CassetteStore, role: str, transport: httpx.BaseTransport = None):
+        """
+        Args:
+            store: Session cassette store
+            role: Role label of the owning client (part of every key)
+            transport: Real transport used in record mode
+        """
+        self.store = store
+        self.role = role
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.store.offline:
+            response, delay = self.store.replay(self.role, request)
+            if delay:
+                time.sleep(delay)
+            return response
+        started = time.perf_counter()
+        response = self.transport.handle_request(request)
+        try:
+            content = b"".join(response.stream)
+        finally:
+            response.close()
+        self.store.record(self.role, request, response, content, time.perf_counter() - started)
+        return _record_response(response, content)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """Async variant of CassetteTransport for httpx.AsyncClient"""
+
+    def __init__(self, store: CassetteStore, role: str, transport: httpx.AsyncBaseTransport = None):
+        self.store = store
+        self.role = role
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.store.offline:
+            response, delay = self.store.replay(self.role, request)
+            if delay:
+                await asyncio.sleep(delay)
+            return response
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        self.store.record(self.role, request, response, content, time.perf_counter() - started)
+        return _record_response(response, content)
+
+    async def aclose(self):
+        if self.transport is not None:
+            await self.transport.aclose()
+
+
+cassettes = CassetteStore.from_settings()
@@ -0,0 +1,183 @@
+"""
+Per-endpoint circuit breaker
+
+When a backend (OCR, speaker diarization, ...) is down, every test hitting it
+waits out REQUEST_TIMEOUT and the session stalls for minutes. All APIClients
+share one breaker per endpoint template (off unless CIRCUIT_BREAKER_THRESHOLD
+is set):
+
+- closed:    requests flow; N consecutive failed calls (transport errors,
+             timeouts, CIRCUIT_BREAKER_STATUSES; one outcome per call, after
+             its retries) open the circuit
+- open:      requests fail at once with CircuitOpenError until the cool-down
+             has passed (the conftest hooks turn that into a skip when
+             CIRCUIT_BREAKER_MODE=skip)
+- half-open: one probe request is let through; success closes the circuit,
+             failure re-opens it for another cool-down
+"""
+
+import threading
+import time
+import httpx
+from config.http_settings import http_settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to an endpoint whose circuit is open"""
+
+    def __init__(self, endpoint: str, failures: int, retry_in: float, last_failure: str):
+        self.endpoint = endpoint
+        self.failures = failures
+        self.retry_in = retry_in
+        self.last_failure = last_failure
+        super().__init__(
+            f"Circuit open for {endpoint}: {failures} consecutive failures "
+            f"(last: {last_failure}); not sending for another {retry_in:.1f}s"
+        )
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one endpoint template"""
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, cooldown: float = 60.0,
+                 failure_statuses=(502, 503, 504)):
+        """
+        Args:
+            endpoint: Endpoint template this breaker guards
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open before a half-open probe
+            failure_statuses: Response statuses counted as failures
+        """
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failure_statuses = frozenset(failure_statuses)
+        self.state = CLOSED
+        self.failures = 0
+        self.last_failure = None
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.stats = {"opened": 0, "short_circuited": 0}
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self.cooldown - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self.stats["short_circuited"] += 1
+            raise CircuitOpenError(self.endpoint, self.failures, max(0.0, remaining), self.last_failure)
+
+    def record_response(self, response: httpx.Response):
+        """Count a response: failure statuses trip the breaker, anything else means the service is up"""
+        if response.status_code in self.failure_statuses:
+            self._failure(f"HTTP {response.status_code}")
+        else:
+            self._success()
+
+    def record_error(self, error: Exception):
+        """Count a transport error (connect error, timeout, dropped connection)"""
+        self._failure(f"{type(error).__name__}: {error}")
+
+    def abandon_probe(self):
+        """Release a half-open probe that ended without an outcome (cancelled, or failed before sending)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def _failure(self, reason: str):
+        with self._lock:
+            self.failures += 1
+            self.last_failure = reason
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.stats["opened"] += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class _NoBreaker:
+    """Stand-in used when circuit breaking is disabled"""
+
+    def before_request(self):
+        pass
+
+    def record_response(self, response):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def abandon_probe(self):
+        pass
+
+
+NO_BREAKER = _NoBreaker()
+
+
+class CircuitBreakerRegistry:
+    """One CircuitBreaker per endpoint template, shared by every client"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0,
+                 failure_statuses=(502, 503, 504), mode: str = "fail"):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a circuit (0 disables breaking)
+            cooldown: Seconds a circuit stays open before a half-open probe
+            failure_statuses: Response statuses counted as failures
+            mode: "fail" (CircuitOpenError fails the test) or "skip" (the test is skipped)
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failure_statuses = tuple(failure_statuses)
+        self.mode = mode
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        """Registry configured from http_settings CIRCUIT_BREAKER_*"""
+        return cls(
+            failure_threshold=http_settings.CIRCUIT_BREAKER_THRESHOLD,
+            cooldown=http_settings.CIRCUIT_BREAKER_COOLDOWN,
+            failure_statuses=http_settings.CIRCUIT_BREAKER_STATUSES,
+            mode=http_settings.CIRCUIT_BREAKER_MODE,
+        )
+
+    def breaker(self, endpoint: str):
+        """Breaker for an endpoint template (NO_BREAKER when disabled)"""
+        if self.failure_threshold <= 0:
+            return NO_BREAKER
+        try:
+            return self._breakers[endpoint]
+        except KeyError:
+            pass
+        with self._lock:
+            return self._breakers.setdefault(
+                endpoint,
+                CircuitBreaker(endpoint, self.failure_threshold, self.cooldown, self.failure_statuses),
+            )
+
+    def opened(self) -> dict:
+        """{endpoint: breaker} for every circuit that opened at least once"""
+        with self._lock:
+            return {endpoint: breaker for endpoint, breaker in self._breakers.items() if breaker.stats["opened"]}
+
+
+shared_circuit_breakers = CircuitBreakerRegistry.from_settings()
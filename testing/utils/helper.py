@@ -1,4 +1,5 @@
 import base64
+import re
 
 #audio to srt converter
 def audio_to_base64(file_path: str) -> str:
@@ -10,4 +11,43 @@ def audio_to_base64(file_path: str) -> str:
 def image_to_base64(file_path: str) -> str:
     """Convert image file to base64"""
     with open(file_path, 'rb') as image_file:
-        return base64.b64encode(image_file.read()).decode('utf-8')
\ No newline at end of file
+        return base64.b64encode(image_file.read()).decode('utf-8')
+
+_ID_SEGMENT_RE = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{24,})$"
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Collapse IDs in an endpoint path so metrics/limits group by route
+
+    e.g. "/api/v1/auth/users/42?x=1" -> "/api/v1/auth/users/{id}"
+    """
+    path = endpoint.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT_RE.match(segment) else segment for segment in path.split("/"))
+
+
+_CLIENT_FIXTURE_RE = re.compile(r"^(?P<role>.+?)(?:_async)?_client(?:_|$)")
+
+
+def token_managers_needed(item, roles) -> set:
+    """
+    <role>_token_manager fixtures a collected test will use
+
+    Besides the test's fixture closure (item.fixturenames) this counts role
+    clients a test pulls in through request.getfixturevalue() with a
+    parametrized fixture name (e.g. role_client_fixture="admin_client_with_valid_api_key"):
+    client fixtures are named <role>_client[_...] and use <role>_token_manager.
+
+    Args:
+        item: Collected test item
+        roles: Role names that have a token manager fixture
+    """
+    needed = {name for name in item.fixturenames if name.endswith("_token_manager")}
+    callspec = getattr(item, "callspec", None)
+    for value in (callspec.params.values() if callspec is not None else ()):
+        match = _CLIENT_FIXTURE_RE.match(value) if isinstance(value, str) else None
+        if match and match["role"] in roles:
+            needed.add(f"{match['role']}_token_manager")
+    return needed
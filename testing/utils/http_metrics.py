@@ -0,0 +1,187 @@
+"""
+Per-phase request timing for APIClient
+
+Allure's test duration mixes fixture setup, login and assertions with the
+actual network latency. Every APIClient request instead gets an httpcore
+`trace` extension installed by an httpx request event hook; the trace marks
+when TCP connect, TLS, request headers, response headers and response body
+start and finish. The resulting phases and byte counts (on the wire and
+uncompressed, for both directions) are stored per
+(role, method, endpoint template) for the session summary, and per test for
+an Allure attachment.
+"""
+
+import threading
+import time
+import httpx
+
+PHASES = ("connect", "tls", "ttfb", "download", "total")
+# *_bytes: on the wire; *_bytes_raw: before Content-Encoding / after decoding
+BYTE_FIELDS = ("request_bytes", "request_bytes_raw", "response_bytes", "response_bytes_raw")
+
+
+class RequestTrace:
+    """httpcore trace callback recording a perf_counter timestamp per event"""
+
+    def __init__(self):
+        self.marks = {}
+
+    def __call__(self, event_name: str, info: dict):
+        # "http11.receive_response_headers.started" -> "receive_response_headers.started"
+        self.marks[event_name.split(".", 1)[1]] = time.perf_counter()
+
+    def span(self, name: str) -> float:
+        """Seconds between <name>.started and <name>.complete (0 if not seen)"""
+        started = self.marks.get(f"{name}.started")
+        completed = self.marks.get(f"{name}.complete")
+        if started is None or completed is None:
+            return 0.0
+        return completed - started
+
+    def phases(self) -> dict:
+        """connect / tls / ttfb / download seconds for this request"""
+        ttfb_start = self.marks.get("send_request_headers.started")
+        ttfb_end = self.marks.get("receive_response_headers.complete")
+        return {
+            "connect": self.span("connect_tcp"),
+            "tls": self.span("start_tls"),
+            "ttfb": (ttfb_end - ttfb_start) if ttfb_start and ttfb_end else 0.0,
+            "download": self.span("receive_response_body"),
+        }
+
+
+class AsyncRequestTrace(RequestTrace):
+    """Async trace callback for httpx.AsyncClient (httpcore awaits it)"""
+
+    async def __call__(self, event_name: str, info: dict):
+        RequestTrace.__call__(self, event_name, info)
+
+
+def install_trace(request: httpx.Request):
+    """httpx 'request' event hook: attach a fresh trace to the request"""
+    request.extensions["trace"] = RequestTrace()
+
+
+async def install_trace_async(request: httpx.Request):
+    """Async 'request' event hook for httpx.AsyncClient"""
+    request.extensions["trace"] = AsyncRequestTrace()
+
+
+def _request_bytes(request: httpx.Request) -> int:
+    try:
+        return len(request.content)
+    except httpx.RequestNotRead:
+        return 0
+
+
+def _response_bytes(response: httpx.Response) -> int:
+    """Decoded body size (wire size for streamed bodies that were never buffered)"""
+    try:
+        return len(response.content)
+    except httpx.ResponseNotRead:
+        return response.num_bytes_downloaded
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class MetricsStore:
+    """Thread-safe in-process store of request timing samples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._test_samples = []
+
+    def observe(self, role: str, method: str, endpoint: str, response: httpx.Response,
+                raw_request_bytes: int = None) -> dict:
+        """
+        Record one completed request
+
+        Args:
+            role: Client role label
+            method: HTTP method
+            endpoint: Endpoint template (IDs collapsed)
+            response: Response whose request carries a RequestTrace
+            raw_request_bytes: Body size before Content-Encoding (defaults to the sent size)
+
+        Returns:
+            dict: The sample that was stored
+        """
+        trace = response.request.extensions.get("trace")
+        sample = trace.phases() if isinstance(trace, RequestTrace) else dict.fromkeys(PHASES[:-1], 0.0)
+        try:
+            sample["total"] = response.elapsed.total_seconds()
+        except RuntimeError:
+            # Streaming response not closed yet - fall back to the traced phases
+            sample["total"] = sum(sample.values())
+        sample["request_bytes"] = _request_bytes(response.request)
+        sample["request_bytes_raw"] = sample["request_bytes"] if raw_request_bytes is None else raw_request_bytes
+        sample["request_encoding"] = response.request.headers.get("Content-Encoding")
+        sample["response_bytes"] = response.num_bytes_downloaded
+        sample["response_bytes_raw"] = _response_bytes(response)
+        sample["response_encoding"] = response.headers.get("Content-Encoding")
+        sample["status"] = response.status_code
+
+        key = (role, method, endpoint)
+        with self._lock:
+            self._samples.setdefault(key, []).append(sample)
+            self._test_samples.append((key, sample))
+        return sample
+
+    def finish_test(self) -> list:
+        """Return and clear the samples recorded during the current test"""
+        with self._lock:
+            samples, self._test_samples = self._test_samples, []
+            return samples
+
+    def summary(self) -> dict:
+        """
+        Aggregate per (role, method, endpoint)
+
+        Returns:
+            dict: {key: {"count", "<byte field>" totals, "encodings",
+                         "<phase>_mean", "<phase>_p50", "<phase>_p95", ...}}
+        """
+        with self._lock:
+            items = {key: list(samples) for key, samples in self._samples.items()}
+        summary = {}
+        for key, samples in items.items():
+            row = {"count": len(samples)}
+            for field in BYTE_FIELDS:
+                row[field] = sum(sample[field] for sample in samples)
+            row["encodings"] = sorted({
+                f"{direction}:{sample[f'{direction}_encoding']}"
+                for sample in samples for direction in ("request", "response")
+                if sample[f"{direction}_encoding"]
+            })
+            for phase in PHASES:
+                values = [sample[phase] for sample in samples]
+                row[f"{phase}_mean"] = sum(values) / len(values)
+                row[f"{phase}_p50"] = percentile(values, 0.5)
+                row[f"{phase}_p95"] = percentile(values, 0.95)
+            summary[key] = row
+        return summary
+
+
+def format_samples(samples: list) -> str:
+    """Plain-text table of (key, sample) pairs for an Allure attachment"""
+    lines = [
+        f"{'role':<14} {'method':<6} {'endpoint':<48} {'status':>6} "
+        f"{'connect':>8} {'tls':>8} {'ttfb':>8} {'download':>8} {'total':>8} "
+        f"{'req B':>9} {'req raw B':>9} {'resp B':>9} {'resp raw B':>10}"
+    ]
+    for (role, method, endpoint), sample in samples:
+        lines.append(
+            f"{role:<14} {method:<6} {endpoint:<48} {sample['status']:>6} "
+            + " ".join(f"{sample[phase] * 1000:>6.1f}ms" for phase in PHASES)
+            + f" {sample['request_bytes']:>9} {sample['request_bytes_raw']:>9}"
+            + f" {sample['response_bytes']:>9} {sample['response_bytes_raw']:>10}"
+        )
+    return "\n".join(lines)
+
+
+metrics = MetricsStore()
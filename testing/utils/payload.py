@@ -0,0 +1,92 @@
+"""
+Pre-serialized JSON request bodies
+
+ASR, diarization, OCR and pipeline payloads carry hundreds of KB of base64.
+Passed as json=, httpx re-serializes them on every send: once per role, per
+parametrized case and per retry. A PreparedBody is encoded once, byte for
+byte as httpx would encode json=, and the clients send its bytes as-is:
+
+    body = ServiceWithPayloads.prepared_from_sample("asr")
+    for client in clients:
+        client.post(endpoint, json=body)
+
+Bodies above a threshold can also be sent gzip-compressed
+(Content-Encoding: gzip); a PreparedBody keeps its compressed form too.
+"""
+
+import gzip
+import json
+
+
+def encode_json(payload) -> bytes:
+    """Compact UTF-8 JSON, exactly what httpx produces for json="""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+class PreparedBody:
+    """A JSON payload encoded once and reused for every send"""
+
+    __slots__ = ("content", "_gzipped")
+
+    def __init__(self, payload):
+        """
+        Args:
+            payload: JSON-serializable request body (dict / list)
+        """
+        self.content = encode_json(payload)
+        self._gzipped = {}
+
+    def gzipped(self, level: int = 6) -> bytes:
+        """gzip-compressed body (compressed once per level)"""
+        if level not in self._gzipped:
+            self._gzipped[level] = gzip_bytes(self.content, level)
+        return self._gzipped[level]
+
+    def __len__(self):
+        return len(self.content)
+
+    def json(self):
+        """Decode the body back into Python objects"""
+        return json.loads(self.content)
+
+
+def gzip_bytes(content: bytes, level: int = 6) -> bytes:
+    """Deterministic gzip (mtime=0) so identical bodies compress identically"""
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def encode_request_body(kwargs: dict, compress: bool = False, min_bytes: int = 16384, level: int = 6):
+    """
+    Resolve the request body once, before any (re)send
+
+    json=PreparedBody becomes content=<bytes>; with compress, JSON/bytes bodies
+    of at least min_bytes are gzipped and need a Content-Encoding header.
+
+    Args:
+        kwargs: httpx request kwargs (not modified)
+        compress: gzip bodies at or above min_bytes
+        min_bytes: Size threshold for compression
+        level: gzip compression level
+
+    Returns:
+        tuple: (kwargs, extra headers dict, uncompressed body size or None)
+    """
+    body = kwargs.get("json")
+    if isinstance(body, PreparedBody):
+        content = body.content
+    elif compress and body is not None:
+        content = encode_json(body)
+    elif isinstance(kwargs.get("content"), bytes):
+        content = kwargs["content"]
+    else:
+        return kwargs, {}, None
+
+    kwargs = dict(kwargs)
+    kwargs.pop("json", None)
+    headers = {}
+    if compress and len(content) >= min_bytes:
+        kwargs["content"] = body.gzipped(level) if isinstance(body, PreparedBody) else gzip_bytes(content, level)
+        headers["Content-Encoding"] = "gzip"
+    else:
+        kwargs["content"] = content
+    return kwargs, headers, len(content)
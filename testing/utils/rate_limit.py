@@ -0,0 +1,150 @@
+"""
+Client-side token-bucket rate limiting keyed by role and endpoint
+
+Lets inference suites run as fast as the platform's guest/user quotas allow,
+but no faster, and makes throughput numbers reproducible. One RateLimiter is
+shared by every APIClient in the session; buckets are created lazily per
+(role, endpoint template) and are safe to use from threads and asyncio tasks
+alike - a caller reserves its slot under a lock and sleeps outside it.
+"""
+
+import asyncio
+import threading
+import time
+from config.http_settings import http_settings
+
+
+class TokenBucket:
+    """Token bucket refilling at `rate` tokens/sec up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Args:
+            rate: Sustained requests per second
+            capacity: Burst size (defaults to max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _reserve(self) -> float:
+        """Take one token (possibly going into debt) and return how long to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            self.waited_seconds += wait
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns seconds waited"""
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Await until a token is available; returns seconds waited"""
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def parse_rules(spec: str) -> dict:
+    """
+    Parse RATE_LIMIT_RULES ("<endpoint>=<rps>[:<burst>],...")
+
+    An rps of 0 leaves the endpoint unlimited (as RATE_LIMIT_DEFAULT_RPS=0 does).
+    Raises ValueError naming the entry when one is malformed.
+
+    Returns:
+        dict: {endpoint: (rps, burst or None)}
+    """
+    rules = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        endpoint, separator, limit = item.rpartition("=")
+        endpoint = endpoint.strip()
+        if not separator or not endpoint:
+            # An empty endpoint would be a prefix of every endpoint and throttle the whole suite
+            raise ValueError(f"RATE_LIMIT_RULES: expected <endpoint>=<rps>[:<burst>], got {item!r}")
+        rate, _, burst = limit.partition(":")
+        try:
+            rate, burst = float(rate), float(burst) if burst else None
+        except ValueError:
+            raise ValueError(f"RATE_LIMIT_RULES: invalid rate or burst in {item!r}") from None
+        if rate < 0:
+            raise ValueError(f"RATE_LIMIT_RULES: negative rate for {endpoint!r}")
+        rules[endpoint] = (rate, burst)
+    return rules
+
+
+class RateLimiter:
+    """Buckets per (role, endpoint template), configured by default rate + endpoint rules"""
+
+    def __init__(self, default_rate: float = 0, rules: dict = None):
+        """
+        Args:
+            default_rate: Requests/sec for endpoints without a rule (0 = unlimited)
+            rules: {endpoint prefix: (rps, burst)} overrides, longest prefix wins (0 rps = unlimited)
+        """
+        self.default_rate = default_rate
+        self.rules = dict(sorted((rules or {}).items(), key=lambda item: len(item[0]), reverse=True))
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        """Shared limiter from http_settings, or None when no limits are configured"""
+        rules = parse_rules(http_settings.RATE_LIMIT_RULES)
+        if not http_settings.RATE_LIMIT_DEFAULT_RPS and not rules:
+            return None
+        return cls(http_settings.RATE_LIMIT_DEFAULT_RPS, rules)
+
+    def _limit_for(self, endpoint: str):
+        for prefix, limit in self.rules.items():
+            if endpoint.startswith(prefix):
+                return limit if limit[0] > 0 else None
+        if self.default_rate:
+            return self.default_rate, None
+        return None
+
+    def bucket(self, role: str, endpoint: str):
+        """Bucket for a role + endpoint template, or None if it is unlimited"""
+        key = (role, endpoint)
+        try:
+            return self._buckets[key]
+        except KeyError:
+            pass
+        limit = self._limit_for(endpoint)
+        with self._lock:
+            return self._buckets.setdefault(key, TokenBucket(*limit) if limit else None)
+
+    def acquire(self, role: str, endpoint: str) -> float:
+        """Wait for a slot for this role + endpoint; returns seconds waited"""
+        bucket = self.bucket(role, endpoint)
+        return bucket.acquire() if bucket else 0.0
+
+    async def acquire_async(self, role: str, endpoint: str) -> float:
+        """asyncio version of acquire()"""
+        bucket = self.bucket(role, endpoint)
+        return await bucket.acquire_async() if bucket else 0.0
+
+    def stats(self) -> dict:
+        """{(role, endpoint): (requests, seconds waited, configured rps)}"""
+        with self._lock:
+            return {
+                key: (bucket.acquired, bucket.waited_seconds, bucket.rate)
+                for key, bucket in self._buckets.items()
+                if bucket is not None
+            }
+
+
+shared_rate_limiter = RateLimiter.from_settings()
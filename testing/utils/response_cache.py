@@ -0,0 +1,174 @@
+"""
+TTL + ETag response cache for idempotent catalog GETs
+
+Many tests re-fetch slowly-changing catalogs (roles, permissions, the model
+list, tenants) only to set up preconditions. When RESPONSE_CACHE_ENABLED is
+set, APIClient serves those GETs from one session-wide LRU cache:
+
+- entries are keyed by (role, credentials, endpoint incl. query) - clients
+  with different tokens or API keys (e.g. a valid vs an expired API key)
+  never share data
+- a fresh entry (younger than RESPONSE_CACHE_TTL) is returned without a request
+- an expired entry with an ETag is revalidated with If-None-Match; a 304 keeps
+  the cached response and restarts its TTL
+- any POST/PUT/PATCH/DELETE drops every entry of the same service
+  (e.g. /api/v1/auth/...) for all roles
+
+Tests that exercise the endpoint itself pass cache=False to bypass it.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import httpx
+from config.http_settings import http_settings
+
+CACHEABLE_METHODS = frozenset({"GET"})
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Request headers that identify the caller (part of every cache key)
+CREDENTIAL_HEADERS = ("authorization", "x-api-key")
+
+
+def service_prefix(endpoint: str) -> str:
+    """Service part of an endpoint ("/api/v1/auth/roles/list" -> "/api/v1/auth")"""
+    path = endpoint.split("?", 1)[0]
+    return "/".join(path.split("/")[:4])
+
+
+def credentials_hash(headers) -> str:
+    """Digest of the credential headers of a request ("" when it sends none)"""
+    credentials = sorted(
+        (name.lower(), value) for name, value in headers.items() if name.lower() in CREDENTIAL_HEADERS
+    )
+    if not credentials:
+        return ""
+    return hashlib.sha256(repr(credentials).encode()).hexdigest()[:16]
+
+
+class CacheEntry:
+    """One cached response plus its validator"""
+
+    __slots__ = ("response", "etag", "stored_at")
+
+    def __init__(self, response: httpx.Response):
+        self.response = response
+        self.etag = response.headers.get("ETag")
+        self.stored_at = time.monotonic()
+
+
+class ResponseCache:
+    """Thread-safe LRU of GET responses with a TTL and ETag revalidation"""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256, endpoints=()):
+        """
+        Args:
+            ttl: Seconds an entry is served without contacting the server
+            max_entries: LRU bound across all roles
+            endpoints: Endpoints cached by default (only when called without query params)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.endpoints = frozenset(endpoints)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "invalidated": 0}
+
+    @classmethod
+    def from_settings(cls):
+        """Shared cache from http_settings, or None when RESPONSE_CACHE_ENABLED is off"""
+        if not http_settings.RESPONSE_CACHE_ENABLED:
+            return None
+        return cls(http_settings.RESPONSE_CACHE_TTL, http_settings.RESPONSE_CACHE_MAX_ENTRIES, http_settings.RESPONSE_CACHE_ENDPOINTS)
+
+    def key_for(self, role: str, method: str, endpoint: str, params=None, use_cache=None, headers=None):
+        """
+        Cache key for a request, or None if it must not be cached
+
+        Args:
+            role: Client role label
+            method: HTTP method
+            endpoint: Endpoint path as passed to the client
+            params: httpx params= of the call
+            use_cache: None = designated endpoints without filters only,
+                       True = force caching of this GET, False = bypass
+            headers: Request headers; Authorization and X-API-Key are hashed into the key
+        """
+        if use_cache is False or method.upper() not in CACHEABLE_METHODS:
+            return None
+        if use_cache is None and (params or endpoint not in self.endpoints):
+            return None
+        return role, credentials_hash(headers or {}), str(httpx.URL(endpoint, params=params))
+
+    def get(self, key):
+        """Entry for key (fresh or stale), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.monotonic() - entry.stored_at < self.ttl
+
+    def hit(self, entry: CacheEntry) -> httpx.Response:
+        """Count and return a fresh entry's response"""
+        with self._lock:
+            self.stats["hits"] += 1
+        return entry.response
+
+    def update(self, key, response: httpx.Response, entry: CacheEntry = None) -> httpx.Response:
+        """
+        Store the outcome of a (possibly conditional) request
+
+        Returns:
+            httpx.Response: The cached response on 304, otherwise `response`
+        """
+        with self._lock:
+            if response.status_code == 304 and entry is not None:
+                entry.stored_at = time.monotonic()
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self.stats["revalidated"] += 1
+                return entry.response
+            self.stats["misses"] += 1
+            if response.status_code == 200:
+                self._entries[key] = CacheEntry(response)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.pop(key, None)
+            return response
+
+    def invalidate(self, endpoint: str = None) -> int:
+        """
+        Drop cached entries of the endpoint's service for every role
+
+        Args:
+            endpoint: Mutated endpoint; None clears the whole cache
+
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            if endpoint is None:
+                stale = list(self._entries)
+            else:
+                prefix = service_prefix(endpoint) + "/"
+                stale = [
+                    key for key in self._entries
+                    if f"{httpx.URL(key[-1]).path}/".startswith(prefix)
+                ]
+            for key in stale:
+                del self._entries[key]
+            self.stats["invalidated"] += len(stale)
+            return len(stale)
+
+    def mutated(self, method: str, endpoint: str):
+        """Invalidate the endpoint's service after a non-safe call"""
+        if method.upper() not in SAFE_METHODS:
+            self.invalidate(endpoint)
+
+
+shared_response_cache = ResponseCache.from_settings()
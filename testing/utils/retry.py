@@ -0,0 +1,224 @@
+"""
+Retry and backoff for transient platform errors
+
+Staging occasionally answers 429/502/503/504 or drops a connection. With
+HTTP_RETRY_MAX_ATTEMPTS > 1 (off by default), or a RetryPolicy passed as
+retry=, APIClient retries instead of failing the test:
+
+- idempotent methods (GET, PUT, DELETE, HEAD, OPTIONS) retry on the configured
+  statuses and on any transport error
+- non-idempotent methods (POST, PATCH) retry only on 429 and on errors raised
+  before the request reached the server (connect errors, pool timeouts)
+- exponential backoff with full jitter, Retry-After honoured when present
+- a total time budget per call
+
+Every retry is written to retry_log so the conftest hooks can tag
+retried-then-passed tests in Allure and attach their exchanges.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import httpx
+from config.http_settings import http_settings
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Statuses that mean "not processed" - safe to resend even for POST
+NOT_PROCESSED_STATUSES = frozenset({429})
+# Transport errors raised before the request was sent
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def parse_retry_after(value: str):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date)
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing/invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryLog:
+    """Thread-safe per-test record of retries (drained by the conftest hooks)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self.totals = {"retries": 0, "retried_tests": 0, "retried_then_passed": 0}
+
+    def record(self, method: str, url, attempt: int, reason: str, delay: float):
+        with self._lock:
+            self._events.append({
+                "method": method,
+                "url": str(url),
+                "attempt": attempt,
+                "reason": reason,
+                "delay": round(delay, 3),
+            })
+
+    def finish_test(self, passed: bool) -> list:
+        """Return and clear this test's retries, updating the session totals"""
+        with self._lock:
+            events, self._events = self._events, []
+            if events:
+                self.totals["retries"] += len(events)
+                self.totals["retried_tests"] += 1
+                if passed:
+                    self.totals["retried_then_passed"] += 1
+            return events
+
+
+retry_log = RetryLog()
+
+
+class RetryPolicy:
+    """Decides whether and when a failed attempt is retried"""
+
+    def __init__(self, max_attempts: int = 3, retry_statuses=(429, 502, 503, 504),
+                 backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 total_budget: float = 30.0, idempotent_methods=IDEMPOTENT_METHODS):
+        """
+        Args:
+            max_attempts: Total attempts including the first (1 disables retries)
+            retry_statuses: Response statuses treated as transient
+            backoff_base: First backoff ceiling in seconds (doubles per attempt)
+            backoff_max: Upper bound for a single backoff
+            total_budget: Max seconds a call may spend including retries
+            idempotent_methods: Methods that may be resent after any transient failure
+        """
+        self.max_attempts = max_attempts
+        self.retry_statuses = frozenset(retry_statuses)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.total_budget = total_budget
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    @classmethod
+    def from_settings(cls):
+        """Build the default policy from http_settings HTTP_RETRY_*"""
+        return cls(
+            max_attempts=http_settings.HTTP_RETRY_MAX_ATTEMPTS,
+            retry_statuses=http_settings.HTTP_RETRY_STATUSES,
+            backoff_base=http_settings.HTTP_RETRY_BACKOFF_BASE,
+            backoff_max=http_settings.HTTP_RETRY_BACKOFF_MAX,
+            total_budget=http_settings.HTTP_RETRY_TOTAL_BUDGET,
+        )
+
+    def _retryable(self, method: str, idempotent: bool, response=None, error=None) -> bool:
+        idempotent = idempotent or method.upper() in self.idempotent_methods
+        if error is not None:
+            return idempotent or isinstance(error, NOT_SENT_ERRORS)
+        if response.status_code not in self.retry_statuses:
+            return False
+        return idempotent or response.status_code in NOT_PROCESSED_STATUSES
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (1-based) attempt"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def next_delay(self, method: str, attempt: int, started: float,
+                   response: httpx.Response = None, error: Exception = None,
+                   idempotent: bool = False):
+        """
+        Seconds to wait before the next attempt, or None to stop retrying
+
+        Args:
+            method: HTTP method of the call
+            attempt: Attempt number that just finished (1-based)
+            started: time.monotonic() when the first attempt began
+            response: Response of the attempt (if one was received)
+            error: Transport error raised by the attempt (if any)
+            idempotent: Treat the call as safe to resend regardless of method
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if not self._retryable(method, idempotent, response=response, error=error):
+            return None
+
+        delay = self._backoff(attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = retry_after
+
+        if time.monotonic() - started + delay > self.total_budget:
+            return None
+        return delay
+
+    @staticmethod
+    def _reason(response=None, error=None) -> str:
+        if error is not None:
+            return f"{type(error).__name__}: {error}"
+        return f"HTTP {response.status_code}"
+
+    def call(self, method: str, url, send, idempotent: bool = False) -> httpx.Response:
+        """
+        Run send() until it succeeds, is not retryable, or the budget is spent
+
+        Args:
+            method: HTTP method (drives idempotency rules)
+            url: Request URL (for the retry log)
+            send: Zero-argument callable performing one attempt
+            idempotent: Treat the call as safe to resend regardless of method
+
+        Returns:
+            httpx.Response: Response of the final attempt
+        """
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                response = send()
+            except httpx.TransportError as error:
+                delay = self.next_delay(method, attempt, started, error=error, idempotent=idempotent)
+                if delay is None:
+                    raise
+                retry_log.record(method, url, attempt, self._reason(error=error), delay)
+            else:
+                delay = self.next_delay(method, attempt, started, response=response, idempotent=idempotent)
+                if delay is None:
+                    return response
+                retry_log.record(method, url, attempt, self._reason(response=response), delay)
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, method: str, url, send, idempotent: bool = False) -> httpx.Response:
+        """asyncio version of call(); send is a zero-argument coroutine function"""
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                response = await send()
+            except httpx.TransportError as error:
+                delay = self.next_delay(method, attempt, started, error=error, idempotent=idempotent)
+                if delay is None:
+                    raise
+                retry_log.record(method, url, attempt, self._reason(error=error), delay)
+            else:
+                delay = self.next_delay(method, attempt, started, response=response, idempotent=idempotent)
+                if delay is None:
+                    return response
+                retry_log.record(method, url, attempt, self._reason(response=response), delay)
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
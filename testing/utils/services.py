@@ -4,11 +4,13 @@ Centralized test data for all AI services
 """
 import sys
 import json
+from functools import lru_cache
 from pathlib import Path
 # API_DIR = Path(__file__).parent
 # sys.path.insert(0, str(API_DIR))
 from config.settings import settings
 from utils.helper import audio_to_base64, image_to_base64
+from utils.payload import PreparedBody
 
 
 class ServiceWithPayloads:
@@ -663,6 +665,20 @@ class ServiceWithPayloads:
         """Load Pipeline payload with audio from hindi_4s.wav"""
         return ServiceWithPayloads.pipeline()
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def prepared_from_sample(service: str) -> PreparedBody:
+        """
+        Sample payload loaded and JSON-encoded once per session
+
+        Args:
+            service: Sample name, e.g. "asr" or "pipeline" (any <service>_from_sample)
+
+        Returns:
+            PreparedBody: Pass as json= to APIClient; repeated sends skip serialization
+        """
+        return PreparedBody(getattr(ServiceWithPayloads, f"{service}_from_sample")())
+
 ##################################################### MODEL MANAGEMENT ############################################################################
     @staticmethod
     def model_name(role_name: str, timestamp: int, task_type: str = None) -> str:
@@ -0,0 +1,122 @@
+"""
+Single-flight de-duplication of identical in-flight GETs
+
+With HTTP_SINGLE_FLIGHT=true (off by default), when batch() or threaded
+tests fire the same GET at the same moment (the model list in created_model,
+a tenant-scoped user list), only the first caller - the leader - sends it;
+callers arriving while it is in flight wait and receive the same
+httpx.Response object (or exception). A request is identical
+when method, full URL (including params) and headers (so role, token and API
+key) all match. Followers still record their own Allure capture.
+
+Only concurrent calls are merged: nothing is kept once the leader returns
+(see utils.response_cache for that). Pass coalesce=False to always send.
+"""
+
+import asyncio
+import threading
+from config.http_settings import http_settings
+
+
+class _Call:
+    """One in-flight request and the callers waiting for it"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {"sent": 0, "coalesced": 0}
+
+    @classmethod
+    def from_settings(cls):
+        """Shared instance, or None when HTTP_SINGLE_FLIGHT is off"""
+        if not http_settings.HTTP_SINGLE_FLIGHT:
+            return None
+        return cls()
+
+    @staticmethod
+    def key_for(method: str, url, headers: dict) -> tuple:
+        """Identity of a request: method, full URL and headers"""
+        return method, str(url), tuple(sorted((name.lower(), value) for name, value in headers.items()))
+
+    def do(self, key, fn):
+        """
+        Return fn(), or the result of an identical call already in flight
+
+        Args:
+            key: Request identity (see key_for)
+            fn: Callable sending the request
+
+        Returns:
+            The leader's result; the leader's exception is raised in every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["sent"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, fn):
+        """
+        asyncio variant of do(): fn is an async callable
+
+        Calls are only merged within one event loop (futures cannot be awaited across loops).
+        """
+        key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = asyncio.get_running_loop().create_future()
+                self.stats["sent"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return await asyncio.shield(future)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark retrieved so an exception nobody else awaited is not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+shared_single_flight = SingleFlight.from_settings()
@@ -0,0 +1,102 @@
+"""
+Timeout profiles per endpoint group
+
+One REQUEST_TIMEOUT for everything is either too long for /auth/me (dead
+endpoints take forever to fail) or too short for ASR and pipeline inference
+(they flake). http_settings.TIMEOUT_PROFILES maps endpoint groups to full
+httpx.Timeout objects (connect/read/write/pool); APIClient looks up the group
+of every endpoint template here and applies its Timeout unless the call
+passes timeout= itself. Timeouts that fire are counted per group so the
+session summary can compare observed latency against each budget.
+"""
+
+import threading
+import httpx
+from config.http_settings import http_settings
+
+# Groups whose p95 time-to-first-byte exceeds this share of the read timeout are flagged
+BUDGET_WARN_FRACTION = 0.8
+
+
+class TimeoutProfiles:
+    """Endpoint template -> (group, httpx.Timeout)"""
+
+    def __init__(self, profiles: dict, groups: dict):
+        """
+        Args:
+            profiles: {group: httpx.Timeout}
+            groups: {endpoint path prefix: group}, matched on whole segments, longest prefix wins
+        """
+        self.profiles = profiles
+        self.groups = dict(sorted(groups.items(), key=lambda item: len(item[0]), reverse=True))
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.timeouts = {}
+
+    @classmethod
+    def from_settings(cls):
+        """Profiles from http_settings, or None when TIMEOUT_PROFILES_ENABLED is off"""
+        if not http_settings.TIMEOUT_PROFILES_ENABLED:
+            return None
+        return cls(http_settings.TIMEOUT_PROFILES, http_settings.TIMEOUT_GROUPS)
+
+    def group_for(self, endpoint: str):
+        """Timeout group of an endpoint template, or None"""
+        try:
+            return self._cache[endpoint]
+        except KeyError:
+            pass
+        group = next(
+            (group for prefix, group in self.groups.items()
+             if endpoint == prefix or endpoint.startswith(prefix.rstrip("/") + "/")),
+            None,
+        )
+        self._cache[endpoint] = group
+        return group
+
+    def timeout_for(self, endpoint: str):
+        """httpx.Timeout for an endpoint template, or None to keep the client default"""
+        group = self.group_for(endpoint)
+        return self.profiles.get(group) if group else None
+
+    def record_timeout(self, endpoint: str, error: httpx.TimeoutException):
+        """Count a timeout that fired, per (group, timeout type)"""
+        key = (self.group_for(endpoint) or "default", type(error).__name__)
+        with self._lock:
+            self.timeouts[key] = self.timeouts.get(key, 0) + 1
+
+
+def budget_report(profiles: TimeoutProfiles, summary: dict, default_budget: float) -> list:
+    """
+    Observed latency per timeout group against its read budget
+
+    Args:
+        profiles: TimeoutProfiles in use
+        summary: utils.http_metrics MetricsStore.summary()
+        default_budget: Timeout of endpoints outside every group (REQUEST_TIMEOUT)
+
+    Returns:
+        list: (group, requests, worst endpoint p95 ttfb, worst endpoint p95 total,
+               read budget, timeouts fired) rows
+    """
+    groups = {}
+    for (_, _, endpoint), row in summary.items():
+        group = profiles.group_for(endpoint) or "default"
+        entry = groups.setdefault(group, {"count": 0, "ttfb_p95": 0.0, "total_p95": 0.0})
+        entry["count"] += row["count"]
+        entry["ttfb_p95"] = max(entry["ttfb_p95"], row["ttfb_p95"])
+        entry["total_p95"] = max(entry["total_p95"], row["total_p95"])
+
+    fired = {}
+    for (group, _), count in profiles.timeouts.items():
+        fired[group] = fired.get(group, 0) + count
+
+    rows = []
+    for group in sorted(set(groups) | set(fired)):
+        entry = groups.get(group, {"count": 0, "ttfb_p95": 0.0, "total_p95": 0.0})
+        budget = profiles.profiles[group].read if group in profiles.profiles else default_budget
+        rows.append((group, entry["count"], entry["ttfb_p95"], entry["total_p95"], budget, fired.get(group, 0)))
+    return rows
+
+
+shared_timeout_profiles = TimeoutProfiles.from_settings()
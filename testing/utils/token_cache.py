@@ -0,0 +1,119 @@
+"""
+On-disk token cache shared by pytest-xdist workers
+
+Under `pytest -n 8` every worker builds its own session fixtures, so each
+role would log in (and start a refresh thread) once per worker. TokenManager
+instead goes through this cache: entries are keyed by environment, base URL
+and email, hold the access and refresh tokens with the access token's real
+expiry (its JWT `exp` claim), and every read-modify-write happens under an
+exclusive fcntl lock on a per-key lock file. The first worker logs in; the
+others block on the lock and reuse its tokens. Refreshes go through the same
+lock, so only one worker refreshes while the rest adopt the new token.
+
+TOKEN_CACHE=auto (default) shares tokens between the workers of one xdist run
+only; on shares them across runs too; off disables the cache. fcntl is
+POSIX-only - on other platforms the cache stays off.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from config.settings import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def jwt_expiry(token: str):
+    """`exp` claim of a JWT as an epoch timestamp, or None if it has none / is not a JWT"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """File-locked token entries, one JSON file per (environment, base URL, email)"""
+
+    def __init__(self, directory: str, min_ttl: float = 60.0, run_id: str = ""):
+        """
+        Args:
+            directory: Cache directory (created 0700; entries are written 0600)
+            min_ttl: Entries expiring sooner than this are treated as missing
+            run_id: Extra key component limiting sharing to one test run ("" = none)
+        """
+        self.directory = Path(directory)
+        self.min_ttl = min_ttl
+        self.run_id = run_id
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls):
+        """Cache configured from TOKEN_CACHE*, or None when it is off (or fcntl is unavailable)"""
+        mode = settings.TOKEN_CACHE
+        if fcntl is None or mode == "off":
+            return None
+        run_id = os.getenv("PYTEST_XDIST_TESTRUNUID")
+        if mode == "auto":
+            if not run_id:
+                # Not an xdist worker: nobody to share with
+                return None
+            return cls(settings.TOKEN_CACHE_DIR, settings.TOKEN_CACHE_MIN_TTL, run_id)
+        return cls(settings.TOKEN_CACHE_DIR, settings.TOKEN_CACHE_MIN_TTL)
+
+    def key_for(self, email: str) -> str:
+        """Cache key of an account in the current environment"""
+        identity = "|".join((settings.ENVIRONMENT, settings.BASE_URL or "", email, self.run_id))
+        return hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+    @contextmanager
+    def locked(self, key: str):
+        """Hold the exclusive cross-process lock of one entry"""
+        with open(self.directory / f"{key}.lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def load(self, key: str):
+        """
+        Entry for a key if its access token is still usable (call under locked())
+
+        Returns:
+            dict or None: {"access_token", "refresh_token", "expires_at", "updated_at"}
+        """
+        try:
+            entry = json.loads((self.directory / f"{key}.json").read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry.get("expires_at", 0) - time.time() < self.min_ttl:
+            return None
+        return entry
+
+    def store(self, key: str, access_token: str, refresh_token: str, expires_in: float):
+        """Write an entry atomically (call under locked())"""
+        entry = {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_at": jwt_expiry(access_token) or time.time() + expires_in,
+            "updated_at": time.time(),
+        }
+        path = self.directory / f"{key}.json"
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w") as handle:
+            json.dump(entry, handle)
+        os.replace(temporary, path)
+        return entry
+
+
+token_cache = TokenCache.from_settings()